@@ -0,0 +1,176 @@
+"""
+This script benchmarks approximate (IVF and/or quantized) against exact vector
+search, reporting recall@k and p50/p99 query latency for a range of probe
+counts, and the per-query cost of exact search when queries are batched.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.domain.entities.code_chunk import ChunkRecord
+from src.infrastructure.database.ivf_index import IVFIndex
+from src.infrastructure.database.numpy_store import NumpyCodeRepository
+
+
+def synthetic_vectors(
+    count: int, dimension: int, clusters: int, seed: int
+) -> np.ndarray:
+    """
+    Generates clustered vectors, which resemble real embeddings far better
+    than uniform noise does.
+
+    The vectors are ordered by cluster, like the chunks of an indexing run
+    that walks one directory after another, so the rows the IVF index is
+    first trained on cover only a few clusters.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimension)).astype(np.float32)
+    labels = np.sort(rng.integers(0, clusters, size=count))
+    noise = rng.normal(scale=0.6, size=(count, dimension)).astype(np.float32)
+    return centers[labels] + noise
+
+
+def fill_store(store: NumpyCodeRepository, vectors: np.ndarray) -> None:
+    """Adds every vector to a store in indexing-sized batches."""
+    for start in range(0, len(vectors), 1000):
+        store.add_batch(
+            [
+                ChunkRecord(
+                    id=str(row),
+                    file_path="benchmark.py",
+                    content="",
+                    start_line=row,
+                    end_line=row,
+                    embedding=vectors[row],
+                )
+                for row in range(start, min(start + 1000, len(vectors)))
+            ]
+        )
+
+
+def main() -> None:
+    """
+    Builds an exact and an IVF store over the same vectors and compares them.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark IVF against exact vector search."
+    )
+    parser.add_argument(
+        "--vectors",
+        type=str,
+        help="A .npy file of embeddings to use instead of synthetic data.",
+    )
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--dimension", type=int, default=256)
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument(
+        "--n-lists",
+        type=int,
+        default=256,
+        help="The number of IVF lists (0 scans every row).",
+    )
+    parser.add_argument(
+        "--n-probes", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64]
+    )
+    parser.add_argument(
+        "--quantization",
+        choices=["float16", "int8"],
+        help="Score the approximate store against quantized vectors.",
+    )
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    parser.add_argument(
+        "--prefilter-dimension",
+        type=int,
+        help="Scan only this many leading dimensions in the first stage.",
+    )
+    parser.add_argument("--prefilter-candidates", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    vectors = (
+        np.load(args.vectors).astype(np.float32)
+        if args.vectors
+        else synthetic_vectors(args.count, args.dimension, args.clusters, args.seed)
+    )
+    rng = np.random.default_rng(args.seed + 1)
+    queries = vectors[rng.choice(len(vectors), args.queries, replace=False)]
+    queries = queries + rng.normal(scale=0.3, size=queries.shape).astype(np.float32)
+    print(
+        f"{len(vectors)} vectors of dimension {vectors.shape[1]}, {len(queries)} queries"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        exact = NumpyCodeRepository(os.path.join(directory, "exact"))
+        fill_store(exact, vectors)
+
+        index = IVFIndex(n_lists=args.n_lists) if args.n_lists else None
+        start = time.perf_counter()
+        approximate = NumpyCodeRepository(
+            os.path.join(directory, "approximate"),
+            index=index,
+            quantization=args.quantization,
+            rescore_factor=args.rescore_factor,
+            prefilter_dimension=args.prefilter_dimension,
+            prefilter_candidates=args.prefilter_candidates,
+        )
+        fill_store(approximate, vectors)
+        print(f"Built the approximate store in {time.perf_counter() - start:.1f}s")
+        print(f"float32 vectors: {exact._vectors.nbytes / 2**20:.1f} MiB")
+        if approximate.quantized is not None:
+            print(
+                f"First-stage vectors: {approximate.quantized.nbytes / 2**20:.1f} MiB"
+            )
+
+        def run(store: NumpyCodeRepository) -> tuple[list[set[str]], np.ndarray]:
+            results, latencies = [], []
+            for query in queries:
+                start = time.perf_counter()
+                chunks = store.search(query.tolist(), top_k=args.top_k)
+                latencies.append(time.perf_counter() - start)
+                results.append({chunk.id for chunk in chunks})
+            return results, np.array(latencies) * 1000
+
+        truth, latencies = run(exact)
+        start = time.perf_counter()
+        batched = exact.search_many(queries, top_k=args.top_k)
+        batched_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        same = [{chunk.id for chunk in chunks} for chunks in batched] == truth
+        print(
+            f"\nBatched exact search: {batched_ms:.2f} ms per query "
+            f"({np.mean(latencies) / batched_ms:.1f}x faster than one by one, "
+            f"{'same' if same else 'different'} results)"
+        )
+        print(f"\n{'n_probes':>8} {'recall@k':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        print(
+            f"{'exact':>8} {1.0:>9.3f} "
+            f"{np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 99):>8.2f}"
+        )
+        for n_probes in args.n_probes if index is not None else [0]:
+            if index is not None:
+                index.n_probes = n_probes
+            results, latencies = run(approximate)
+            recall = np.mean(
+                [
+                    len(found & expected) / len(expected)
+                    for found, expected in zip(results, truth, strict=True)
+                ]
+            )
+            print(
+                f"{n_probes:>8} {recall:>9.3f} "
+                f"{np.percentile(latencies, 50):>8.2f} "
+                f"{np.percentile(latencies, 99):>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -13,11 +13,18 @@ from dotenv import load_dotenv
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.application.use_cases.index_repository import IndexRepositoryUseCase
-from src.infrastructure.database.chroma_client import ChromaDBClient
+from src.domain.repositories.graph_repository import GraphRepository
+from src.infrastructure.database.code_repository_factory import (
+    create_code_repository,
+)
 from src.infrastructure.database.graph_db import Neo4jService
+from src.infrastructure.database.memory_graph import InMemoryGraphRepository
 from src.infrastructure.file_processor import FileProcessor
+from src.infrastructure.index_manifest import IndexManifest
 from src.infrastructure.llm.openai_client import AsyncOpenAIClient
 from src.infrastructure.parser.code_parser import CodeParser
+from src.infrastructure.parser.parallel_parser import ParallelCodeParser
+from src.infrastructure.parser.parse_cache import ParseCache
 from src.infrastructure.text_splitter import CodeTextSplitter
 
 
@@ -43,6 +50,104 @@ async def main() -> None:
         nargs="+",
         help="A list of glob patterns to exclude from indexing.",
     )
+    parser.add_argument(
+        "--manifest-path",
+        type=str,
+        default=os.getenv("MANIFEST_PATH", "./data/index_manifest.json"),
+        help="Where to store the manifest used for incremental re-indexing.",
+    )
+    parser.add_argument(
+        "--full-reindex",
+        action="store_true",
+        help="Delete every indexed file and rebuild the whole index from scratch.",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes used to parse files (1 parses in-process).",
+    )
+    parser.add_argument(
+        "--base-commit",
+        type=str,
+        help="Only index the changes since this commit (requires a git checkout).",
+    )
+    parser.add_argument(
+        "--target-commit",
+        type=str,
+        default="HEAD",
+        help="The commit to index up to when --base-commit is given.",
+    )
+    parser.add_argument(
+        "--graph-backend",
+        choices=["neo4j", "memory"],
+        default=os.getenv("GRAPH_BACKEND", "neo4j"),
+        help="Where to store the knowledge graph.",
+    )
+    parser.add_argument(
+        "--graph-snapshot",
+        type=str,
+        default=os.getenv("GRAPH_SNAPSHOT_PATH", "./data/graph.snapshot"),
+        help="The snapshot file used by the in-memory graph backend.",
+    )
+    parser.add_argument(
+        "--vector-backend",
+        choices=["chroma", "numpy"],
+        help="Where to store chunk embeddings (default: $VECTOR_BACKEND or chroma).",
+    )
+    parser.add_argument(
+        "--vector-store-path",
+        type=str,
+        help=(
+            "The directory used by the NumPy vector backend "
+            "(default: $VECTOR_STORE_PATH or ./data/vector_store)."
+        ),
+    )
+    parser.add_argument(
+        "--ivf-lists",
+        type=int,
+        help=(
+            "Search the NumPy vector backend through an IVF index with this many "
+            "lists (0 searches exactly; default: $VECTOR_IVF_LISTS or 0)."
+        ),
+    )
+    parser.add_argument(
+        "--ivf-probes",
+        type=int,
+        help="How many IVF lists each query scans (default: $VECTOR_IVF_PROBES or 16).",
+    )
+    parser.add_argument(
+        "--vector-quantization",
+        choices=["float16", "int8"],
+        help=(
+            "Score queries against a quantized copy of the NumPy vector backend, "
+            "rescoring the best candidates at full precision "
+            "(default: $VECTOR_QUANTIZATION)."
+        ),
+    )
+    parser.add_argument(
+        "--vector-prefilter-dimension",
+        type=int,
+        help=(
+            "Scan only this many leading embedding dimensions before rescoring "
+            "the best candidates with the full vectors "
+            "(default: $VECTOR_PREFILTER_DIMENSION)."
+        ),
+    )
+    parser.add_argument(
+        "--parse-cache-dir",
+        type=str,
+        default=os.getenv("PARSE_CACHE_DIR", "./data/parse_cache"),
+        help="Where to cache parse results, keyed by file content.",
+    )
+    parser.add_argument(
+        "--rebuild-graph",
+        action="store_true",
+        help=(
+            "Only rebuild the graph from the manifest and the parse cache, "
+            "without embedding anything."
+        ),
+    )
     args = parser.parse_args()
 
     if not os.path.isdir(args.repo_path):
@@ -54,30 +159,63 @@ async def main() -> None:
         file_processor = FileProcessor(exclude_patterns=args.exclude_patterns)
         text_splitter = CodeTextSplitter()
         openai_client = AsyncOpenAIClient()
-        chroma_client = ChromaDBClient()
-        code_parser = CodeParser()
+        code_repository = create_code_repository(
+            backend=args.vector_backend,
+            path=args.vector_store_path,
+            ivf_lists=args.ivf_lists,
+            ivf_probes=args.ivf_probes,
+            quantization=args.vector_quantization,
+            prefilter_dimension=args.vector_prefilter_dimension,
+        )
+        parse_cache = ParseCache(args.parse_cache_dir)
+        code_parser: CodeParser | ParallelCodeParser = (
+            ParallelCodeParser(max_workers=args.parse_workers, cache=parse_cache)
+            if args.parse_workers > 1
+            else CodeParser(cache=parse_cache)
+        )
+        manifest = IndexManifest(args.manifest_path)
 
-        neo4j_uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-        neo4j_user = os.getenv("NEO4J_USER", "neo4j")
-        neo4j_password = os.getenv("NEO4J_PASSWORD", "password123")
+        graph_repository: GraphRepository
+        if args.graph_backend == "memory":
+            graph_repository = InMemoryGraphRepository(args.graph_snapshot)
+        else:
+            neo4j_uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+            neo4j_user = os.getenv("NEO4J_USER", "neo4j")
+            neo4j_password = os.getenv("NEO4J_PASSWORD", "password123")
 
-        graph_repository = Neo4jService(
-            uri=neo4j_uri, user=neo4j_user, password=neo4j_password
-        )
+            graph_repository = Neo4jService(
+                uri=neo4j_uri, user=neo4j_user, password=neo4j_password
+            )
 
         index_use_case = IndexRepositoryUseCase(
             file_processor=file_processor,
             text_splitter=text_splitter,
             embedding_client=openai_client,
-            code_repository=chroma_client,
+            code_repository=code_repository,
             graph_repository=graph_repository,
             code_parser=code_parser,
+            manifest=manifest,
         )
         # --- End of Dependency Injection ---
 
-        await index_use_case.execute(args.repo_path, args.include_dirs)
+        if args.full_reindex:
+            index_use_case.clear_index()
+
+        if args.rebuild_graph:
+            index_use_case.rebuild_graph()
+        elif args.base_commit:
+            await index_use_case.execute_diff(
+                args.repo_path,
+                args.base_commit,
+                args.target_commit,
+                args.include_dirs,
+            )
+        else:
+            await index_use_case.execute(args.repo_path, args.include_dirs)
 
         graph_repository.close()
+        if isinstance(code_parser, ParallelCodeParser):
+            code_parser.close()
 
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
@@ -6,15 +6,128 @@ import json
 import re
 from typing import Any, cast
 
+from src.application.use_cases.context_builder import (
+    merge_adjacent_chunks,
+    pack_context,
+)
 from src.application.use_cases.graph_query import GraphQueryUseCase
+from src.domain.entities.code_chunk import ChunkRecord
+from src.domain.entities.graph_entities import NodeType
+from src.domain.entities.search_filters import SearchFilters
 from src.domain.repositories.code_repository import CodeRepository
 from src.domain.services.embedding_service import EmbeddingService
 from src.infrastructure.llm.openai_client import OpenAIClient
+from src.infrastructure.parser.symbol_index import SymbolIndex, SymbolLocation
+
+# Backticked code, or a word that looks like an identifier: snake_case,
+# camelCase, dotted or called.
+_IDENTIFIER_PATTERN = re.compile(
+    r"`([^`]+)`"
+    r"|\b([A-Za-z_][A-Za-z0-9]*(?:_[A-Za-z0-9_]*|[a-z][A-Z][A-Za-z0-9]*)"
+    r"(?:\.[A-Za-z_][A-Za-z0-9_]*)*(?:\(\))?)"
+)
+
+# Questions that ask where something is defined.
+_DEFINITION_PATTERN = re.compile(
+    r"\bwhere(?:'s|\s+(?:is|are))\b|\bdefin(?:ed|ition)\b|\bdeclared\b"
+    r"|\blocate\b|在哪|定義",
+    re.IGNORECASE,
+)
+# Questions about where something is used or called from, not defined.
+_USAGE_PATTERN = re.compile(
+    r"\b(?:used|uses|usages?|call(?:s|ed|ers?)?|invoked|references?|referenced"
+    r"|imports?|imported)\b|呼叫|調用|引用|使用",
+    re.IGNORECASE,
+)
+# "class User", "function parse_file", "the User class", "User 類別", ...
+_KIND_WORDS = {
+    "class": NodeType.CLASS,
+    "類別": NodeType.CLASS,
+    "類": NodeType.CLASS,
+    "function": NodeType.FUNCTION,
+    "method": NodeType.FUNCTION,
+    "def": NodeType.FUNCTION,
+    "函式": NodeType.FUNCTION,
+    "函數": NodeType.FUNCTION,
+    "方法": NodeType.FUNCTION,
+}
+_KIND_THEN_NAME_PATTERN = re.compile(
+    r"\b(class|function|method|def)\s+`?([A-Za-z_][A-Za-z0-9_]*)`?", re.IGNORECASE
+)
+# English kind words must stand apart from the name ("the subclass of X" is
+# not about a class named "sub"); CJK ones may follow it directly.
+_NAME_THEN_KIND_PATTERN = re.compile(
+    r"`?\b([A-Za-z_][A-Za-z0-9_]*)`?\s*"
+    r"((?<=\s)(?:class|function|method)\b|類別|類|函式|函數|方法)",
+    re.IGNORECASE,
+)
+# Words found next to "class"/"function" that are not names.
+_NOT_NAMES = {
+    "a",
+    "an",
+    "are",
+    "base",
+    "declared",
+    "defined",
+    "for",
+    "in",
+    "is",
+    "of",
+    "that",
+    "the",
+    "this",
+    "what",
+    "where",
+    "which",
+}
+
+# Words that, around identifiers, still make a plain lookup ("where is `foo`
+# used?") rather than a question about what the code does.
+_LOOKUP_WORDS = {
+    "a",
+    "an",
+    "are",
+    "call",
+    "called",
+    "calls",
+    "class",
+    "declared",
+    "def",
+    "defined",
+    "definition",
+    "find",
+    "function",
+    "is",
+    "locate",
+    "me",
+    "method",
+    "of",
+    "show",
+    "the",
+    "used",
+    "uses",
+    "where",
+}
+
+# The rank constant of reciprocal rank fusion; 60 is the usual choice.
+RRF_K = 60
+# The most (estimated) tokens of retrieved code put in an answer prompt.
+DEFAULT_CONTEXT_TOKEN_BUDGET = 3000
 
 
 class AnswerQuestionUseCase:
     """
     A use case for answering a natural language question using a RAG pipeline.
+
+    Code is retrieved with hybrid search: vector results and BM25 keyword
+    results are combined by reciprocal rank fusion. Questions that only name
+    identifiers are answered from the keyword index alone, without embedding
+    the query, when the best keyword hit contains them. Retrieved chunks that
+    overlap or are adjacent in one file are merged, then packed into ``context_token_budget`` tokens, so the size of
+    the prompt (and the cost and latency of the answer) stays bounded.
+
+    With a SymbolIndex, questions asking where a class or function is defined
+    are answered from the index before anything else, with no network calls.
     """
 
     def __init__(
@@ -23,6 +136,8 @@ class AnswerQuestionUseCase:
         code_repository: CodeRepository,
         llm_client: OpenAIClient,
         graph_query_use_case: GraphQueryUseCase,
+        symbol_index: SymbolIndex | None = None,
+        context_token_budget: int = DEFAULT_CONTEXT_TOKEN_BUDGET,
     ):
         """
         Initializes the AnswerQuestionUseCase.
@@ -31,6 +146,8 @@ class AnswerQuestionUseCase:
         self.code_repository = code_repository
         self.llm_client = llm_client
         self.graph_query_use_case = graph_query_use_case
+        self.symbol_index = symbol_index
+        self.context_token_budget = context_token_budget
 
     def _build_classification_prompt(self, query: str) -> str:
         """
@@ -130,13 +247,155 @@ class AnswerQuestionUseCase:
         """
         return 10 if self._determine_query_complexity(query) else 5
 
-    def execute(self, query: str) -> str:
+    @staticmethod
+    def _extract_identifiers(query: str) -> list[str]:
+        """
+        Returns the code identifiers mentioned in a query.
+        """
+        return [
+            backticked or bare
+            for backticked, bare in _IDENTIFIER_PATTERN.findall(query)
+        ]
+
+    def _is_identifier_lookup(
+        self, query: str, keyword_chunks: list[ChunkRecord]
+    ) -> bool:
+        """
+        Returns whether a query does little more than name identifiers, e.g.
+        "where is `foo` used?", and the best keyword hit contains one of them.
+
+        Such queries are answered from the keyword index alone; any other
+        question mentioning an identifier still goes through hybrid search.
+        """
+        identifiers = self._extract_identifiers(query)
+        if not identifiers or not keyword_chunks:
+            return False
+        remainder = _IDENTIFIER_PATTERN.sub(" ", query)
+        if any(
+            word.lower() not in _LOOKUP_WORDS for word in re.findall(r"\w+", remainder)
+        ):
+            return False
+        best = keyword_chunks[0].content
+        return any(
+            identifier.removesuffix("()").rsplit(".", 1)[-1] in best
+            for identifier in identifiers
+        )
+
+    @staticmethod
+    def _reciprocal_rank_fusion(
+        rankings: list[list[ChunkRecord]], top_k: int
+    ) -> list[ChunkRecord]:
+        """
+        Merges ranked result lists, scoring each chunk by the sum of
+        ``1 / (RRF_K + rank)`` over the lists it appears in.
+        """
+        scores: dict[str, float] = {}
+        chunks: dict[str, ChunkRecord] = {}
+        for ranking in rankings:
+            for rank, chunk in enumerate(ranking, start=1):
+                scores[chunk.id] = scores.get(chunk.id, 0.0) + 1 / (RRF_K + rank)
+                chunks.setdefault(chunk.id, chunk)
+        best = sorted(scores, key=scores.__getitem__, reverse=True)[:top_k]
+        return [chunks[chunk_id] for chunk_id in best]
+
+    def _retrieve_chunks(
+        self, query: str, top_k: int, filters: SearchFilters | None
+    ) -> list[ChunkRecord]:
+        """
+        Retrieves the chunks most relevant to a query with hybrid search.
+        """
+        keyword_chunks = self.code_repository.keyword_search(
+            query, top_k=top_k, filters=filters
+        )
+        if self._is_identifier_lookup(query, keyword_chunks):
+            print("Identifier query answered from the keyword index.")
+            return keyword_chunks
+
+        query_embedding = self.embedding_service.get_embedding(query)
+        print("Generated query embedding.")
+        vector_chunks = self.code_repository.search(
+            query_embedding, top_k=top_k, filters=filters
+        )
+        return self._reciprocal_rank_fusion([vector_chunks, keyword_chunks], top_k)
+
+    def _definition_target(self, query: str) -> tuple[str, NodeType | None] | None:
+        """
+        Returns the symbol a definition lookup asks about and its kind, if the
+        query is a definition lookup.
+        """
+        if not _DEFINITION_PATTERN.search(query) or _USAGE_PATTERN.search(query):
+            return None
+        for pattern, name_group, kind_group in (
+            (_KIND_THEN_NAME_PATTERN, 2, 1),
+            (_NAME_THEN_KIND_PATTERN, 1, 2),
+        ):
+            for match in pattern.finditer(query):
+                name = match.group(name_group)
+                if name.lower() not in _NOT_NAMES | _KIND_WORDS.keys():
+                    return name, _KIND_WORDS[match.group(kind_group).lower()]
+        for identifier in self._extract_identifiers(query):
+            name = identifier.removesuffix("()").rsplit(".", 1)[-1]
+            if name.isidentifier():
+                return name, None
+        return None
+
+    def _answer_definition_lookup(
+        self, query: str, filters: SearchFilters | None
+    ) -> str | None:
+        """
+        Answers "where is X defined?" from the symbol index, or returns None.
+
+        Names are matched ignoring case, then as a prefix.
+        """
+        if self.symbol_index is None:
+            return None
+        target = self._definition_target(query)
+        if target is None:
+            return None
+        name, node_type = target
+        locations = self.symbol_index.lookup(name, node_type) or (
+            self.symbol_index.prefix(name, node_type)
+        )
+        if filters is not None:
+            locations = [
+                location
+                for location in locations
+                if filters.matches_file(location.relative_path or location.file_path)
+            ]
+        if not locations:
+            return None
+
+        print(f"Answered definition lookup for '{name}' from the symbol index.")
+
+        def describe(location: SymbolLocation) -> str:
+            return (
+                f"- `{location.name}` ({location.type.value}): "
+                f"{location.file_path}, lines {location.start_line}-"
+                f"{location.end_line}"
+            )
+
+        return "\n".join(
+            [f"Definitions matching `{name}`:"]
+            + [describe(location) for location in locations]
+        )
+
+    def execute(self, query: str, filters: SearchFilters | None = None) -> str:
         """
         Executes the question-answering process.
+
+        Args:
+            query: The user's question.
+            filters: Optional constraints that scope the vector search, e.g. to
+                one service of a monorepo.
         """
         try:
             print(f"Received query: {query}")
 
+            # 1. Definition lookups are answered from the symbol index.
+            definition_answer = self._answer_definition_lookup(query, filters)
+            if definition_answer:
+                return definition_answer
+
             intent = self._classify_query_intent(query)
             task_type = intent.get("type", "vector_search")
             entity = intent.get("entity")
@@ -144,22 +403,25 @@ class AnswerQuestionUseCase:
 
             context = ""
             if task_type == "vector_search":
-                query_embedding = self.embedding_service.get_embedding(query)
-                print("Generated query embedding.")
-
                 # 2. Retrieve relevant code chunks
                 top_k = self._get_optimal_top_k(query)
                 print(f"Using top_k={top_k} based on query complexity.")
-                retrieved_chunks = self.code_repository.search(
-                    query_embedding, top_k=top_k
-                )
+                retrieved_chunks = self._retrieve_chunks(query, top_k, filters)
 
                 if not retrieved_chunks:
                     return "I couldn't find any relevant information in the codebase to answer your question."
                 print(f"Retrieved {len(retrieved_chunks)} relevant chunks.")
-                context = "\n\n---\n\n".join(
-                    [chunk.content for chunk in retrieved_chunks]
+                merged_chunks = merge_adjacent_chunks(retrieved_chunks)
+                if len(merged_chunks) < len(retrieved_chunks):
+                    print(f"Merged them into {len(merged_chunks)} contiguous spans.")
+                packed_chunks = pack_context(
+                    query, merged_chunks, self.context_token_budget
+                )
+                print(
+                    f"Packed {len(packed_chunks)} chunks into a "
+                    f"{self.context_token_budget}-token budget."
                 )
+                context = "\n\n---\n\n".join([chunk.content for chunk in packed_chunks])
 
             elif task_type == "graph_query_callers" and entity:
                 results = self.graph_query_use_case.get_function_callers(
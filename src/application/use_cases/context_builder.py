@@ -0,0 +1,271 @@
+"""
+This module turns retrieved chunks into the context given to the LLM.
+"""
+
+import math
+import re
+from collections.abc import Callable
+
+from src.domain.entities.code_chunk import ChunkRecord
+from src.infrastructure.database.bm25_index import tokenize
+
+# Words and single punctuation marks; a token estimate for code and prose.
+_TOKEN_PIECE = re.compile(r"\w+|[^\w\s]")
+# The estimated cost of the separator placed between chunks in the prompt.
+SEPARATOR_TOKENS = 4
+
+
+def _overlap(text: str, following: str) -> int:
+    """
+    Returns the length of the longest suffix of ``text`` that is a prefix of
+    ``following``.
+
+    Uses the KMP failure function of ``following`` while scanning ``text``, so
+    the cost is linear in the length of both.
+    """
+    if not text or not following:
+        return 0
+    failure = [0] * len(following)
+    matched = 0
+    for i in range(1, len(following)):
+        while matched and following[i] != following[matched]:
+            matched = failure[matched - 1]
+        if following[i] == following[matched]:
+            matched += 1
+        failure[i] = matched
+
+    matched = 0
+    # Only the last len(following) characters of text can overlap.
+    for character in text[-len(following) :]:
+        while matched and (
+            matched == len(following) or character != following[matched]
+        ):
+            matched = failure[matched - 1]
+        if character == following[matched]:
+            matched += 1
+    return matched
+
+
+def _join(first: ChunkRecord, second: ChunkRecord) -> ChunkRecord:
+    """Joins two chunks of one file whose line ranges touch or overlap."""
+    if second.end_line <= first.end_line and second.content in first.content:
+        content = first.content
+    else:
+        overlap = _overlap(first.content, second.content)
+        separator = "" if overlap else "\n"
+        content = first.content + separator + second.content[overlap:]
+    merged_ids = first.metadata.get("merged_ids", [first.id]) + second.metadata.get(
+        "merged_ids", [second.id]
+    )
+    metadata = {
+        **first.metadata,
+        "start_line": first.start_line,
+        "end_line": max(first.end_line, second.end_line),
+        "merged_ids": merged_ids,
+    }
+    # A span covering several symbols belongs to none of them.
+    if second.metadata.get("symbol_id") != first.metadata.get("symbol_id"):
+        metadata.pop("symbol_id", None)
+    return ChunkRecord(
+        id=first.id,
+        file_path=first.file_path,
+        content=content,
+        start_line=first.start_line,
+        end_line=max(first.end_line, second.end_line),
+        metadata=metadata,
+    )
+
+
+def merge_adjacent_chunks(chunks: list[ChunkRecord]) -> list[ChunkRecord]:
+    """
+    Merges retrieved chunks of the same file whose line ranges overlap or are
+    adjacent into one chunk per contiguous span.
+
+    Text repeated by the splitter's overlap, and chunks contained in another,
+    appear once in the merged chunk. A merged chunk takes the place of its
+    best-ranked member, keeps that member's ID and records the IDs of every
+    member in ``metadata["merged_ids"]``. Chunks without line numbers (e.g.
+    from a store that did not record them) are kept as they are.
+
+    Args:
+        chunks: Retrieved chunks, best first.
+
+    Returns:
+        The merged chunks, ordered by their best-ranked member.
+    """
+    spans_by_file: dict[str, list[tuple[int, ChunkRecord]]] = {}
+    kept: list[tuple[int, ChunkRecord]] = []
+    seen: set[str] = set()
+    for rank, chunk in enumerate(chunks):
+        if chunk.id in seen:
+            continue
+        seen.add(chunk.id)
+        if chunk.start_line < 1 or chunk.end_line < chunk.start_line:
+            kept.append((rank, chunk))
+        else:
+            spans_by_file.setdefault(chunk.file_path, []).append((rank, chunk))
+
+    for spans in spans_by_file.values():
+        spans.sort(key=lambda span: (span[1].start_line, -span[1].end_line))
+        rank, current = spans[0]
+        best_id = current.id
+        for next_rank, chunk in spans[1:]:
+            if chunk.start_line <= current.end_line + 1:
+                current = _join(current, chunk)
+                if next_rank < rank:
+                    rank, best_id = next_rank, chunk.id
+                current.id = best_id
+            else:
+                kept.append((rank, current))
+                rank, current = next_rank, chunk
+                best_id = current.id
+        kept.append((rank, current))
+
+    kept.sort(key=lambda span: span[0])
+    return [chunk for _, chunk in kept]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of LLM tokens in a text without a tokenizer.
+
+    Takes the larger of the number of words and punctuation marks and a
+    quarter of the characters, which tracks BPE tokenizers closely for code
+    and rarely undercounts.
+    """
+    return max(len(_TOKEN_PIECE.findall(text)), math.ceil(len(text) / 4))
+
+
+def _similarity(terms: set[str], other: set[str]) -> float:
+    """Returns the Jaccard similarity of two sets of terms."""
+    if not terms or not other:
+        return 0.0
+    return len(terms & other) / len(terms | other)
+
+
+def _truncate(
+    chunk: ChunkRecord,
+    query_terms: set[str],
+    max_tokens: int,
+    count_tokens: Callable[[str], int],
+) -> ChunkRecord | None:
+    """
+    Cuts a chunk down to the window of consecutive lines that fits in
+    ``max_tokens`` and contains the most query terms; among equally good
+    windows, the one using the most of ``max_tokens`` (then the earliest).
+
+    Returns None if not even one line fits.
+    """
+    lines = chunk.content.split("\n")
+    costs = [count_tokens(line) + 1 for line in lines]
+    hits = [len(query_terms.intersection(tokenize(line))) for line in lines]
+
+    # Every end line is paired with the longest window that fits before it.
+    best: tuple[int, int, int, int] | None = None  # (hits, cost, -start, end)
+    start = cost = window_hits = 0
+    for end, line_cost in enumerate(costs):
+        cost += line_cost
+        window_hits += hits[end]
+        while start <= end and cost > max_tokens:
+            cost -= costs[start]
+            window_hits -= hits[start]
+            start += 1
+        if start <= end and (best is None or (window_hits, cost, -start) > best[:3]):
+            best = (window_hits, cost, -start, end)
+    if best is None:
+        return None
+
+    first, last = -best[2], best[3]
+    start_line = chunk.start_line + first if chunk.start_line > 0 else -1
+    end_line = chunk.start_line + last if chunk.start_line > 0 else -1
+    return ChunkRecord(
+        id=chunk.id,
+        file_path=chunk.file_path,
+        content="\n".join(lines[first : last + 1]),
+        start_line=start_line,
+        end_line=end_line,
+        metadata={
+            **chunk.metadata,
+            "start_line": start_line,
+            "end_line": end_line,
+            "truncated": True,
+        },
+    )
+
+
+def pack_context(
+    query: str,
+    chunks: list[ChunkRecord],
+    token_budget: int,
+    count_tokens: Callable[[str], int] = estimate_tokens,
+    diversity: float = 0.3,
+    min_chunk_tokens: int = 64,
+) -> list[ChunkRecord]:
+    """
+    Selects and trims chunks to fill a token budget.
+
+    Chunks are picked greedily by maximal marginal relevance: a chunk's
+    relevance (from its rank) minus ``diversity`` times its term similarity
+    to the most similar chunk already picked, with a further penalty for
+    chunks of a file already represented. A chunk that does not fit in the
+    remaining budget is cut down to its lines with the most query terms, as
+    long as at least ``min_chunk_tokens`` remain; no chunk may take more than
+    half the budget unless it is the only one.
+
+    Args:
+        query: The question the context is for.
+        chunks: Candidate chunks, best first.
+        token_budget: The most tokens the chunks and separators may use.
+        count_tokens: Counts the tokens of a text, e.g. with the model's
+            tokenizer; ``estimate_tokens`` by default.
+        diversity: How strongly redundancy with picked chunks is penalized,
+            from 0 (rank only) to 1.
+        min_chunk_tokens: The smallest piece of a chunk worth including.
+
+    Returns:
+        The selected chunks in the order they were picked.
+    """
+    if not chunks or token_budget <= 0:
+        return []
+    query_terms = set(tokenize(query))
+    candidates = [
+        (1 - rank / len(chunks), set(tokenize(chunk.content)), chunk)
+        for rank, chunk in enumerate(chunks)
+    ]
+    max_chunk_tokens = token_budget if len(chunks) == 1 else token_budget // 2
+    min_chunk_tokens = min(min_chunk_tokens, max_chunk_tokens)
+
+    packed: list[ChunkRecord] = []
+    packed_terms: list[set[str]] = []
+    packed_files: set[str] = set()
+    remaining = token_budget
+    while candidates and remaining > 0:
+        best_index, best_score = 0, -math.inf
+        for index, (relevance, terms, chunk) in enumerate(candidates):
+            redundancy = max(
+                (_similarity(terms, other) for other in packed_terms), default=0.0
+            )
+            if chunk.file_path in packed_files:
+                redundancy = max(redundancy, 0.5)
+            score = (1 - diversity) * relevance - diversity * redundancy
+            if score > best_score:
+                best_index, best_score = index, score
+        _, terms, chunk = candidates.pop(best_index)
+
+        separator = SEPARATOR_TOKENS if packed else 0
+        allowed = min(remaining - separator, max_chunk_tokens)
+        cost = count_tokens(chunk.content)
+        if cost > allowed:
+            if allowed < min_chunk_tokens:
+                continue
+            truncated = _truncate(chunk, query_terms, allowed, count_tokens)
+            if truncated is None:
+                continue
+            chunk, cost = truncated, count_tokens(truncated.content)
+            if cost > allowed:
+                continue
+        packed.append(chunk)
+        packed_terms.append(terms)
+        packed_files.add(chunk.file_path)
+        remaining -= cost + separator
+    return packed
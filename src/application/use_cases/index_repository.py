@@ -3,21 +3,44 @@ This module contains the use case for indexing a code repository.
 """
 
 import asyncio
+import os
+from collections.abc import Iterable, Iterator
 
 from tqdm.asyncio import tqdm_asyncio
 
-from src.domain.entities.code_chunk import CodeChunk
-from src.infrastructure.database.chroma_client import ChromaDBClient
-from src.infrastructure.database.graph_db import Neo4jService
+from src.domain.entities.code_chunk import ChunkRecord, CodeChunk
+from src.domain.entities.graph_entities import (
+    BaseEdge,
+    EdgeType,
+    NodeType,
+    ParsedData,
+    SymbolDefinition,
+)
+from src.domain.entities.search_filters import relative_path
+from src.domain.repositories.code_repository import CodeRepository
+from src.domain.repositories.graph_repository import GraphRepository
 from src.infrastructure.file_processor import FileProcessor
+from src.infrastructure.git_diff import FileChangeStatus, GitDiffReader
+from src.infrastructure.index_manifest import IndexManifest, ManifestEntry
 from src.infrastructure.llm.openai_client import AsyncOpenAIClient
 from src.infrastructure.parser.code_parser import CodeParser
+from src.infrastructure.parser.compact import decode_parsed_data, encode_parsed_data
+from src.infrastructure.parser.parallel_parser import ParallelCodeParser
+from src.infrastructure.parser.symbol_table import SymbolTable
 from src.infrastructure.text_splitter import CodeTextSplitter
 
 
 class IndexRepositoryUseCase:
     """
     A use case for discovering, processing, and indexing all files in a repository.
+
+    Files flow through a streaming pipeline (discover -> read -> parse -> split ->
+    embed -> store). At most ``max_in_flight_batches`` embedding batches are
+    pending at any time, so peak memory does not grow with repository size.
+
+    When an IndexManifest is provided, only files whose content hash changed
+    since the last run are re-processed, and the chunks and graph nodes of
+    modified or removed files are deleted.
     """
 
     def __init__(
@@ -25,9 +48,13 @@ class IndexRepositoryUseCase:
         file_processor: FileProcessor,
         text_splitter: CodeTextSplitter,
         embedding_client: AsyncOpenAIClient,
-        code_repository: ChromaDBClient,
-        graph_repository: Neo4jService,
-        code_parser: CodeParser,
+        code_repository: CodeRepository,
+        graph_repository: GraphRepository,
+        code_parser: CodeParser | ParallelCodeParser,
+        manifest: IndexManifest | None = None,
+        batch_size: int = 200,
+        max_in_flight_batches: int = 5,
+        graph_batch_size: int = 5000,
     ):
         self.file_processor = file_processor
         self.text_splitter = text_splitter
@@ -35,6 +62,24 @@ class IndexRepositoryUseCase:
         self.code_repository = code_repository
         self.graph_repository = graph_repository
         self.code_parser = code_parser
+        self.manifest = manifest
+        self.batch_size = batch_size
+        self.max_in_flight_batches = max_in_flight_batches
+        self.graph_batch_size = graph_batch_size
+        # Graph writes are buffered across files and flushed in bulk.
+        self._pending_files: list[ParsedData] = []
+        self._pending_node_count = 0
+        # Cross-file references are resolved once all files of a run are known.
+        self._symbol_table = SymbolTable(".")
+        self._replaced_files: set[str] = set()
+        # Files moved in this run keep their graph edges but are re-resolved.
+        self._moved_files: set[str] = set()
+        # The names that files replaced, moved or removed in this run can be
+        # imported by; their importers are re-resolved as well.
+        self._changed_modules: set[str] = set()
+        # The root of the repository being indexed; search filters match paths
+        # relative to it.
+        self._root = "."
 
     async def execute(
         self, directory_path: str, include_dirs: list[str] | None = None
@@ -47,96 +92,575 @@ class IndexRepositoryUseCase:
             if include_dirs:
                 print(f"Only including directories: {', '.join(include_dirs)}")
 
-            file_contents = self.file_processor.read_files(directory_path, include_dirs)
-            print(f"Found {len(file_contents)} files to process.")
+            self._start_run(directory_path)
+            files = self.file_processor.iter_files(directory_path, include_dirs)
+            seen_files = await self._index_files(files)
 
-            # --- Knowledge Graph Construction ---
-            print("Parsing files and building knowledge graph...")
-            self.graph_repository.clear_database()
-            for file_path, content in tqdm_asyncio(
-                file_contents.items(), desc="Parsing Files"
-            ):
-                if not content.strip():
+            base_paths = self.file_processor.get_base_paths(
+                directory_path, include_dirs
+            )
+            self._remove_deleted_files(seen_files, base_paths)
+            self._link_files()
+            if self.manifest is not None:
+                self.manifest.save()
+        except FileNotFoundError as e:
+            print(f"Error: Directory not found at {directory_path}. Details: {e}")
+            raise
+        except Exception as e:
+            print(f"An unexpected error occurred during indexing: {e}")
+            # In a real app, you might want to log this with more detail.
+            # For now, we re-raise to let the caller handle it.
+            raise
+
+    async def execute_diff(
+        self,
+        directory_path: str,
+        base_commit: str,
+        target_commit: str,
+        include_dirs: list[str] | None = None,
+    ) -> None:
+        """
+        Brings the index from ``base_commit`` up to ``target_commit``.
+
+        Only the paths reported by ``git diff --name-status`` are touched, and
+        file contents are read from ``target_commit`` rather than the working
+        tree. Renamed files keep their stored chunks and graph nodes; if the
+        content also changed, only the affected chunks are re-embedded.
+
+        Requires a manifest reflecting ``base_commit``.
+        """
+        if self.manifest is None:
+            raise ValueError("Diff-based indexing requires an IndexManifest.")
+
+        try:
+            print(
+                f"Indexing changes in {directory_path} "
+                f"from {base_commit} to {target_commit}"
+            )
+            self._start_run(directory_path)
+            git_reader = GitDiffReader(directory_path)
+            prefixes = tuple(
+                os.path.join(base_path, "")
+                for base_path in self.file_processor.get_base_paths(
+                    directory_path, include_dirs
+                )
+            )
+
+            def is_indexed(relative_path: str) -> bool:
+                file_path = os.path.join(directory_path, relative_path)
+                return file_path.startswith(prefixes) and (
+                    self.file_processor.is_supported(file_path)
+                )
+
+            to_index: list[str] = []
+            removed_count = 0
+            moved_count = 0
+            for change in git_reader.get_changes(base_commit, target_commit):
+                file_path = os.path.join(directory_path, change.path)
+                if change.status == FileChangeStatus.RENAMED and change.old_path:
+                    old_file_path = os.path.join(directory_path, change.old_path)
+                    if not is_indexed(change.path):
+                        removed_count += 1
+                        self._remove_file(old_file_path)
+                        continue
+                    if is_indexed(change.old_path) and self._move_file(
+                        old_file_path, file_path
+                    ):
+                        moved_count += 1
+                        if change.similarity == 100:
+                            continue
+                    to_index.append(change.path)
+                elif change.status == FileChangeStatus.DELETED:
+                    if is_indexed(change.path):
+                        removed_count += 1
+                        self._remove_file(file_path)
+                elif is_indexed(change.path):
+                    to_index.append(change.path)
+
+            print(
+                f"{len(to_index)} files to index, {moved_count} moved, "
+                f"{removed_count} removed."
+            )
+
+            def read_changed_files() -> Iterator[tuple[str, str]]:
+                for relative_path in to_index:
+                    content = git_reader.read_file(target_commit, relative_path)
+                    if content is not None:
+                        yield os.path.join(directory_path, relative_path), content
+
+            await self._index_files(read_changed_files())
+            self._link_files()
+            self.manifest.save()
+        except Exception as e:
+            print(f"An unexpected error occurred during diff indexing: {e}")
+            raise
+
+    def rebuild_graph(self) -> None:
+        """
+        Rebuilds the whole graph from the manifest and the parser's cache.
+
+        Nothing is embedded and, as long as the parse cache is warm, no file is
+        read or parsed: each manifest entry's content hash locates its cached
+        parse result, and the cross-file links recorded in the manifest are
+        written back as they are. This is meant for switching or resetting the
+        graph backend. Files missing from the cache are re-parsed from disk if
+        their content still matches the manifest, and skipped otherwise.
+
+        Requires a manifest.
+        """
+        if self.manifest is None:
+            raise ValueError("Rebuilding the graph requires an IndexManifest.")
+
+        print("Rebuilding the graph from the parse cache.")
+        self.graph_repository.clear_database()
+        cache = self.code_parser.cache
+        parsed_count = 0
+        skipped_count = 0
+        links: list[BaseEdge] = []
+        for file_path in sorted(self.manifest.file_paths()):
+            entry = self.manifest.get(file_path)
+            if entry is None or not entry.node_ids:
+                continue
+            compact = cache.get(file_path, entry.content_hash) if cache else None
+            if compact is not None:
+                parsed_data = decode_parsed_data(compact)
+            else:
+                reparsed = self._reparse(file_path, entry.content_hash)
+                if reparsed is None:
+                    skipped_count += 1
+                    continue
+                parsed_data = reparsed
+                parsed_count += 1
+
+            links.extend(entry.links)
+            self._pending_files.append(parsed_data)
+            self._pending_node_count += len(parsed_data.nodes)
+            if self._pending_node_count >= self.graph_batch_size:
+                self._flush_graph()
+        self._flush_graph()
+        if links:
+            self.graph_repository.add_edges(links)
+
+        print(
+            f"Rebuilt the graph of {len(self.manifest)} files; "
+            f"{parsed_count} were re-parsed, {skipped_count} were skipped "
+            "because they changed since they were indexed."
+        )
+
+    def clear_index(self) -> None:
+        """
+        Deletes the chunks and graph nodes of every file in the manifest and
+        empties it, so the next run re-indexes everything.
+
+        Files deleted since the last run are removed too, which would not
+        happen if only the manifest were cleared. Requires a manifest.
+        """
+        if self.manifest is None:
+            raise ValueError("Clearing the index requires an IndexManifest.")
+
+        file_paths = sorted(self.manifest.file_paths())
+        chunk_ids = [
+            chunk_id
+            for file_path in file_paths
+            if (entry := self.manifest.get(file_path)) is not None
+            for chunk_id in entry.chunk_ids
+        ]
+        if chunk_ids:
+            self.code_repository.delete_batch(chunk_ids)
+        if file_paths:
+            self.graph_repository.delete_files(file_paths)
+        self.manifest.clear()
+        self.manifest.save()
+        print(f"Cleared {len(file_paths)} previously indexed files.")
+
+    def _reparse(self, file_path: str, content_hash: str) -> ParsedData | None:
+        """
+        Parses a file from disk if its content matches ``content_hash``.
+        """
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+        if IndexManifest.hash_content(content) != content_hash:
+            return None
+        parsed_data = self.code_parser.parse(file_path, content)
+        if self.code_parser.cache is not None:
+            self.code_parser.cache.put(content_hash, encode_parsed_data(parsed_data))
+        return parsed_data
+
+    async def _index_files(self, files: Iterable[tuple[str, str]]) -> set[str]:
+        """
+        Streams files through parsing, splitting, embedding and storage.
+
+        Files are parsed by ``code_parser.parse_stream``, which may run in a
+        process pool. Chunks are buffered only until a full batch is available;
+        the batch is then handed to a background embedding task. When the
+        number of pending tasks reaches ``max_in_flight_batches`` the producer
+        waits for one to finish, which applies back-pressure to file reading
+        and parsing.
+
+        Returns:
+            The paths of all files that were seen, changed or not.
+        """
+        pending: set[asyncio.Task[int]] = set()
+        buffer: list[ChunkRecord] = []
+        seen_files: set[str] = set()
+        content_hashes: dict[str, str] = {}
+        file_count = 0
+        unchanged_count = 0
+        chunk_count = 0
+        indexed_count = 0
+
+        def select_changed_files() -> Iterator[tuple[str, str]]:
+            nonlocal unchanged_count
+            for file_path, content in tqdm_asyncio(files, desc="Indexing Files"):
+                seen_files.add(file_path)
+
+                previous = self.manifest.get(file_path) if self.manifest else None
+                content_hash = IndexManifest.hash_content(content)
+                if previous and previous.content_hash == content_hash:
+                    unchanged_count += 1
                     continue
-                parsed_data = self.code_parser.parse(file_path, content)
-                for node in parsed_data.nodes:
-                    self.graph_repository.add_node(node)
-                for edge in parsed_data.edges:
-                    self.graph_repository.add_edge(edge)
-            print("Knowledge graph construction complete.")
-            # --- End of Knowledge Graph Construction ---
-
-            all_chunks = []
-            for file_path, content in file_contents.items():
                 if not content.strip():
+                    self._store_file(file_path, content_hash, None, [])
                     continue
-                chunks = self.text_splitter.split(file_path, content)
-                all_chunks.extend(chunks)
-
-            if not all_chunks:
-                print("No content to index.")
-                return
 
-            print(f"Generated {len(all_chunks)} total code chunks.")
+                content_hashes[file_path] = content_hash
+                yield file_path, content
 
+        async def embed_and_store(batch: list[ChunkRecord]) -> int:
             # --- Resume Logic ---
-            all_chunk_ids = [chunk.id for chunk in all_chunks]
-            existing_ids = self.code_repository.get_existing_chunk_ids(all_chunk_ids)
+            existing_ids = self.code_repository.get_existing_chunk_ids(
+                [chunk.id for chunk in batch]
+            )
+            unindexed = [chunk for chunk in batch if chunk.id not in existing_ids]
+            if not unindexed:
+                return 0
+
+            embeddings = await self.embedding_client.get_embeddings_async(
+                [chunk.content for chunk in unindexed]
+            )
+            # Records are only referenced by this batch, so they are updated
+            # in place rather than copied.
+            for chunk, embedding in zip(unindexed, embeddings, strict=True):
+                chunk.set_embedding(embedding)
+            self.code_repository.add_batch(unindexed)
+            return len(unindexed)
 
-            unindexed_chunks = [
-                chunk for chunk in all_chunks if chunk.id not in existing_ids
-            ]
+        async def submit(batch: list[ChunkRecord]) -> None:
+            nonlocal indexed_count
+            while len(pending) >= self.max_in_flight_batches:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    pending.discard(task)
+                    indexed_count += task.result()
+            pending.add(asyncio.create_task(embed_and_store(batch)))
 
-            if not unindexed_chunks:
-                print("All chunks are already indexed. Nothing to do.")
-                return
+        try:
+            async for file_path, content, parsed_data in self.code_parser.parse_stream(
+                select_changed_files()
+            ):
+                file_count += 1
+                chunks = self.text_splitter.split_by_symbols(
+                    file_path, content, parsed_data
+                )
+                path = relative_path(file_path, self._root)
+                for chunk in chunks:
+                    chunk.metadata["relative_path"] = path
+                self._store_file(
+                    file_path, content_hashes.pop(file_path), parsed_data, chunks
+                )
 
-            print(
-                f"{len(existing_ids)} chunks already indexed. Resuming with {len(unindexed_chunks)} new chunks."
+                if self._pending_node_count >= self.graph_batch_size:
+                    self._flush_graph()
+
+                chunk_count += len(chunks)
+                buffer.extend(chunks)
+                while len(buffer) >= self.batch_size:
+                    await submit(buffer[: self.batch_size])
+                    buffer = buffer[self.batch_size :]
+
+            self._flush_graph()
+            if buffer:
+                await submit(buffer)
+            for indexed in await asyncio.gather(*pending):
+                indexed_count += indexed
+            pending.clear()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if unchanged_count:
+            print(f"Skipped {unchanged_count} unchanged files.")
+        if not chunk_count:
+            print("No content to index.")
+            return seen_files
+
+        print(
+            f"Processed {file_count} files into {chunk_count} chunks. "
+            f"Indexed {indexed_count} new chunks; "
+            f"{chunk_count - indexed_count} were already indexed."
+        )
+        return seen_files
+
+    def _store_file(
+        self,
+        file_path: str,
+        content_hash: str,
+        parsed_data: ParsedData | None,
+        chunks: list[ChunkRecord],
+    ) -> None:
+        """
+        Queues a file's graph replacement and records it in the manifest.
+
+        The file's new subgraph is buffered and swapped in by ``_flush_graph``.
+        Chunks whose content did not change keep their IDs and are skipped by
+        the resume logic; only stale ones are removed here.
+        """
+        previous = self.manifest.get(file_path) if self.manifest else None
+        if previous:
+            new_chunk_ids = {chunk.id for chunk in chunks}
+            self.code_repository.delete_batch(
+                [i for i in previous.chunk_ids if i not in new_chunk_ids]
             )
-            # --- End of Resume Logic ---
-
-            batch_size = 200
-            semaphore = asyncio.Semaphore(5)  # Reduced concurrency
-
-            async def get_embeddings_for_batch(
-                batch: list[CodeChunk],
-            ) -> list[CodeChunk]:
-                async with semaphore:
-                    contents = [chunk.content for chunk in batch]
-                    embeddings = await self.embedding_client.get_embeddings_async(
-                        contents
-                    )
 
-                    processed_batch = []
-                    for i, chunk in enumerate(batch):
-                        processed_batch.append(
-                            chunk.model_copy(update={"embedding": embeddings[i]})
+        if parsed_data is None:
+            parsed_data = ParsedData(file_path=file_path, nodes=[], edges=[])
+        self._pending_files.append(parsed_data)
+        self._pending_node_count += len(parsed_data.nodes)
+        self._symbol_table.add_parsed_data(parsed_data)
+        self._replaced_files.add(file_path)
+        self._changed_modules |= self._symbol_table.module_names(file_path)
+        node_ids = [node.id for node in parsed_data.nodes]
+
+        if self.manifest is not None:
+            self.manifest.record(
+                file_path,
+                ManifestEntry(
+                    content_hash=content_hash,
+                    relative_path=relative_path(file_path, self._root),
+                    chunk_ids=[chunk.id for chunk in chunks],
+                    node_ids=node_ids,
+                    symbols={
+                        node.id: node.type
+                        for node in parsed_data.nodes
+                        if node.type != NodeType.FILE
+                    },
+                    definitions=[
+                        SymbolDefinition(
+                            id=node.id,
+                            name=node.properties["name"],
+                            type=node.type,
+                            start_line=node.properties["start_line"],
+                            end_line=node.properties["end_line"],
                         )
+                        for node in parsed_data.nodes
+                        if node.type != NodeType.FILE
+                        and "name" in node.properties
+                        and "start_line" in node.properties
+                    ],
+                    imports=parsed_data.imports,
+                    calls=parsed_data.calls,
+                ),
+            )
 
-                    # Store immediately after processing
-                    self.code_repository.add_batch(processed_batch)
-                    return processed_batch
+    def _start_run(self, directory_path: str) -> None:
+        """
+        Loads the symbols of every file already in the manifest.
+        """
+        self._symbol_table = SymbolTable(directory_path)
+        self._replaced_files = set()
+        self._moved_files = set()
+        self._changed_modules = set()
+        self._root = directory_path
+        if self.manifest is None:
+            return
+        for file_path in self.manifest.file_paths():
+            entry = self.manifest.get(file_path)
+            if entry is not None:
+                self._symbol_table.add_file(
+                    file_path, entry.symbols, entry.imports, entry.calls
+                )
 
-            tasks = []
-            for i in range(0, len(unindexed_chunks), batch_size):
-                batch_to_process = unindexed_chunks[i : i + batch_size]
-                tasks.append(get_embeddings_for_batch(batch_to_process))
+    def _link_files(self) -> None:
+        """
+        Resolves imports and calls across files and writes the resulting edges.
 
-            print(
-                f"Sending {len(tasks)} batches to OpenAI API with controlled concurrency..."
-            )
+        Only files whose links can have changed are re-resolved: files
+        replaced or moved in this run, and files importing a module name that
+        one of them, or a removed file, can be imported by. The cost therefore
+        grows with the change, not with the repository. Of their links, only
+        edges that changed are written: links of replaced files (their old
+        links went with their nodes), links into replaced files, and links
+        whose resolution changed. Unresolvable references never reach the
+        graph.
+        """
 
-            await tqdm_asyncio.gather(*tasks, desc="Indexing Batches")
+        def key(edge: BaseEdge) -> tuple[EdgeType, str, str]:
+            return edge.type, edge.source_id, edge.target_id
 
-            print(
-                f"Successfully indexed {len(unindexed_chunks)} new chunks. Total indexed: {len(all_chunks)}."
+        to_add: list[BaseEdge] = []
+        to_delete: list[BaseEdge] = []
+        affected = (
+            self._replaced_files
+            | self._moved_files
+            | self._symbol_table.importers(self._changed_modules)
+        )
+        for file_path in sorted(affected):
+            links = self._symbol_table.resolve(file_path)
+            entry = self.manifest.get(file_path) if self.manifest else None
+            if entry is None or file_path in self._replaced_files:
+                to_add.extend(links)
+            else:
+                old_keys = {key(edge) for edge in entry.links}
+                new_keys = {key(edge) for edge in links}
+                to_delete.extend(e for e in entry.links if key(e) not in new_keys)
+                to_add.extend(
+                    edge
+                    for edge in links
+                    if key(edge) not in old_keys
+                    or edge.target_id.split("::", 1)[0] in self._replaced_files
+                )
+            if self.manifest is not None and entry is not None:
+                if [key(edge) for edge in entry.links] != [key(e) for e in links]:
+                    self.manifest.record(
+                        file_path, entry.model_copy(update={"links": links})
+                    )
+
+        if to_delete:
+            self.graph_repository.delete_edges(to_delete)
+        if to_add:
+            self.graph_repository.add_edges(to_add)
+            print(f"Linked {len(to_add)} cross-file imports and calls.")
+
+    def _flush_graph(self) -> None:
+        """
+        Swaps the buffered files' subgraphs into the graph in one operation.
+        """
+        if self._pending_files:
+            self.graph_repository.replace_files(self._pending_files)
+        self._pending_files = []
+        self._pending_node_count = 0
+
+    def _remove_deleted_files(
+        self, seen_files: set[str], base_paths: list[str]
+    ) -> None:
+        """
+        Deletes the chunks and graph nodes of files that no longer exist.
+
+        Only files under ``base_paths`` are considered, so indexing a subset of
+        directories never removes files outside of it. Without a manifest only
+        the graph can be checked, through its file nodes.
+        """
+        prefixes = tuple(os.path.join(base_path, "") for base_path in base_paths)
+        if self.manifest is None:
+            self.graph_repository.delete_files(
+                [
+                    file_id
+                    for file_id in self.graph_repository.get_file_ids()
+                    if file_id.startswith(prefixes) and file_id not in seen_files
+                ]
             )
-        except FileNotFoundError as e:
-            print(f"Error: Directory not found at {directory_path}. Details: {e}")
-            raise
-        except Exception as e:
-            print(f"An unexpected error occurred during indexing: {e}")
-            # In a real app, you might want to log this with more detail.
-            # For now, we re-raise to let the caller handle it.
-            raise
+            return
+
+        removed = [
+            file_path
+            for file_path in self.manifest.file_paths()
+            if file_path.startswith(prefixes) and file_path not in seen_files
+        ]
+        for file_path in removed:
+            self._remove_file(file_path)
+        if removed:
+            print(f"Removed {len(removed)} deleted files from the index.")
+
+    def _remove_file(self, file_path: str) -> None:
+        """Deletes a file's chunks, graph nodes and manifest entry."""
+        if self.manifest is None:
+            return
+
+        entry = self.manifest.remove(file_path)
+        self._symbol_table.remove_file(file_path)
+        self._replaced_files.add(file_path)
+        self._changed_modules |= self._symbol_table.module_names(file_path)
+        if entry:
+            self.code_repository.delete_batch(entry.chunk_ids)
+            self.graph_repository.delete_files([file_path])
+
+    def _move_file(self, old_path: str, new_path: str) -> bool:
+        """
+        Re-keys an indexed file's chunks, graph nodes and manifest entry.
+
+        Stored embeddings are copied to the new chunk IDs, so content that did
+        not change is never sent to the embedding API again.
+
+        Returns:
+            True if the file was known to the manifest and has been moved.
+        """
+        if self.manifest is None:
+            return False
+
+        entry = self.manifest.remove(old_path)
+        if entry is None:
+            return False
+
+        def rename(node_id: str) -> str:
+            if node_id == old_path or node_id.startswith(f"{old_path}::"):
+                return new_path + node_id[len(old_path) :]
+            return node_id
+
+        moved_chunks = self.code_repository.get_batch(entry.chunk_ids)
+        for chunk in moved_chunks:
+            chunk.id = CodeChunk.generate_id(new_path, chunk.content)
+            chunk.file_path = new_path
+            chunk.metadata = {
+                **chunk.metadata,
+                "file_path": new_path,
+                "relative_path": relative_path(new_path, self._root),
+            }
+            if "symbol_id" in chunk.metadata:
+                chunk.metadata["symbol_id"] = rename(chunk.metadata["symbol_id"])
+        if moved_chunks:
+            self.code_repository.add_batch(moved_chunks)
+        self.code_repository.delete_batch(entry.chunk_ids)
+        self.graph_repository.rename_file(old_path, new_path)
+
+        moved_entry = ManifestEntry(
+            content_hash=entry.content_hash,
+            relative_path=relative_path(new_path, self._root),
+            chunk_ids=[chunk.id for chunk in moved_chunks],
+            node_ids=[rename(node_id) for node_id in entry.node_ids],
+            symbols={
+                rename(node_id): node_type
+                for node_id, node_type in entry.symbols.items()
+            },
+            definitions=[
+                definition.model_copy(update={"id": rename(definition.id)})
+                for definition in entry.definitions
+            ],
+            imports=entry.imports,
+            calls=[
+                call.model_copy(update={"source_id": rename(call.source_id)})
+                for call in entry.calls
+            ],
+            links=[
+                edge.model_copy(
+                    update={
+                        "source_id": rename(edge.source_id),
+                        "target_id": rename(edge.target_id),
+                    }
+                )
+                for edge in entry.links
+            ],
+        )
+        self.manifest.record(new_path, moved_entry)
+        self._symbol_table.remove_file(old_path)
+        self._symbol_table.add_file(
+            new_path, moved_entry.symbols, moved_entry.imports, moved_entry.calls
+        )
+        self._moved_files.add(new_path)
+        self._changed_modules |= self._symbol_table.module_names(old_path)
+        self._changed_modules |= self._symbol_table.module_names(new_path)
+        return True
@@ -3,6 +3,8 @@ This module defines the core domain entities for the Codex-Scribe project.
 """
 
 import hashlib
+from array import array
+from collections.abc import Sequence
 from typing import Any
 
 from pydantic import BaseModel, Field
@@ -42,3 +44,84 @@ class CodeChunk(BaseModel):
 
         frozen = True
         extra = "forbid"
+
+
+class ChunkRecord:
+    """
+    A lightweight, mutable form of CodeChunk for the indexing and retrieval paths.
+
+    Records skip Pydantic validation and hold their embedding as a contiguous
+    ``array("f")`` of float32 values (about 6 KB for 1536 dimensions, instead
+    of tens of KB for a list of Python floats), so it can be set in place once
+    it is computed. CodeChunk remains the validated model for API boundaries;
+    use ``from_model`` and ``to_model`` to convert.
+    """
+
+    __slots__ = (
+        "id",
+        "file_path",
+        "content",
+        "start_line",
+        "end_line",
+        "embedding",
+        "metadata",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        file_path: str,
+        content: str,
+        start_line: int,
+        end_line: int,
+        embedding: Sequence[float] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ):
+        self.id = id
+        self.file_path = file_path
+        self.content = content
+        self.start_line = start_line
+        self.end_line = end_line
+        self.embedding: array[float] | None = None
+        if embedding is not None:
+            self.set_embedding(embedding)
+        self.metadata = metadata if metadata is not None else {}
+
+    def set_embedding(self, embedding: Sequence[float]) -> None:
+        """Stores an embedding as float32 values."""
+        self.embedding = (
+            embedding
+            if isinstance(embedding, array) and embedding.typecode == "f"
+            else array("f", embedding)
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"ChunkRecord(id={self.id!r}, file_path={self.file_path!r}, "
+            f"start_line={self.start_line}, end_line={self.end_line})"
+        )
+
+    @classmethod
+    def from_model(cls, chunk: CodeChunk) -> "ChunkRecord":
+        """Creates a record from a CodeChunk."""
+        return cls(
+            id=chunk.id,
+            file_path=chunk.file_path,
+            content=chunk.content,
+            start_line=chunk.start_line,
+            end_line=chunk.end_line,
+            embedding=chunk.embedding,
+            metadata=dict(chunk.metadata),
+        )
+
+    def to_model(self) -> CodeChunk:
+        """Creates a validated CodeChunk from the record."""
+        return CodeChunk(
+            id=self.id,
+            file_path=self.file_path,
+            content=self.content,
+            start_line=self.start_line,
+            end_line=self.end_line,
+            embedding=self.embedding.tolist() if self.embedding is not None else None,
+            metadata=dict(self.metadata),
+        )
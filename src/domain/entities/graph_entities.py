@@ -63,6 +63,12 @@ class BaseEdge(BaseModel):
     properties: dict[str, Any] = Field(
         default_factory=dict, description="A dictionary of edge properties."
     )
+    source_type: NodeType | None = Field(
+        None, description="The type of the source node, if known."
+    )
+    target_type: NodeType | None = Field(
+        None, description="The type of the target node, if known."
+    )
 
 
 class ContainsEdge(BaseEdge):
@@ -83,11 +89,62 @@ class CallsEdge(BaseEdge):
     type: EdgeType = Field(default=EdgeType.CALLS, frozen=True)
 
 
+class ImportReference(BaseModel):
+    """
+    A name bound by an import statement, before it is resolved to a file.
+
+    ``import a.b`` binds ``a.b``, ``import a.b as x`` binds ``x`` and
+    ``from ..a import y as z`` binds ``z``.
+    """
+
+    module: str = Field(..., description="The module path as written, without dots.")
+    level: int = Field(0, description="The number of leading dots (relative level).")
+    name: str | None = Field(
+        None, description="The imported name for `from` imports, or `*`."
+    )
+    alias: str | None = Field(None, description="The `as` alias, if any.")
+
+    @property
+    def local_name(self) -> str:
+        """The name the import binds in the importing file."""
+        return self.alias or self.name or self.module
+
+
+class CallReference(BaseModel):
+    """
+    A call that could not be resolved within its own file.
+    """
+
+    source_id: str = Field(..., description="The ID of the calling scope.")
+    source_type: NodeType = Field(..., description="The type of the calling scope.")
+    name: str = Field(..., description="The name of the called function.")
+    receiver: str | None = Field(
+        None, description="The object the function is looked up on, e.g. `mod`."
+    )
+
+
+class SymbolDefinition(BaseModel):
+    """
+    Where a class or function is defined, as recorded for symbol lookups.
+    """
+
+    id: str = Field(..., description="The ID of the symbol's node.")
+    name: str = Field(..., description="The symbol's unqualified name.")
+    type: NodeType = Field(..., description="The type of the symbol.")
+    start_line: int = Field(..., description="The first line of the definition.")
+    end_line: int = Field(..., description="The last line of the definition.")
+
+
 class ParsedData(BaseModel):
     """
     A container for all nodes and edges extracted from a single file.
+
+    ``imports`` and ``calls`` hold the references that need other files to be
+    resolved; see SymbolTable.
     """
 
     file_path: str
     nodes: list[BaseNode]
     edges: list[BaseEdge]
+    imports: list[ImportReference] = Field(default_factory=list)
+    calls: list[CallReference] = Field(default_factory=list)
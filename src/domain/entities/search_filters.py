@@ -0,0 +1,138 @@
+"""
+This module defines the filters that scope a code search to part of a repository.
+"""
+
+import os
+import posixpath
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from src.domain.entities.graph_entities import NodeType
+
+# The language of a file, by extension. Files with other extensions have no
+# language and only match filters that do not constrain it.
+LANGUAGES_BY_EXTENSION = {
+    ".py": "python",
+    ".md": "markdown",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".html": "html",
+    ".css": "css",
+    ".java": "java",
+    ".c": "c",
+    ".h": "c",
+    ".cpp": "cpp",
+    ".hpp": "cpp",
+    ".cs": "csharp",
+    ".go": "go",
+    ".rs": "rust",
+    ".php": "php",
+    ".rb": "ruby",
+    ".swift": "swift",
+    ".kt": "kotlin",
+    ".scala": "scala",
+    ".sh": "shell",
+    ".toml": "toml",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+}
+
+
+def file_extension(file_path: str) -> str:
+    """Returns the lowercased extension of a path, including the dot."""
+    return posixpath.splitext(file_path)[1].lower()
+
+
+def file_language(file_path: str) -> str | None:
+    """Returns the language of a file, inferred from its extension."""
+    return LANGUAGES_BY_EXTENSION.get(file_extension(file_path))
+
+
+def path_components(file_path: str) -> list[str]:
+    """Splits a path into its components, ignoring "." and empty parts."""
+    return [
+        part
+        for part in file_path.replace("\\", "/").split("/")
+        if part not in ("", ".")
+    ]
+
+
+def relative_path(file_path: str, root: str) -> str:
+    """Returns a file's path relative to the indexed root, with "/" separators."""
+    return os.path.relpath(file_path, root).replace(os.sep, "/")
+
+
+def search_path(file_path: str, metadata: dict[str, Any]) -> str:
+    """
+    Returns the path that filters are matched against: the chunk's path
+    relative to the indexed root, or its stored path for chunks indexed
+    without one.
+    """
+    return str(metadata.get("relative_path") or file_path)
+
+
+class SearchFilters(BaseModel):
+    """
+    Restricts a search to chunks matching every given constraint.
+
+    Constraints left empty match everything. ``path_prefix`` is relative to
+    the root of the indexed repository and matches whole path components, so
+    ``src/api`` matches ``src/api/routes.py`` but not ``src/api_v2/routes.py``;
+    it may also name a single file.
+    """
+
+    path_prefix: str | None = Field(
+        None, description="A directory or file the chunks must be in."
+    )
+    languages: list[str] = Field(
+        [], description="Languages the chunks may be written in, e.g. 'python'."
+    )
+    extensions: list[str] = Field(
+        [], description="File extensions the chunks may have, e.g. '.py'."
+    )
+    symbol_types: list[str] = Field(
+        [],
+        description="Kinds of symbol the chunks may belong to: File, Class or Function.",
+    )
+
+    def is_empty(self) -> bool:
+        """Whether the filters match every chunk."""
+        return not (
+            path_components(self.path_prefix or "")
+            or self.languages
+            or self.extensions
+            or self.symbol_types
+        )
+
+    def normalized_extensions(self) -> list[str]:
+        """Returns the extensions lowercased and with a leading dot."""
+        return [
+            extension.lower() if extension.startswith(".") else f".{extension.lower()}"
+            for extension in self.extensions
+        ]
+
+    def matches_file(self, file_path: str) -> bool:
+        """
+        Checks the constraints that depend only on a chunk's path, relative to
+        the indexed root (see ``search_path``).
+        """
+        prefix = path_components(self.path_prefix or "")
+        if prefix and path_components(file_path)[: len(prefix)] != prefix:
+            return False
+        if self.languages and file_language(file_path) not in self.languages:
+            return False
+        if self.extensions and file_extension(file_path) not in (
+            self.normalized_extensions()
+        ):
+            return False
+        return True
+
+    def matches(self, file_path: str, metadata: dict[str, Any]) -> bool:
+        """Checks every constraint against a chunk's file path and metadata."""
+        return self.matches_file(search_path(file_path, metadata)) and (
+            not self.symbol_types
+            or metadata.get("symbol_type", NodeType.FILE.value) in self.symbol_types
+        )
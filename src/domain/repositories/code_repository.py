@@ -4,12 +4,16 @@ This module defines the abstract repository interfaces for data access.
 
 from abc import ABC, abstractmethod
 
-from src.domain.entities.code_chunk import CodeChunk
+from src.domain.entities.code_chunk import ChunkRecord, CodeChunk
+from src.domain.entities.search_filters import SearchFilters
 
 
 class CodeRepository(ABC):
     """
-    Abstract interface for a repository that stores and retrieves CodeChunk objects.
+    Abstract interface for a repository that stores and retrieves code chunks.
+
+    Batch operations and search work on lightweight ChunkRecord objects; only
+    ``add`` accepts a validated CodeChunk.
     """
 
     @abstractmethod
@@ -23,25 +27,116 @@ class CodeRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def add_batch(self, chunks: list[CodeChunk]) -> None:
+    def add_batch(self, chunks: list[ChunkRecord]) -> None:
+        """
+        Adds a batch of chunks to the repository.
+
+        Args:
+            chunks: A list of ChunkRecord objects with embeddings to add.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_batch(self, chunk_ids: list[str]) -> list[ChunkRecord]:
+        """
+        Retrieves stored chunks, including their embeddings.
+
+        Args:
+            chunk_ids: The IDs of the chunks to retrieve. Unknown IDs are ignored.
+
+        Returns:
+            The ChunkRecord objects that were found.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_batch(self, chunk_ids: list[str]) -> None:
         """
-        Adds a batch of CodeChunk objects to the repository.
+        Removes a batch of chunks from the repository.
 
         Args:
-            chunks: A list of CodeChunk objects to add.
+            chunk_ids: The IDs of the chunks to remove. Unknown IDs are ignored.
         """
         raise NotImplementedError
 
     @abstractmethod
-    def search(self, query_embedding: list[float], top_k: int = 5) -> list[CodeChunk]:
+    def get_existing_chunk_ids(self, chunk_ids: list[str]) -> set[str]:
         """
-        Searches for the most similar CodeChunks based on a query embedding.
+        Retrieves the set of chunk IDs that are already stored.
+
+        Args:
+            chunk_ids: A list of chunk IDs to check.
+
+        Returns:
+            A set of IDs that are present in the repository.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def search(
+        self,
+        query_embedding: list[float],
+        top_k: int = 5,
+        filters: SearchFilters | None = None,
+    ) -> list[ChunkRecord]:
+        """
+        Searches for the most similar chunks based on a query embedding.
+
+        Implementations apply ``filters`` before or while scoring, so that only
+        matching chunks compete for the ``top_k`` places.
 
         Args:
             query_embedding: The vector embedding of the search query.
             top_k: The number of most similar chunks to return.
+            filters: Optional constraints on the chunks to search.
+
+        Returns:
+            A list of the most relevant ChunkRecord objects.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def search_many(
+        self,
+        query_embeddings: list[list[float]],
+        top_k: int = 5,
+        filters: SearchFilters | None = None,
+    ) -> list[list[ChunkRecord]]:
+        """
+        Searches for the most similar chunks to each of several query embeddings.
+
+        Implementations score the queries together rather than running one
+        search per query, so batch workloads share the cost of a scan.
+
+        Args:
+            query_embeddings: The vector embeddings of the search queries.
+            top_k: The number of most similar chunks to return per query.
+            filters: Optional constraints on the chunks to search, shared by
+                every query.
+
+        Returns:
+            One list of the most relevant ChunkRecord objects per query, in the
+            order of ``query_embeddings``.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def keyword_search(
+        self, query: str, top_k: int = 5, filters: SearchFilters | None = None
+    ) -> list[ChunkRecord]:
+        """
+        Searches chunk text for the terms of a query, ranked with BM25.
+
+        Code identifiers are split into their snake_case and camelCase parts,
+        so exact identifiers and the words they are made of both match. No
+        embedding is needed.
+
+        Args:
+            query: The text of the search query.
+            top_k: The number of best matching chunks to return.
+            filters: Optional constraints on the chunks to search.
 
         Returns:
-            A list of the most relevant CodeChunk objects.
+            A list of the best matching ChunkRecord objects.
         """
         raise NotImplementedError
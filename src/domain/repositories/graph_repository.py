@@ -0,0 +1,153 @@
+"""
+This module defines the abstract repository interface for the code knowledge graph.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+from src.domain.entities.graph_entities import BaseEdge, BaseNode, ParsedData
+
+
+class GraphRepository(ABC):
+    """
+    Abstract interface for a repository that stores the code knowledge graph.
+    """
+
+    @abstractmethod
+    def add_nodes(self, nodes: list[BaseNode]) -> None:
+        """
+        Adds nodes to the graph, merging them with existing nodes of the same ID.
+
+        Args:
+            nodes: The nodes to add.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_edges(self, edges: list[BaseEdge]) -> None:
+        """
+        Adds edges between existing nodes.
+
+        Edges whose endpoints do not exist (or do not have the edge's declared
+        endpoint types) are ignored, so nodes must be added first.
+
+        Args:
+            edges: The edges to add.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_edges(self, edges: list[BaseEdge]) -> None:
+        """
+        Deletes edges, leaving their endpoints in place.
+
+        Args:
+            edges: The edges to delete. Unknown edges are ignored.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_nodes(self, node_ids: list[str]) -> None:
+        """
+        Deletes nodes together with all of their edges.
+
+        Args:
+            node_ids: The IDs of the nodes to delete. Unknown IDs are ignored.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def replace_files(self, parsed_files: list[ParsedData]) -> None:
+        """
+        Atomically replaces the subgraphs of the given files.
+
+        The nodes each file owns (the file node and every node whose ID is
+        prefixed with ``<file_id>::``) are removed with their edges, and the
+        new nodes and edges are written, as a single unit. The rest of the
+        graph is untouched and stays queryable throughout.
+
+        Args:
+            parsed_files: The new contents of each file's subgraph. A file with
+                no nodes is removed from the graph.
+        """
+        raise NotImplementedError
+
+    def delete_files(self, file_ids: list[str]) -> None:
+        """
+        Removes the subgraphs of the given files.
+
+        Args:
+            file_ids: The IDs (paths) of the files to remove.
+        """
+        if file_ids:
+            self.replace_files(
+                [
+                    ParsedData(file_path=file_id, nodes=[], edges=[])
+                    for file_id in file_ids
+                ]
+            )
+
+    @abstractmethod
+    def get_file_ids(self) -> list[str]:
+        """
+        Lists the IDs (paths) of all file nodes.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def rename_file(self, old_file_id: str, new_file_id: str) -> None:
+        """
+        Moves a file node and the nodes it owns to a new file path.
+
+        Owned nodes are those whose ID is prefixed with ``<file_id>::``; their
+        edges are kept as they are.
+
+        Args:
+            old_file_id: The current ID (path) of the file.
+            new_file_id: The new ID (path) of the file.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear_database(self) -> None:
+        """
+        Deletes all nodes and edges.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_function_callers(self, function_name: str) -> list[dict[str, Any]]:
+        """
+        Finds everything that calls a function with the given name.
+
+        Returns:
+            A list of ``{"caller_id", "caller_name"}`` dictionaries.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_methods_in_class(self, class_name: str) -> list[dict[str, Any]]:
+        """
+        Finds the methods contained in a class with the given name.
+
+        Returns:
+            A list of ``{"method_id", "method_name"}`` dictionaries.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_class_dependencies(self, class_name: str) -> list[dict[str, Any]]:
+        """
+        Finds the modules that import a class with the given name.
+
+        Returns:
+            A list of ``{"importer_id"}`` dictionaries.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Releases any resources held by the repository.
+        """
+        raise NotImplementedError
@@ -0,0 +1,133 @@
+"""
+This module provides an in-memory BM25 keyword index over chunk text, with a
+tokenizer that understands code identifiers.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable, Iterator
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|[0-9]+")
+# Splits camelCase and PascalCase words, keeping acronyms together:
+# "parseHTTPResponse" -> "parse", "HTTP", "Response".
+_CAMEL_PART = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits text into lowercase search terms.
+
+    Every identifier yields itself and, if it is compound, its snake_case and
+    camelCase parts, so ``get_existing_chunk_ids`` matches both the exact
+    identifier and a query for "existing chunk". Single characters are
+    dropped.
+    """
+    terms: list[str] = []
+    for identifier in _IDENTIFIER.findall(text):
+        lowered = identifier.lower()
+        if len(lowered) > 1:
+            terms.append(lowered)
+        parts = [
+            part.lower()
+            for word in identifier.split("_")
+            for part in _CAMEL_PART.findall(word)
+        ]
+        if len(parts) > 1:
+            terms.extend(part for part in parts if len(part) > 1)
+    return terms
+
+
+class BM25Index:
+    """
+    Scores chunks against a keyword query with Okapi BM25.
+
+    Postings map each term to the chunks containing it and the term's
+    frequency there, so a query only visits the chunks sharing a term with
+    it. Chunks can be added, replaced and removed at any time; document
+    frequencies and the average length are kept up to date incrementally.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initializes an empty index.
+
+        Args:
+            k1: The term frequency saturation parameter.
+            b: How strongly scores are normalized by chunk length.
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[str, int]] = {}
+        self._lengths: dict[str, int] = {}
+        # The distinct terms of every chunk, so removal touches only its postings.
+        self._terms: dict[str, tuple[str, ...]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        """Returns the number of indexed chunks."""
+        return len(self._lengths)
+
+    def __contains__(self, chunk_id: object) -> bool:
+        """Checks whether a chunk is indexed."""
+        return chunk_id in self._lengths
+
+    def add(self, chunk_id: str, text: str) -> None:
+        """Indexes a chunk's text, replacing any earlier text for the same ID."""
+        if chunk_id in self._lengths:
+            self.remove([chunk_id])
+        terms = tokenize(text)
+        counts = Counter(terms)
+        for term, count in counts.items():
+            self._postings.setdefault(term, {})[chunk_id] = count
+        self._terms[chunk_id] = tuple(counts)
+        self._lengths[chunk_id] = len(terms)
+        self._total_length += len(terms)
+
+    def add_batch(self, documents: Iterable[tuple[str, str]]) -> None:
+        """Indexes ``(chunk_id, text)`` pairs."""
+        for chunk_id, text in documents:
+            self.add(chunk_id, text)
+
+    def remove(self, chunk_ids: Iterable[str]) -> None:
+        """Removes chunks from the index. Unknown IDs are ignored."""
+        for chunk_id in chunk_ids:
+            if chunk_id not in self._lengths:
+                continue
+            for term in self._terms.pop(chunk_id):
+                postings = self._postings[term]
+                del postings[chunk_id]
+                if not postings:
+                    del self._postings[term]
+            self._total_length -= self._lengths.pop(chunk_id)
+
+    def scores(self, query: str) -> dict[str, float]:
+        """Returns the BM25 score of every chunk that shares a term with the query."""
+        if not self._lengths:
+            return {}
+        count = len(self._lengths)
+        average_length = self._total_length / count or 1
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, frequency in postings.items():
+                norm = self.k1 * (
+                    1 - self.b + self.b * self._lengths[chunk_id] / average_length
+                )
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * (
+                    frequency * (self.k1 + 1) / (frequency + norm)
+                )
+        return scores
+
+    def search(self, query: str, top_k: int = 5) -> list[tuple[str, float]]:
+        """Returns the ``top_k`` best ``(chunk_id, score)`` pairs, best first."""
+        return heapq.nlargest(top_k, self.scores(query).items(), key=lambda i: i[1])
+
+    def ranked(self, query: str) -> Iterator[str]:
+        """Yields every matching chunk ID, best first."""
+        scores = self.scores(query)
+        yield from sorted(scores, key=scores.__getitem__, reverse=True)
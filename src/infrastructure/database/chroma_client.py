@@ -2,16 +2,40 @@
 This module provides a client to interact with a ChromaDB vector database.
 """
 
+import re
+from typing import Any
+
 import chromadb
 from chromadb.api.models.Collection import Collection
 
-from src.domain.entities.code_chunk import CodeChunk
+from src.domain.entities.code_chunk import ChunkRecord, CodeChunk
+from src.domain.entities.search_filters import (
+    SearchFilters,
+    file_extension,
+    file_language,
+    path_components,
+    search_path,
+)
 from src.domain.repositories.code_repository import CodeRepository
+from src.infrastructure.database.bm25_index import BM25Index
+
+# Metadata keys holding the components of a chunk's path, one per depth, so
+# that a path prefix can be matched with equality filters.
+_PATH_KEY = re.compile(r"path_\d+")
 
 
 class ChromaDBClient(CodeRepository):
     """
     A client for interacting with ChromaDB, implementing the CodeRepository.
+
+    Search filters are translated into a ``where`` clause. To make them
+    expressible, every chunk is stored with its ``language``, ``extension``
+    and the components of its path relative to the indexed root (``path_0``,
+    ``path_1``, ...) in its metadata.
+
+    Keyword search uses a local BM25Index, built from the collection's
+    documents on first use and kept up to date by later changes made
+    through this client.
     """
 
     def __init__(
@@ -28,6 +52,7 @@ class ChromaDBClient(CodeRepository):
         self.collection: Collection = self.client.get_or_create_collection(
             name=collection_name
         )
+        self._keywords: BM25Index | None = None
 
     def add(self, chunk: CodeChunk) -> None:
         """
@@ -45,23 +70,29 @@ class ChromaDBClient(CodeRepository):
             ids=[chunk.id],
             embeddings=[chunk.embedding],
             documents=[chunk.content],
-            metadatas=[chunk.metadata],
+            metadatas=[self._indexed_metadata(chunk.file_path, chunk.metadata)],
         )
+        if self._keywords is not None:
+            self._keywords.add(chunk.id, chunk.content)
 
-    def add_batch(self, chunks: list[CodeChunk]) -> None:
+    def add_batch(self, chunks: list[ChunkRecord]) -> None:
         """
-        Adds a batch of CodeChunk objects to the ChromaDB collection.
+        Adds a batch of chunks to the ChromaDB collection.
 
         Args:
-            chunks: A list of CodeChunk objects to add.
+            chunks: A list of ChunkRecord objects to add.
         """
         ids = [chunk.id for chunk in chunks]
-        embeddings = [chunk.embedding for chunk in chunks if chunk.embedding]
+        embeddings = [
+            chunk.embedding.tolist() for chunk in chunks if chunk.embedding is not None
+        ]
         documents = [chunk.content for chunk in chunks]
-        metadatas = [chunk.metadata for chunk in chunks]
+        metadatas = [
+            self._indexed_metadata(chunk.file_path, chunk.metadata) for chunk in chunks
+        ]
 
         if len(embeddings) != len(chunks):
-            raise ValueError("All CodeChunks in a batch must have an embedding.")
+            raise ValueError("All chunks in a batch must have an embedding.")
 
         self.collection.add(
             ids=ids,
@@ -69,6 +100,58 @@ class ChromaDBClient(CodeRepository):
             documents=documents,
             metadatas=metadatas,
         )
+        if self._keywords is not None:
+            self._keywords.add_batch(zip(ids, documents, strict=True))
+
+    def get_batch(self, chunk_ids: list[str]) -> list[ChunkRecord]:
+        """
+        Retrieves stored chunks, including their embeddings.
+
+        Args:
+            chunk_ids: The IDs of the chunks to retrieve. Unknown IDs are ignored.
+
+        Returns:
+            The ChunkRecord objects that were found.
+        """
+        if not chunk_ids:
+            return []
+
+        results = self.collection.get(
+            ids=chunk_ids, include=["embeddings", "documents", "metadatas"]
+        )
+        embeddings = results["embeddings"]
+        documents = results["documents"] or []
+        metadatas = results["metadatas"] or []
+
+        chunks: list[ChunkRecord] = []
+        for i, result_id in enumerate(results["ids"]):
+            metadata = dict(metadatas[i]) if metadatas else {}
+            chunks.append(
+                ChunkRecord(
+                    id=result_id,
+                    content=documents[i] if documents else "",
+                    file_path=metadata.get("file_path", "unknown"),
+                    start_line=metadata.get("start_line", -1),
+                    end_line=metadata.get("end_line", -1),
+                    embedding=embeddings[i] if embeddings is not None else None,
+                    metadata=metadata,
+                )
+            )
+        return chunks
+
+    def delete_batch(self, chunk_ids: list[str]) -> None:
+        """
+        Removes a batch of chunks from the ChromaDB collection.
+
+        Args:
+            chunk_ids: The IDs of the chunks to remove. Unknown IDs are ignored.
+        """
+        if not chunk_ids:
+            return
+
+        self.collection.delete(ids=chunk_ids)
+        if self._keywords is not None:
+            self._keywords.remove(chunk_ids)
 
     def get_existing_chunk_ids(self, chunk_ids: list[str]) -> set[str]:
         """
@@ -86,39 +169,168 @@ class ChromaDBClient(CodeRepository):
         results = self.collection.get(ids=chunk_ids, include=[])
         return set(results["ids"])
 
-    def search(self, query_embedding: list[float], top_k: int = 5) -> list[CodeChunk]:
+    def search(
+        self,
+        query_embedding: list[float],
+        top_k: int = 5,
+        filters: SearchFilters | None = None,
+    ) -> list[ChunkRecord]:
         """
-        Searches for the most similar CodeChunks in the ChromaDB collection.
+        Searches for the most similar chunks in the ChromaDB collection.
 
         Args:
             query_embedding: The vector embedding of the search query.
             top_k: The number of most similar chunks to return.
+            filters: Optional constraints, applied by ChromaDB during the query.
 
         Returns:
-            A list of the most relevant CodeChunk objects.
+            A list of the most relevant ChunkRecord objects.
         """
+        return self.search_many([query_embedding], top_k, filters)[0]
+
+    def search_many(
+        self,
+        query_embeddings: list[list[float]],
+        top_k: int = 5,
+        filters: SearchFilters | None = None,
+    ) -> list[list[ChunkRecord]]:
+        """
+        Searches for the most similar chunks to several queries in one ChromaDB
+        query.
+
+        Args:
+            query_embeddings: The vector embeddings of the search queries.
+            top_k: The number of most similar chunks to return per query.
+            filters: Optional constraints, applied by ChromaDB during the query.
+
+        Returns:
+            One list of the most relevant ChunkRecord objects per query, in order.
+        """
+        if not len(query_embeddings):
+            return []
         results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=list(query_embeddings),
             n_results=top_k,
+            where=self._where(filters) if filters else None,
         )
-
-        retrieved_chunks: list[CodeChunk] = []
         if not results["ids"] or not results["documents"] or not results["metadatas"]:
-            return retrieved_chunks
+            return [[] for _ in query_embeddings]
 
-        for i, result_id in enumerate(results["ids"][0]):
-            # ChromaDB returns metadata as a dict, but we need to reconstruct the CodeChunk
+        retrieved: list[list[ChunkRecord]] = []
+        for ids, documents, metadatas in zip(
+            results["ids"], results["documents"], results["metadatas"], strict=True
+        ):
+            # ChromaDB returns metadata as a dict, but we need to reconstruct the chunk
             # We don't have all the original fields, so we fill what we can.
             # This is a limitation when retrieving from a simple vector store.
-            metadata = results["metadatas"][0][i] if results["metadatas"] else {}
-            chunk = CodeChunk(
-                id=result_id,
-                content=results["documents"][0][i] if results["documents"] else "",
-                file_path=metadata.get("file_path", "unknown"),
-                start_line=metadata.get("start_line", -1),
-                end_line=metadata.get("end_line", -1),
-                metadata=metadata,
+            retrieved.append(
+                [
+                    ChunkRecord(
+                        id=result_id,
+                        content=documents[i],
+                        file_path=metadatas[i].get("file_path", "unknown"),
+                        start_line=metadatas[i].get("start_line", -1),
+                        end_line=metadatas[i].get("end_line", -1),
+                        metadata=metadatas[i],
+                    )
+                    for i, result_id in enumerate(ids)
+                ]
+            )
+        return retrieved
+
+    def keyword_search(
+        self, query: str, top_k: int = 5, filters: SearchFilters | None = None
+    ) -> list[ChunkRecord]:
+        """
+        Finds the chunks whose text best matches the terms of a query (BM25).
+
+        Args:
+            query: The text of the search query.
+            top_k: The number of best matching chunks to return.
+            filters: Optional constraints, applied by ChromaDB to the matches.
+
+        Returns:
+            A list of the best matching ChunkRecord objects, best first.
+        """
+        if self._keywords is None:
+            self._keywords = self._build_keyword_index()
+        where = self._where(filters) if filters else None
+        ranked = list(self._keywords.ranked(query))
+
+        chunks: list[ChunkRecord] = []
+        page_size = max(4 * top_k, 50)
+        for start in range(0, len(ranked), page_size):
+            page = ranked[start : start + page_size]
+            results = self.collection.get(
+                ids=page, where=where, include=["documents", "metadatas"]
             )
-            retrieved_chunks.append(chunk)
+            documents = results["documents"] or []
+            metadatas = results["metadatas"] or []
+            found = {
+                result_id: ChunkRecord(
+                    id=result_id,
+                    content=documents[i] if documents else "",
+                    file_path=str(metadatas[i].get("file_path", "unknown")),
+                    start_line=int(metadatas[i].get("start_line", -1)),
+                    end_line=int(metadatas[i].get("end_line", -1)),
+                    metadata=dict(metadatas[i]),
+                )
+                for i, result_id in enumerate(results["ids"])
+            }
+            chunks.extend(found[chunk_id] for chunk_id in page if chunk_id in found)
+            if len(chunks) >= top_k:
+                break
+        return chunks[:top_k]
 
-        return retrieved_chunks
+    def _build_keyword_index(self, page_size: int = 1000) -> BM25Index:
+        """Indexes the text of every chunk in the collection."""
+        index = BM25Index()
+        offset = 0
+        while True:
+            results = self.collection.get(
+                include=["documents"], limit=page_size, offset=offset
+            )
+            if not results["ids"]:
+                return index
+            index.add_batch(
+                zip(results["ids"], results["documents"] or [], strict=True)
+            )
+            offset += page_size
+
+    @staticmethod
+    def _indexed_metadata(file_path: str, metadata: dict[str, Any]) -> dict[str, Any]:
+        """Adds the fields that search filters are evaluated against."""
+        indexed = {
+            key: value
+            for key, value in metadata.items()
+            if not _PATH_KEY.fullmatch(key)
+        }
+        indexed["extension"] = file_extension(file_path)
+        language = file_language(file_path)
+        if language:
+            indexed["language"] = language
+        for depth, component in enumerate(
+            path_components(search_path(file_path, metadata))
+        ):
+            indexed[f"path_{depth}"] = component
+        return indexed
+
+    @staticmethod
+    def _where(filters: SearchFilters) -> dict[str, Any] | None:
+        """Translates search filters into a ChromaDB ``where`` clause."""
+        conditions: list[dict[str, Any]] = [
+            {f"path_{depth}": component}
+            for depth, component in enumerate(
+                path_components(filters.path_prefix or "")
+            )
+        ]
+        for key, values in (
+            ("language", filters.languages),
+            ("extension", filters.normalized_extensions()),
+            ("symbol_type", filters.symbol_types),
+        ):
+            if values:
+                conditions.append({key: {"$in": values}})
+        if not conditions:
+            return None
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
@@ -0,0 +1,57 @@
+"""
+This module builds the configured CodeRepository, so every entry point reads
+the same settings the same way.
+"""
+
+import os
+
+from src.domain.repositories.code_repository import CodeRepository
+from src.infrastructure.database.chroma_client import ChromaDBClient
+from src.infrastructure.database.ivf_index import IVFIndex
+from src.infrastructure.database.numpy_store import NumpyCodeRepository
+
+
+def create_code_repository(
+    backend: str | None = None,
+    path: str | None = None,
+    ivf_lists: int | None = None,
+    ivf_probes: int | None = None,
+    quantization: str | None = None,
+    prefilter_dimension: int | None = None,
+) -> CodeRepository:
+    """
+    Creates the vector store selected by the arguments or, for arguments left
+    as None, by the environment.
+
+    Args:
+        backend: ``"chroma"`` or ``"numpy"`` (``VECTOR_BACKEND``, default chroma).
+        path: The directory of the NumPy store (``VECTOR_STORE_PATH``).
+        ivf_lists: The number of IVF lists of the NumPy store, 0 to search
+            exactly (``VECTOR_IVF_LISTS``).
+        ivf_probes: How many IVF lists each query scans (``VECTOR_IVF_PROBES``).
+        quantization: ``"float16"`` or ``"int8"`` to score against a quantized
+            copy of the NumPy store (``VECTOR_QUANTIZATION``).
+        prefilter_dimension: The number of leading dimensions scanned before
+            rescoring, 0 to scan all (``VECTOR_PREFILTER_DIMENSION``).
+
+    Returns:
+        A ChromaDBClient or a NumpyCodeRepository.
+    """
+    backend = backend or os.getenv("VECTOR_BACKEND", "chroma")
+    if backend == "chroma":
+        return ChromaDBClient()
+    if backend != "numpy":
+        raise ValueError(f"Unknown vector backend: {backend}")
+
+    if ivf_lists is None:
+        ivf_lists = int(os.getenv("VECTOR_IVF_LISTS", "0"))
+    if ivf_probes is None:
+        ivf_probes = int(os.getenv("VECTOR_IVF_PROBES", "16"))
+    if prefilter_dimension is None:
+        prefilter_dimension = int(os.getenv("VECTOR_PREFILTER_DIMENSION", "0"))
+    return NumpyCodeRepository(
+        path or os.getenv("VECTOR_STORE_PATH", "./data/vector_store"),
+        index=IVFIndex(n_lists=ivf_lists, n_probes=ivf_probes) if ivf_lists else None,
+        quantization=quantization or os.getenv("VECTOR_QUANTIZATION") or None,
+        prefilter_dimension=prefilter_dimension or None,
+    )
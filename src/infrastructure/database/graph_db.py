@@ -2,21 +2,72 @@
 This module provides a service for interacting with a Neo4j graph database.
 """
 
-from neo4j import GraphDatabase, Transaction
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
 
-from src.domain.entities.graph_entities import BaseEdge, BaseNode
+from neo4j import GraphDatabase, ManagedTransaction
 
+from src.domain.entities.graph_entities import (
+    BaseEdge,
+    BaseNode,
+    NodeType,
+    ParsedData,
+)
+from src.domain.repositories.graph_repository import GraphRepository
 
-class Neo4jService:
+
+class Neo4jService(GraphRepository):
     """
-    A service to manage connections and operations with a Neo4j database.
+    A service to manage connections and operations with a Neo4j database,
+    implementing the GraphRepository.
     """
 
-    def __init__(self, uri: str, user: str, password: str) -> None:
+    def __init__(
+        self,
+        uri: str,
+        user: str,
+        password: str,
+        batch_size: int = 5000,
+        ensure_schema: bool = True,
+    ) -> None:
         """
         Initializes the Neo4jService and connects to the database.
+
+        Args:
+            uri: The Neo4j connection URI.
+            user: The Neo4j user.
+            password: The Neo4j password.
+            batch_size: The maximum number of rows written per transaction by
+                the bulk methods.
+            ensure_schema: Whether to create the constraints and indexes on
+                connect.
         """
         self._driver = GraphDatabase.driver(uri, auth=(user, password))
+        self.batch_size = batch_size
+        if ensure_schema:
+            self.ensure_schema()
+
+    def ensure_schema(self) -> None:
+        """
+        Creates a uniqueness constraint on ``id`` and an index on ``name`` for
+        every node label.
+
+        Every statement uses ``IF NOT EXISTS``, so this is safe to run on each
+        startup. The constraints also back the ``id`` lookups of MERGE and of
+        edge writes with an index.
+        """
+        with self._driver.session() as session:
+            for node_type in NodeType:
+                label = node_type.value
+                session.run(
+                    f"CREATE CONSTRAINT {label.lower()}_id IF NOT EXISTS "
+                    f"FOR (n:{label}) REQUIRE n.id IS UNIQUE"
+                )
+                session.run(
+                    f"CREATE INDEX {label.lower()}_name IF NOT EXISTS "
+                    f"FOR (n:{label}) ON (n.name)"
+                )
 
     def close(self) -> None:
         """Closes the database connection."""
@@ -28,14 +79,98 @@ class Neo4jService:
         It uses MERGE to avoid creating duplicate nodes.
         """
         with self._driver.session() as session:
-            session.write_transaction(self._create_node_tx, node)
+            session.execute_write(self._create_node_tx, node)
 
     def add_edge(self, edge: BaseEdge) -> None:
         """
         Adds an edge between two existing nodes.
         """
         with self._driver.session() as session:
-            session.write_transaction(self._create_edge_tx, edge)
+            session.execute_write(self._create_edge_tx, edge)
+
+    def add_nodes(self, nodes: Iterable[BaseNode]) -> None:
+        """
+        Adds nodes to the graph in bulk.
+
+        Nodes are grouped by label and written with one parameterized
+        ``UNWIND`` query per group, in transactions of at most ``batch_size``
+        rows, all within a single session.
+        """
+        with self._driver.session() as session:
+            for label, rows in self._group_nodes(nodes).items():
+                for batch in self._batches(rows):
+                    session.execute_write(self._create_nodes_tx, label, batch)
+
+    def add_edges(self, edges: Iterable[BaseEdge]) -> None:
+        """
+        Adds edges between existing nodes in bulk.
+
+        Edges are grouped by relationship type and endpoint labels and written
+        the same way as ``add_nodes``. Nodes must be written before the edges
+        that use them.
+        """
+        with self._driver.session() as session:
+            for pattern, rows in self._group_edges(edges).items():
+                for batch in self._batches(rows):
+                    session.execute_write(self._create_edges_tx, pattern, batch)
+
+    def delete_edges(self, edges: Iterable[BaseEdge]) -> None:
+        """
+        Deletes edges in bulk, grouped like ``add_edges``.
+        """
+        with self._driver.session() as session:
+            for pattern, rows in self._group_edges(edges, merge=False).items():
+                for batch in self._batches(rows):
+                    session.execute_write(self._delete_edges_tx, pattern, batch)
+
+    def replace_files(self, parsed_files: list[ParsedData]) -> None:
+        """
+        Replaces the subgraphs of the given files in a single transaction.
+
+        Owned nodes are found through the ``id`` constraints of each label, so
+        the cost is proportional to the files being replaced.
+        """
+        if not parsed_files:
+            return
+        file_ids = [parsed_data.file_path for parsed_data in parsed_files]
+        node_groups = self._group_nodes(
+            node for parsed_data in parsed_files for node in parsed_data.nodes
+        )
+        edge_groups = self._group_edges(
+            edge for parsed_data in parsed_files for edge in parsed_data.edges
+        )
+        with self._driver.session() as session:
+            session.execute_write(
+                self._replace_files_tx, file_ids, node_groups, edge_groups
+            )
+
+    def get_file_ids(self) -> list[str]:
+        """
+        Lists the IDs (paths) of all file nodes.
+        """
+        return [
+            record["id"]
+            for record in self.execute_query("MATCH (f:File) RETURN f.id AS id")
+        ]
+
+    def delete_nodes(self, node_ids: list[str]) -> None:
+        """
+        Deletes the given nodes together with all of their relationships.
+        """
+        if not node_ids:
+            return
+        with self._driver.session() as session:
+            session.execute_write(self._delete_nodes_tx, node_ids)
+
+    def rename_file(self, old_file_id: str, new_file_id: str) -> None:
+        """
+        Moves a file node and the nodes it owns to a new file path.
+
+        Owned nodes are those whose ID is prefixed with ``<file_id>::``; their
+        relationships are kept as they are.
+        """
+        with self._driver.session() as session:
+            session.execute_write(self._rename_file_tx, old_file_id, new_file_id)
 
     def clear_database(self) -> None:
         """
@@ -43,30 +178,205 @@ class Neo4jService:
         USE WITH CAUTION.
         """
         with self._driver.session() as session:
-            session.write_transaction(self._clear_db_tx)
+            session.execute_write(self._clear_db_tx)
 
     @staticmethod
-    def _create_node_tx(tx: Transaction, node: BaseNode) -> None:
+    def _group_nodes(nodes: Iterable[BaseNode]) -> dict[str, list[dict[str, Any]]]:
+        """Groups nodes into query rows by label."""
+        rows_by_label: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for node in nodes:
+            rows_by_label[node.type.value].append(
+                {"id": node.id, "properties": node.properties}
+            )
+        return rows_by_label
+
+    @classmethod
+    def _group_edges(
+        cls, edges: Iterable[BaseEdge], merge: bool = True
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Groups edges into query rows by MATCH/MERGE pattern."""
+        rows_by_pattern: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for edge in edges:
+            rows_by_pattern[cls._edge_pattern(edge, merge)].append(
+                {
+                    "source_id": edge.source_id,
+                    "target_id": edge.target_id,
+                    "properties": edge.properties,
+                }
+            )
+        return rows_by_pattern
+
+    def _batches(self, rows: list[dict[str, Any]]) -> Iterable[list[dict[str, Any]]]:
+        """Yields consecutive slices of at most ``batch_size`` rows."""
+        for start in range(0, len(rows), self.batch_size):
+            yield rows[start : start + self.batch_size]
+
+    def execute_query(
+        self, query: str, params: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Executes a raw Cypher query and returns the results.
+        """
+        with self._driver.session() as session:
+            result = session.run(query, params)
+            return [record.data() for record in result]
+
+    def get_function_callers(self, function_name: str) -> list[dict[str, Any]]:
+        """
+        Finds all functions that call a specific function.
+        """
+        query = """
+        MATCH (caller)-[:CALLS]->(callee:Function)
+        WHERE callee.name = $function_name
+        RETURN caller.id as caller_id, caller.name as caller_name
+        """
+        return self.execute_query(query, {"function_name": function_name})
+
+    def get_class_dependencies(self, class_name: str) -> list[dict[str, Any]]:
+        """
+        Finds all modules that import a specific class.
+        """
+        query = """
+        MATCH (importer)-[:IMPORTS]->(c:Class)
+        WHERE c.name = $class_name
+        RETURN importer.id as importer_id
+        """
+        return self.execute_query(query, {"class_name": class_name})
+
+    def get_methods_in_class(self, class_name: str) -> list[dict[str, Any]]:
+        """
+        Finds all methods contained within a specific class.
+        """
+        query = """
+        MATCH (c:Class)-[:CONTAINS]->(m:Function)
+        WHERE c.name = $class_name
+        RETURN m.id as method_id, m.name as method_name
+        """
+        return self.execute_query(query, {"class_name": class_name})
+
+    @staticmethod
+    def _create_node_tx(tx: ManagedTransaction, node: BaseNode) -> None:
         """Transaction function to create a single node."""
         query = f"MERGE (n:{node.type.value} {{id: $id}}) " "SET n += $properties"
         tx.run(query, id=node.id, properties=node.properties)
 
     @staticmethod
-    def _create_edge_tx(tx: Transaction, edge: BaseEdge) -> None:
+    def _create_nodes_tx(
+        tx: ManagedTransaction, label: str, rows: list[dict[str, Any]]
+    ) -> None:
+        """Transaction function to create a batch of nodes sharing a label."""
+        query = (
+            "UNWIND $rows AS row "
+            f"MERGE (n:{label} {{id: row.id}}) "
+            "SET n += row.properties"
+        )
+        tx.run(query, rows=rows)
+
+    @staticmethod
+    def _edge_pattern(edge: BaseEdge, merge: bool = True) -> str:
+        """
+        Returns the MATCH/MERGE pattern for an edge, reading the endpoint IDs
+        from ``row``. With ``merge=False`` the edge itself is matched instead.
+
+        Endpoints with a known type are matched by label, so the lookup is an
+        index seek on that label's ``id`` constraint rather than a full scan.
+        """
+        source_label = f":{edge.source_type.value}" if edge.source_type else ""
+        target_label = f":{edge.target_type.value}" if edge.target_type else ""
+        return (
+            f"MATCH (a{source_label} {{id: row.source_id}}) "
+            f"MATCH (b{target_label} {{id: row.target_id}}) "
+            f"{'MERGE' if merge else 'MATCH'} (a)-[r:{edge.type.value}]->(b)"
+        )
+
+    @staticmethod
+    def _create_edges_tx(
+        tx: ManagedTransaction, pattern: str, rows: list[dict[str, Any]]
+    ) -> None:
+        """Transaction function to create a batch of edges sharing a pattern."""
+        query = f"UNWIND $rows AS row {pattern} SET r += row.properties"
+        tx.run(query, rows=rows)
+
+    @staticmethod
+    def _create_edge_tx(tx: ManagedTransaction, edge: BaseEdge) -> None:
         """Transaction function to create a single edge."""
         query = (
-            f"MATCH (a {{id: $source_id}}), (b {{id: $target_id}}) "
-            f"MERGE (a)-[r:{edge.type.value}]->(b) "
-            "SET r += $properties"
+            f"WITH $row AS row {Neo4jService._edge_pattern(edge)} "
+            "SET r += row.properties"
         )
         tx.run(
             query,
-            source_id=edge.source_id,
-            target_id=edge.target_id,
-            properties=edge.properties,
+            row={
+                "source_id": edge.source_id,
+                "target_id": edge.target_id,
+                "properties": edge.properties,
+            },
+        )
+
+    @staticmethod
+    def _delete_edges_tx(
+        tx: ManagedTransaction, pattern: str, rows: list[dict[str, Any]]
+    ) -> None:
+        """Transaction function to delete a batch of edges sharing a pattern."""
+        tx.run(f"UNWIND $rows AS row {pattern} DELETE r", rows=rows)
+
+    @classmethod
+    def _replace_files_tx(
+        cls,
+        tx: ManagedTransaction,
+        file_ids: list[str],
+        node_groups: dict[str, list[dict[str, Any]]],
+        edge_groups: dict[str, list[dict[str, Any]]],
+    ) -> None:
+        """Transaction function to swap the subgraphs of a set of files."""
+        tx.run(
+            "UNWIND $file_ids AS file_id "
+            "MATCH (f:File {id: file_id}) DETACH DELETE f",
+            file_ids=file_ids,
+        )
+        for node_type in (NodeType.CLASS, NodeType.FUNCTION):
+            tx.run(
+                "UNWIND $file_ids AS file_id "
+                f"MATCH (n:{node_type.value}) WHERE n.id STARTS WITH file_id + '::' "
+                "DETACH DELETE n",
+                file_ids=file_ids,
+            )
+        for label, rows in node_groups.items():
+            cls._create_nodes_tx(tx, label, rows)
+        for pattern, rows in edge_groups.items():
+            cls._create_edges_tx(tx, pattern, rows)
+
+    @staticmethod
+    def _delete_nodes_tx(tx: ManagedTransaction, node_ids: list[str]) -> None:
+        """Transaction function to delete a set of nodes."""
+        # One query per label, so every lookup goes through the id constraint.
+        for node_type in NodeType:
+            tx.run(
+                "UNWIND $ids AS node_id "
+                f"MATCH (n:{node_type.value} {{id: node_id}}) DETACH DELETE n",
+                ids=node_ids,
+            )
+
+    @staticmethod
+    def _rename_file_tx(
+        tx: ManagedTransaction, old_file_id: str, new_file_id: str
+    ) -> None:
+        """Transaction function to re-key a file and the nodes it owns."""
+        tx.run(
+            "MATCH (f:File {id: $old_id}) SET f.id = $new_id, f.path = $new_id",
+            old_id=old_file_id,
+            new_id=new_file_id,
         )
+        for node_type in (NodeType.CLASS, NodeType.FUNCTION):
+            tx.run(
+                f"MATCH (n:{node_type.value}) WHERE n.id STARTS WITH $old_prefix "
+                "SET n.id = $new_id + substring(n.id, size($old_id))",
+                old_id=old_file_id,
+                old_prefix=f"{old_file_id}::",
+                new_id=new_file_id,
+            )
 
     @staticmethod
-    def _clear_db_tx(tx: Transaction) -> None:
+    def _clear_db_tx(tx: ManagedTransaction) -> None:
         """Transaction function to clear the database."""
         tx.run("MATCH (n) DETACH DELETE n")
@@ -0,0 +1,247 @@
+"""
+This module provides an inverted-file (IVF) index that narrows vector search
+down to the rows closest to a query, for use by the NumpyCodeRepository.
+"""
+
+import json
+import os
+
+import numpy as np
+
+CENTROIDS_FILE = "ivf_centroids.npy"
+ASSIGNMENTS_FILE = "ivf_assignments.i32"
+TRAINING_FILE = "ivf_training.json"
+
+# Rows are assigned to centroids in blocks to bound temporary memory.
+_BLOCK_SIZE = 16384
+
+
+class IVFIndex:
+    """
+    Partitions unit vectors into ``n_lists`` clusters with spherical k-means.
+
+    A query only scores the rows in its ``n_probes`` nearest clusters, so the
+    work per query is about ``n_probes / n_lists`` of an exact scan. Raising
+    ``n_probes`` trades latency for recall; ``n_lists`` and the k-means
+    parameters are fixed when the index is trained.
+
+    The index stores one cluster ID per row, aligned with the row order of the
+    vectors it indexes, so rows can be appended incrementally without
+    retraining. Rows arrive in indexing order, so the first rows are a biased
+    sample; once the number of rows has grown ``retrain_factor`` times since
+    the last training, ``needs_training`` asks for the index to be retrained
+    on a fresh random sample. Deleted rows stay in their lists and are
+    expected to be filtered by the caller.
+    """
+
+    def __init__(
+        self,
+        n_lists: int = 256,
+        n_probes: int = 16,
+        min_train_size: int | None = None,
+        max_train_size: int = 65536,
+        kmeans_iterations: int = 10,
+        retrain_factor: float | None = 2.0,
+        seed: int = 0,
+    ):
+        """
+        Initializes an untrained index.
+
+        Args:
+            n_lists: The number of clusters (inverted lists).
+            n_probes: How many of the nearest clusters a query scans.
+            min_train_size: How many rows must exist before the index is
+                trained; defaults to 39 rows per list. Smaller stores are
+                searched exactly.
+            max_train_size: The maximum number of rows sampled for k-means.
+            kmeans_iterations: The number of k-means iterations.
+            retrain_factor: How many times the number of rows must grow since
+                the last training before the index is retrained, or None to
+                never retrain.
+            seed: The seed of the sampling and initialization.
+        """
+        self.n_lists = n_lists
+        self.n_probes = n_probes
+        self.min_train_size = min_train_size or 39 * n_lists
+        self.max_train_size = max_train_size
+        self.kmeans_iterations = kmeans_iterations
+        self.retrain_factor = retrain_factor
+        self.seed = seed
+        self.centroids: np.ndarray | None = None
+        # The number of rows the centroids were last trained on.
+        self.trained_size = 0
+        self._assignments = np.zeros(0, dtype=np.int32)
+        # Rows grouped by list, rebuilt lazily after rows are added.
+        self._offsets: np.ndarray | None = None
+        self._members = np.zeros(0, dtype=np.int64)
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the centroids have been computed."""
+        return self.centroids is not None
+
+    def __len__(self) -> int:
+        """Returns the number of indexed rows."""
+        return len(self._assignments)
+
+    def needs_training(self, row_count: int) -> bool:
+        """
+        Whether an index of ``row_count`` (live) rows should be (re)trained.
+        """
+        if row_count < self.min_train_size:
+            return False
+        if self.centroids is None:
+            return True
+        return (
+            self.retrain_factor is not None
+            and row_count >= self.retrain_factor * self.trained_size
+        )
+
+    def train(self, vectors: np.ndarray, rows: np.ndarray | None = None) -> None:
+        """
+        Computes the centroids from a random sample of unit vectors and
+        indexes all of them.
+
+        Args:
+            vectors: All rows to index, in row order.
+            rows: The rows to sample from, e.g. the ones not deleted; all rows
+                by default.
+        """
+        rng = np.random.default_rng(self.seed)
+        rows = np.arange(len(vectors)) if rows is None else rows
+        n_lists = min(self.n_lists, len(rows))
+        sample_size = min(len(rows), max(self.max_train_size, n_lists))
+        sample = np.asarray(
+            vectors[np.sort(rng.choice(rows, sample_size, replace=False))],
+            dtype=np.float32,
+        )
+
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+        for _ in range(self.kmeans_iterations):
+            labels = self._nearest(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=n_lists)
+            # Empty clusters are re-seeded with random rows.
+            empty = np.flatnonzero(counts == 0)
+            sums[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = (sums / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+        self.centroids = centroids.astype(np.float32)
+        self.trained_size = len(rows)
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._offsets = None
+        self.add(vectors)
+
+    def add(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Assigns appended rows to their nearest list.
+
+        Returns:
+            The list IDs of the new rows.
+        """
+        if self.centroids is None:
+            raise ValueError("The index must be trained before rows are added.")
+        assignments = self._nearest(vectors, self.centroids)
+        self._assignments = np.concatenate([self._assignments, assignments])
+        self._offsets = None
+        return assignments
+
+    def keep(self, rows: np.ndarray) -> None:
+        """
+        Keeps only the given rows, renumbering them in order (after compaction).
+        """
+        self._assignments = self._assignments[rows]
+        self._offsets = None
+
+    def candidates(self, query: np.ndarray, n_probes: int | None = None) -> np.ndarray:
+        """
+        Returns the rows in the lists nearest to a unit query vector.
+        """
+        if self.centroids is None:
+            raise ValueError("The index has not been trained.")
+        n_probes = min(n_probes or self.n_probes, len(self.centroids))
+        similarities = self.centroids @ query
+        if n_probes < len(similarities):
+            lists = np.argpartition(-similarities, n_probes - 1)[:n_probes]
+        else:
+            lists = np.arange(len(similarities))
+
+        if self._offsets is None:
+            self._members = np.argsort(self._assignments, kind="stable")
+            self._offsets = np.concatenate(
+                [
+                    [0],
+                    np.cumsum(
+                        np.bincount(self._assignments, minlength=len(similarities))
+                    ),
+                ]
+            )
+        offsets = self._offsets
+        return np.concatenate(
+            [self._members[offsets[i] : offsets[i + 1]] for i in lists]
+        )
+
+    def save(self, path: str) -> None:
+        """
+        Writes the centroids and all assignments to ``path``.
+        """
+        if self.centroids is None:
+            return
+        np.save(os.path.join(path, CENTROIDS_FILE), self.centroids)
+        with open(os.path.join(path, TRAINING_FILE), "w", encoding="utf-8") as f:
+            json.dump({"trained_size": self.trained_size}, f)
+        tmp_path = os.path.join(path, f"{ASSIGNMENTS_FILE}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(self._assignments.astype("<i4").tobytes())
+        os.replace(tmp_path, os.path.join(path, ASSIGNMENTS_FILE))
+
+    def append(self, path: str, assignments: np.ndarray) -> None:
+        """
+        Appends the assignments of newly added rows to the file in ``path``.
+        """
+        with open(os.path.join(path, ASSIGNMENTS_FILE), "ab") as f:
+            f.write(assignments.astype("<i4").tobytes())
+
+    def load(self, path: str, vectors: np.ndarray) -> None:
+        """
+        Loads a saved index and reconciles it with the rows of ``vectors``.
+
+        An index trained with different parameters is ignored. Rows
+        that were appended after the assignments were last written are
+        assigned now.
+        """
+        centroids_path = os.path.join(path, CENTROIDS_FILE)
+        if not os.path.exists(centroids_path):
+            return
+        centroids = np.load(centroids_path)
+        if centroids.shape != (self.n_lists, vectors.shape[1]):
+            return
+        self.centroids = centroids
+        training_path = os.path.join(path, TRAINING_FILE)
+        if os.path.exists(training_path):
+            with open(training_path, encoding="utf-8") as f:
+                self.trained_size = json.load(f)["trained_size"]
+        else:
+            self.trained_size = len(vectors)
+        assignments_path = os.path.join(path, ASSIGNMENTS_FILE)
+        assignments = (
+            np.fromfile(assignments_path, dtype="<i4").astype(np.int32)
+            if os.path.exists(assignments_path)
+            else np.zeros(0, dtype=np.int32)
+        )
+        self._assignments = assignments[: len(vectors)]
+        self._offsets = None
+        if len(self._assignments) < len(vectors):
+            self.add(vectors[len(self._assignments) :])
+            self.save(path)
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Returns the index of the most similar centroid for each row."""
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), _BLOCK_SIZE):
+            block = np.asarray(vectors[start : start + _BLOCK_SIZE], dtype=np.float32)
+            labels[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        return labels
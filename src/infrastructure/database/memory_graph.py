@@ -0,0 +1,516 @@
+"""
+This module provides an in-process implementation of the GraphRepository that
+keeps the knowledge graph in compact arrays and persists it to a snapshot file.
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from typing import Any
+
+from src.domain.entities.graph_entities import (
+    BaseEdge,
+    BaseNode,
+    EdgeType,
+    NodeType,
+    ParsedData,
+)
+from src.domain.repositories.graph_repository import GraphRepository
+
+SNAPSHOT_MAGIC = b"CSGRAPH1"
+
+# Node types are stored as one byte per node; DELETED marks a free slot.
+_TYPE_CODES = {node_type: code for code, node_type in enumerate(NodeType)}
+_NODE_TYPES = list(NodeType)
+_DELETED = 255
+
+
+class _Adjacency:
+    """
+    Compressed sparse row (CSR) adjacency for a single edge type.
+
+    ``offsets[i]:offsets[i + 1]`` delimits the neighbours of node ``i`` in
+    ``targets``. A reverse CSR over the same edges answers incoming queries.
+    """
+
+    __slots__ = ("offsets", "targets", "reverse_offsets", "reverse_targets")
+
+    def __init__(self, node_count: int, pairs: list[tuple[int, int]]):
+        """
+        Builds the adjacency from (source, target) pairs sorted by source.
+        """
+        self.offsets, self.targets = self._build(node_count, pairs)
+        self._build_reverse(node_count)
+
+    @classmethod
+    def from_csr(cls, offsets: "array[int]", targets: "array[int]") -> "_Adjacency":
+        """Rebuilds the adjacency from stored forward CSR arrays."""
+        adjacency = cls.__new__(cls)
+        adjacency.offsets, adjacency.targets = offsets, targets
+        adjacency._build_reverse(len(offsets) - 1)
+        return adjacency
+
+    def _build_reverse(self, node_count: int) -> None:
+        self.reverse_offsets, self.reverse_targets = self._build(
+            node_count, sorted((target, source) for source, target in self.pairs())
+        )
+
+    @staticmethod
+    def _build(
+        node_count: int, sorted_pairs: list[tuple[int, int]]
+    ) -> "tuple[array[int], array[int]]":
+        """Builds CSR arrays from (source, target) pairs sorted by source."""
+        offsets = array("i", bytes(4 * (node_count + 1)))
+        for source, _ in sorted_pairs:
+            offsets[source + 1] += 1
+        for i in range(node_count):
+            offsets[i + 1] += offsets[i]
+        targets = array("i", (target for _, target in sorted_pairs))
+        return offsets, targets
+
+    def pairs(self) -> list[tuple[int, int]]:
+        """Returns all (source, target) pairs, sorted."""
+        offsets, targets = self.offsets, self.targets
+        return [
+            (source, targets[k])
+            for source in range(len(offsets) - 1)
+            for k in range(offsets[source], offsets[source + 1])
+        ]
+
+    def outgoing(self, node: int) -> "array[int]":
+        """Returns the targets of the edges leaving ``node``."""
+        if node + 1 >= len(self.offsets):
+            return array("i")
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def incoming(self, node: int) -> "array[int]":
+        """Returns the sources of the edges entering ``node``."""
+        if node + 1 >= len(self.reverse_offsets):
+            return array("i")
+        return self.reverse_targets[
+            self.reverse_offsets[node] : self.reverse_offsets[node + 1]
+        ]
+
+
+class InMemoryGraphRepository(GraphRepository):
+    """
+    An in-process graph store implementing the GraphRepository.
+
+    Node IDs are interned to dense integers, and the edges of each type are
+    held in CSR arrays, so the caller, method and dependency lookups are a
+    dictionary lookup plus an array slice. Writes go to a small pending list
+    that is merged into the CSR arrays on the next query.
+
+    The graph is persisted to ``snapshot_path`` (if given) by ``save`` and
+    ``close``, and loaded from it on construction.
+    """
+
+    def __init__(self, snapshot_path: str | None = None):
+        """
+        Initializes the repository, loading the snapshot if one exists.
+
+        Args:
+            snapshot_path: The file the graph is persisted to.
+        """
+        self.snapshot_path = snapshot_path
+        self._reset()
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.load(snapshot_path)
+
+    def _reset(self) -> None:
+        """Empties the graph."""
+        self._node_ids: list[str] = []
+        self._node_index: dict[str, int] = {}
+        self._node_types = bytearray()
+        self._node_properties: list[dict[str, Any]] = []
+        self._deleted_count = 0
+        # (node type, name) -> nodes, for the name-based lookups.
+        self._names: dict[tuple[NodeType, str], set[int]] = defaultdict(set)
+        # file ID -> IDs of the nodes it owns (itself included).
+        self._owned: dict[str, set[str]] = defaultdict(set)
+        self._adjacency: dict[EdgeType, _Adjacency] = {}
+        self._pending_edges: dict[EdgeType, list[tuple[int, int]]] = defaultdict(list)
+        self._edge_properties: dict[tuple[EdgeType, int, int], dict[str, Any]] = {}
+
+    # --- Writes ---
+
+    def add_nodes(self, nodes: list[BaseNode]) -> None:
+        """
+        Adds nodes, merging the properties of nodes that already exist.
+        """
+        for node in nodes:
+            index = self._node_index.get(node.id)
+            if index is not None and self._node_types[index] == _TYPE_CODES[node.type]:
+                self._unindex_name(index)
+                self._node_properties[index].update(node.properties)
+            else:
+                # IDs are unique across types here: a node of another type
+                # replaces the existing one.
+                if index is not None:
+                    self.delete_nodes([node.id])
+                index = len(self._node_ids)
+                self._node_ids.append(node.id)
+                self._node_types.append(_TYPE_CODES[node.type])
+                self._node_properties.append(dict(node.properties))
+                self._node_index[node.id] = index
+                self._owned[self._owner(node.id)].add(node.id)
+            self._index_name(index)
+
+    def add_edges(self, edges: list[BaseEdge]) -> None:
+        """
+        Adds edges between existing nodes; other edges are ignored.
+        """
+        for edge in edges:
+            source = self._resolve(edge.source_id, edge.source_type)
+            target = self._resolve(edge.target_id, edge.target_type)
+            if source is None or target is None:
+                continue
+            self._pending_edges[edge.type].append((source, target))
+            if edge.properties:
+                self._edge_properties.setdefault(
+                    (edge.type, source, target), {}
+                ).update(edge.properties)
+
+    def delete_edges(self, edges: list[BaseEdge]) -> None:
+        """
+        Deletes edges, rebuilding the adjacency of the affected edge types.
+        """
+        removed: dict[EdgeType, set[tuple[int, int]]] = defaultdict(set)
+        for edge in edges:
+            source = self._resolve(edge.source_id, edge.source_type)
+            target = self._resolve(edge.target_id, edge.target_type)
+            if source is not None and target is not None:
+                removed[edge.type].add((source, target))
+                self._edge_properties.pop((edge.type, source, target), None)
+
+        for edge_type, pairs in removed.items():
+            adjacency = self._edges(edge_type)
+            self._adjacency[edge_type] = _Adjacency(
+                len(self._node_ids),
+                [pair for pair in adjacency.pairs() if pair not in pairs],
+            )
+
+    def delete_nodes(self, node_ids: list[str]) -> None:
+        """
+        Deletes nodes. Their slots are tombstoned, which also hides their edges.
+        """
+        for node_id in node_ids:
+            index = self._node_index.pop(node_id, None)
+            if index is None:
+                continue
+            self._disown(node_id)
+            self._unindex_name(index)
+            self._node_types[index] = _DELETED
+            self._node_properties[index] = {}
+            self._deleted_count += 1
+
+        if self._deleted_count > len(self._node_ids) // 2:
+            self._compact()
+
+    def replace_files(self, parsed_files: list[ParsedData]) -> None:
+        """
+        Replaces the subgraphs of the given files.
+
+        Only the nodes owned by those files are visited, so the cost is
+        proportional to the files being replaced.
+        """
+        self.delete_nodes(
+            [
+                node_id
+                for parsed_data in parsed_files
+                for node_id in list(self._owned.get(parsed_data.file_path, ()))
+            ]
+        )
+        self.add_nodes(
+            [node for parsed_data in parsed_files for node in parsed_data.nodes]
+        )
+        self.add_edges(
+            [edge for parsed_data in parsed_files for edge in parsed_data.edges]
+        )
+
+    def get_file_ids(self) -> list[str]:
+        """
+        Lists the IDs (paths) of all file nodes.
+        """
+        file_code = _TYPE_CODES[NodeType.FILE]
+        return [
+            node_id
+            for node_id, index in self._node_index.items()
+            if self._node_types[index] == file_code
+        ]
+
+    def rename_file(self, old_file_id: str, new_file_id: str) -> None:
+        """
+        Re-keys a file node and the nodes it owns.
+        """
+        for node_id in self._owned.pop(old_file_id, set()):
+            index = self._node_index.pop(node_id)
+            new_id = new_file_id + node_id[len(old_file_id) :]
+            self._node_ids[index] = new_id
+            self._node_index[new_id] = index
+            self._owned[new_file_id].add(new_id)
+            if node_id == old_file_id and _NODE_TYPES[self._node_types[index]] == (
+                NodeType.FILE
+            ):
+                self._node_properties[index]["path"] = new_file_id
+
+    def clear_database(self) -> None:
+        """
+        Deletes all nodes and edges.
+        """
+        self._reset()
+
+    # --- Queries ---
+
+    def get_function_callers(self, function_name: str) -> list[dict[str, Any]]:
+        """
+        Finds all nodes that call a function with the given name.
+        """
+        adjacency = self._edges(EdgeType.CALLS)
+        return [
+            {
+                "caller_id": self._node_ids[caller],
+                "caller_name": self._node_properties[caller].get("name"),
+            }
+            for callee in self._names.get((NodeType.FUNCTION, function_name), ())
+            for caller in adjacency.incoming(callee)
+            if self._node_types[caller] != _DELETED
+        ]
+
+    def get_methods_in_class(self, class_name: str) -> list[dict[str, Any]]:
+        """
+        Finds all methods contained in a class with the given name.
+        """
+        function_code = _TYPE_CODES[NodeType.FUNCTION]
+        adjacency = self._edges(EdgeType.CONTAINS)
+        return [
+            {
+                "method_id": self._node_ids[method],
+                "method_name": self._node_properties[method].get("name"),
+            }
+            for owner in self._names.get((NodeType.CLASS, class_name), ())
+            for method in adjacency.outgoing(owner)
+            if self._node_types[method] == function_code
+        ]
+
+    def get_class_dependencies(self, class_name: str) -> list[dict[str, Any]]:
+        """
+        Finds all nodes that import a class with the given name.
+        """
+        adjacency = self._edges(EdgeType.IMPORTS)
+        return [
+            {"importer_id": self._node_ids[importer]}
+            for imported in self._names.get((NodeType.CLASS, class_name), ())
+            for importer in adjacency.incoming(imported)
+            if self._node_types[importer] != _DELETED
+        ]
+
+    def __len__(self) -> int:
+        """Returns the number of live nodes."""
+        return len(self._node_index)
+
+    # --- Persistence ---
+
+    def save(self, path: str | None = None) -> None:
+        """
+        Writes the graph to a snapshot file.
+
+        The snapshot holds a JSON header with the node IDs, types and
+        properties, followed by the raw CSR arrays of each edge type, so
+        loading does not need to re-sort the edges.
+        """
+        path = path or self.snapshot_path
+        if not path:
+            raise ValueError("No snapshot path was given.")
+        self._compact()
+
+        edge_types = [
+            edge_type for edge_type in EdgeType if edge_type in self._adjacency
+        ]
+        header = {
+            "ids": self._node_ids,
+            "types": list(self._node_types),
+            "properties": self._node_properties,
+            "edges": [
+                [edge_type.value, len(self._adjacency[edge_type].targets)]
+                for edge_type in edge_types
+            ],
+            "edge_properties": [
+                [edge_type.value, source, target, properties]
+                for (
+                    edge_type,
+                    source,
+                    target,
+                ), properties in self._edge_properties.items()
+            ],
+        }
+        header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(struct.pack("<I", len(header_bytes)))
+            f.write(header_bytes)
+            for edge_type in edge_types:
+                adjacency = self._adjacency[edge_type]
+                for values in (adjacency.offsets, adjacency.targets):
+                    f.write(self._to_little_endian(values).tobytes())
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> None:
+        """
+        Replaces the graph with the contents of a snapshot file.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a graph snapshot.")
+        offset = len(SNAPSHOT_MAGIC)
+        (header_length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        header = json.loads(data[offset : offset + header_length])
+        offset += header_length
+
+        self._reset()
+        self._node_ids = header["ids"]
+        self._node_index = {node_id: i for i, node_id in enumerate(self._node_ids)}
+        self._node_types = bytearray(header["types"])
+        self._node_properties = header["properties"]
+        for index, node_id in enumerate(self._node_ids):
+            self._index_name(index)
+            self._owned[self._owner(node_id)].add(node_id)
+
+        node_count = len(self._node_ids)
+        for edge_type_value, edge_count in header["edges"]:
+            arrays = []
+            for length in (node_count + 1, edge_count):
+                values = array("i")
+                values.frombytes(data[offset : offset + 4 * length])
+                arrays.append(self._to_little_endian(values))
+                offset += 4 * length
+            offsets, targets = arrays
+            adjacency = _Adjacency.from_csr(offsets, targets)
+            self._adjacency[EdgeType(edge_type_value)] = adjacency
+        for edge_type_value, source, target, properties in header["edge_properties"]:
+            self._edge_properties[(EdgeType(edge_type_value), source, target)] = (
+                properties
+            )
+
+    def close(self) -> None:
+        """
+        Saves the snapshot, if the repository has a snapshot path.
+        """
+        if self.snapshot_path:
+            self.save()
+
+    # --- Internals ---
+
+    def _resolve(self, node_id: str, node_type: NodeType | None) -> int | None:
+        """Returns the index of a live node, if it exists with the given type."""
+        index = self._node_index.get(node_id)
+        if index is None:
+            return None
+        if node_type is not None and self._node_types[index] != _TYPE_CODES[node_type]:
+            return None
+        return index
+
+    @staticmethod
+    def _owner(node_id: str) -> str:
+        """Returns the ID of the file that owns a node."""
+        return node_id.split("::", 1)[0]
+
+    def _disown(self, node_id: str) -> None:
+        owner = self._owner(node_id)
+        owned = self._owned.get(owner)
+        if owned is not None:
+            owned.discard(node_id)
+            if not owned:
+                del self._owned[owner]
+
+    def _index_name(self, index: int) -> None:
+        name = self._node_properties[index].get("name")
+        if name is not None:
+            self._names[(_NODE_TYPES[self._node_types[index]], name)].add(index)
+
+    def _unindex_name(self, index: int) -> None:
+        name = self._node_properties[index].get("name")
+        if name is None:
+            return
+        key = (_NODE_TYPES[self._node_types[index]], name)
+        indexes = self._names.get(key)
+        if indexes is not None:
+            indexes.discard(index)
+            if not indexes:
+                del self._names[key]
+
+    def _edges(self, edge_type: EdgeType) -> _Adjacency:
+        """Returns the CSR adjacency of an edge type, merging pending edges."""
+        pending = self._pending_edges.pop(edge_type, None)
+        adjacency = self._adjacency.get(edge_type)
+        if pending or adjacency is None:
+            pairs = adjacency.pairs() if adjacency else []
+            pairs.extend(pending or ())
+            adjacency = _Adjacency(len(self._node_ids), sorted(set(pairs)))
+            self._adjacency[edge_type] = adjacency
+        return adjacency
+
+    def _compact(self) -> None:
+        """Drops deleted nodes and their edges, renumbering the live nodes."""
+        for edge_type in list(self._pending_edges):
+            self._edges(edge_type)
+        if not self._deleted_count:
+            return
+
+        remap = array("i", [-1]) * len(self._node_ids)
+        node_ids: list[str] = []
+        node_types = bytearray()
+        node_properties: list[dict[str, Any]] = []
+        for old, node_type in enumerate(self._node_types):
+            if node_type == _DELETED:
+                continue
+            remap[old] = len(node_ids)
+            node_ids.append(self._node_ids[old])
+            node_types.append(node_type)
+            node_properties.append(self._node_properties[old])
+
+        adjacency = {
+            edge_type: _Adjacency(
+                len(node_ids),
+                sorted(
+                    (remap[source], remap[target])
+                    for source, target in edges.pairs()
+                    if remap[source] >= 0 and remap[target] >= 0
+                ),
+            )
+            for edge_type, edges in self._adjacency.items()
+        }
+        edge_properties = {
+            (edge_type, remap[source], remap[target]): properties
+            for (edge_type, source, target), properties in self._edge_properties.items()
+            if remap[source] >= 0 and remap[target] >= 0
+        }
+
+        self._reset()
+        self._node_ids = node_ids
+        self._node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+        self._node_types = node_types
+        self._node_properties = node_properties
+        self._adjacency = adjacency
+        self._edge_properties = edge_properties
+        for index, node_id in enumerate(node_ids):
+            self._index_name(index)
+            self._owned[self._owner(node_id)].add(node_id)
+
+    @staticmethod
+    def _to_little_endian(values: "array[int]") -> "array[int]":
+        """Returns the array in little-endian byte order (a copy if swapped)."""
+        if sys.byteorder == "big":
+            values = array(values.typecode, values)
+            values.byteswap()
+        return values
@@ -0,0 +1,620 @@
+"""
+This module provides a local, NumPy-based implementation of the CodeRepository
+that performs exact vector search over a memory-mapped float32 matrix.
+"""
+
+import json
+import os
+from itertools import chain
+from typing import Any
+
+import numpy as np
+
+from src.domain.entities.code_chunk import ChunkRecord, CodeChunk
+from src.domain.entities.graph_entities import NodeType
+from src.domain.entities.search_filters import SearchFilters, search_path
+from src.domain.repositories.code_repository import CodeRepository
+from src.infrastructure.database.bm25_index import BM25Index
+from src.infrastructure.database.ivf_index import IVFIndex
+from src.infrastructure.database.quantization import QuantizedVectors
+
+VECTORS_FILE = "vectors.f32"
+CHUNKS_FILE = "chunks.jsonl"
+# The most scores computed at once when several queries are searched together.
+_MAX_SCORES = 1 << 24
+# Deleted rows are only compacted away once there are at least this many.
+_MIN_COMPACT_ROWS = 1000
+
+
+def _grown(buffer: np.ndarray, size: int) -> np.ndarray:
+    """
+    Returns ``buffer`` if it can hold ``size`` items, or else a copy with at
+    least twice its capacity, so appending row by row copies each row a
+    bounded number of times.
+    """
+    if size <= len(buffer):
+        return buffer
+    grown = np.zeros(max(size, 2 * len(buffer)), dtype=buffer.dtype)
+    grown[: len(buffer)] = buffer
+    return grown
+
+
+class NumpyCodeRepository(CodeRepository):
+    """
+    Stores every embedding as a row of one float32 matrix and searches it exactly.
+
+    Vectors are L2-normalized when added, so cosine similarity is a single
+    matrix-vector product, and the top ``k`` rows are selected with
+    ``argpartition`` before only those are sorted.
+
+    The matrix lives in ``vectors.f32`` (raw little-endian rows) and is
+    memory-mapped, so startup costs no copy and the OS page cache decides what
+    stays resident. Chunk text and metadata are kept in memory and persisted
+    in ``chunks.jsonl``, an append-only log of additions and deletions that
+    is replayed on load. Every batch is appended to both files, so nothing
+    has to be rewritten as the store grows; deleted rows are masked out of
+    search and reclaimed by ``compact``, which runs automatically once they
+    make up ``compact_ratio`` of the rows.
+
+    With an IVFIndex, search becomes approximate once the store holds
+    ``index.min_train_size`` rows: the index is trained on the stored vectors,
+    new rows are assigned to it as they are added, and queries only score the
+    rows of the probed lists. The index is persisted next to the vectors.
+
+    With ``quantization`` set to ``"float16"`` or ``"int8"``, rows are first
+    scored against a quantized copy of the matrix (2x or 4x smaller) and only
+    the best ``top_k * rescore_factor`` are rescored against the float32 rows,
+    so the full-precision matrix is read for a handful of rows per query and
+    can stay on disk.
+
+    With ``prefilter_dimension``, that first stage scans only the leading
+    dimensions of every row (quantized or not), and at least
+    ``prefilter_candidates`` rows are rescored with the full vectors.
+
+    Search filters are resolved to rows before scoring, through an index of
+    rows by file path relative to the indexed root (for path, language and
+    extension constraints) and an array
+    of symbol types, so a scoped query only scores the rows in scope.
+
+    ``search_many`` scores a batch of queries with matrix-matrix products, so
+    the matrix is read once for the whole batch instead of once per query.
+
+    Keyword search uses a BM25Index over the chunk text. It is built from the
+    stored chunks on first use and kept up to date by later changes.
+    """
+
+    def __init__(
+        self,
+        path: str = "./data/vector_store",
+        index: IVFIndex | None = None,
+        quantization: str | None = None,
+        rescore_factor: int = 4,
+        prefilter_dimension: int | None = None,
+        prefilter_candidates: int = 256,
+        compact_ratio: float | None = 0.25,
+    ):
+        """
+        Initializes the repository, loading an existing store if present.
+
+        Args:
+            path: The directory that holds the vector matrix and chunk log.
+            index: An optional approximate index to search through.
+            quantization: ``"float16"`` or ``"int8"`` to score queries against
+                a quantized copy of the vectors, or None to score float32.
+            rescore_factor: How many candidates per result are rescored at
+                full precision when quantization is enabled.
+            prefilter_dimension: The number of leading dimensions scanned by
+                the first stage, or None to scan all of them.
+            prefilter_candidates: The minimum number of candidates rescored
+                after a truncated first stage.
+            compact_ratio: The share of deleted rows above which the store is
+                compacted after a deletion, or None to only compact on demand.
+        """
+        self.path = path
+        self.index = index
+        self.quantized = (
+            QuantizedVectors(path, quantization or "float32", prefilter_dimension)
+            if quantization or prefilter_dimension
+            else None
+        )
+        self.rescore_factor = rescore_factor
+        self.prefilter_candidates = prefilter_candidates
+        self.compact_ratio = compact_ratio
+        self.dimension: int | None = None
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        # Per-row arrays have spare capacity; only the first len(_chunks)
+        # entries are used (see ``_alive`` and ``_symbol_types``).
+        self._alive_buffer = np.zeros(0, dtype=bool)
+        self._chunks: list[dict[str, Any] | None] = []
+        self._rows: dict[str, int] = {}
+        # Metadata indexes; rows of deleted chunks stay until ``compact`` and
+        # are masked out by ``_alive``.
+        self._rows_by_file: dict[str, list[int]] = {}
+        self._symbol_type_codes: dict[str, int] = {}
+        self._symbol_types_buffer = np.zeros(0, dtype=np.int16)
+        self._keywords: BM25Index | None = None
+        os.makedirs(path, exist_ok=True)
+        self._load()
+        if self.quantized is not None:
+            self.quantized.load(self._vectors)
+
+    def __len__(self) -> int:
+        """Returns the number of stored chunks."""
+        return len(self._rows)
+
+    def add(self, chunk: CodeChunk) -> None:
+        """
+        Adds a single CodeChunk to the store.
+
+        Args:
+            chunk: The CodeChunk object to add.
+        """
+        if not chunk.embedding:
+            raise ValueError(
+                "CodeChunk must have an embedding to be added to the repository."
+            )
+        self.add_batch([ChunkRecord.from_model(chunk)])
+
+    def add_batch(self, chunks: list[ChunkRecord]) -> None:
+        """
+        Appends a batch of chunks, replacing any stored chunks with the same IDs.
+
+        Args:
+            chunks: A list of ChunkRecord objects to add.
+        """
+        if not chunks:
+            return
+        if any(chunk.embedding is None for chunk in chunks):
+            raise ValueError("All chunks in a batch must have an embedding.")
+        chunks = list({chunk.id: chunk for chunk in chunks}.values())
+
+        # Record embeddings are float32 arrays, so rows are viewed, not parsed.
+        vectors = np.vstack(
+            [np.frombuffer(chunk.embedding, dtype=np.float32) for chunk in chunks]
+        )
+        if self.dimension is None:
+            self.dimension = vectors.shape[1]
+            self._append_log([{"dimension": self.dimension}])
+        elif vectors.shape[1] != self.dimension:
+            raise ValueError(
+                f"Expected embeddings of dimension {self.dimension}, "
+                f"got {vectors.shape[1]}."
+            )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+
+        replaced = [chunk.id for chunk in chunks if chunk.id in self._rows]
+        if replaced:
+            self.delete_batch(replaced)
+
+        first_row = len(self._chunks)
+        with open(self._file(VECTORS_FILE), "ab") as f:
+            f.write(vectors.astype("<f4", copy=False).tobytes())
+        entries: list[dict[str, Any]] = [
+            {
+                "id": chunk.id,
+                "file_path": chunk.file_path,
+                "content": chunk.content,
+                "start_line": chunk.start_line,
+                "end_line": chunk.end_line,
+                "metadata": chunk.metadata,
+            }
+            for chunk in chunks
+        ]
+        self._append_log([{"add": entry} for entry in entries])
+
+        for offset, entry in enumerate(entries):
+            self._rows[entry["id"]] = first_row + offset
+        self._chunks.extend(entries)
+        self._alive_buffer = _grown(self._alive_buffer, len(self._chunks))
+        self._alive_buffer[first_row : len(self._chunks)] = True
+        self._index_metadata(first_row, entries)
+        if self._keywords is not None:
+            self._keywords.add_batch(
+                (entry["id"], entry["content"]) for entry in entries
+            )
+        self._map_vectors()
+        if self.quantized is not None:
+            self.quantized.append(vectors)
+        self._update_index(vectors)
+
+    def get_batch(self, chunk_ids: list[str]) -> list[ChunkRecord]:
+        """
+        Retrieves stored chunks, including their (normalized) embeddings.
+
+        Args:
+            chunk_ids: The IDs of the chunks to retrieve. Unknown IDs are ignored.
+
+        Returns:
+            The ChunkRecord objects that were found.
+        """
+        return [
+            self._record(row, with_embedding=True)
+            for chunk_id in chunk_ids
+            if (row := self._rows.get(chunk_id)) is not None
+        ]
+
+    def delete_batch(self, chunk_ids: list[str]) -> None:
+        """
+        Removes a batch of chunks from the store.
+
+        Args:
+            chunk_ids: The IDs of the chunks to remove. Unknown IDs are ignored.
+        """
+        deleted = [chunk_id for chunk_id in chunk_ids if chunk_id in self._rows]
+        if not deleted:
+            return
+        self._append_log([{"delete": deleted}])
+        if self._keywords is not None:
+            self._keywords.remove(deleted)
+        for chunk_id in deleted:
+            row = self._rows.pop(chunk_id)
+            self._chunks[row] = None
+            self._alive[row] = False
+
+        dead_rows = len(self._chunks) - len(self._rows)
+        if self.compact_ratio is not None and dead_rows >= max(
+            _MIN_COMPACT_ROWS, self.compact_ratio * len(self._chunks)
+        ):
+            print(f"Compacting the vector store to drop {dead_rows} deleted rows.")
+            self.compact()
+
+    def get_existing_chunk_ids(self, chunk_ids: list[str]) -> set[str]:
+        """
+        Retrieves the set of chunk IDs that already exist in the store.
+
+        Args:
+            chunk_ids: A list of chunk IDs to check.
+
+        Returns:
+            A set of IDs that are present in the store.
+        """
+        return {chunk_id for chunk_id in chunk_ids if chunk_id in self._rows}
+
+    def search(
+        self,
+        query_embedding: list[float],
+        top_k: int = 5,
+        filters: SearchFilters | None = None,
+    ) -> list[ChunkRecord]:
+        """
+        Finds the chunks with the highest cosine similarity to a query embedding.
+
+        Args:
+            query_embedding: The vector embedding of the search query.
+            top_k: The number of most similar chunks to return.
+            filters: Optional constraints on the chunks to search.
+
+        Returns:
+            A list of the most relevant ChunkRecord objects, best first.
+        """
+        return self.search_many([query_embedding], top_k, filters)[0]
+
+    def search_many(
+        self,
+        query_embeddings: list[list[float]],
+        top_k: int = 5,
+        filters: SearchFilters | None = None,
+    ) -> list[list[ChunkRecord]]:
+        """
+        Finds the most similar chunks to each of several query embeddings.
+
+        Without an IVF index, all queries are scored in one matrix-matrix
+        product per block of queries, so the matrix is read once per block
+        rather than once per query. Queries that probe an IVF index score
+        different rows and are ranked one at a time.
+
+        Args:
+            query_embeddings: The vector embeddings of the search queries.
+            top_k: The number of most similar chunks to return per query.
+            filters: Optional constraints on the chunks to search.
+
+        Returns:
+            One list of ChunkRecord objects per query, in order, best first.
+        """
+        if not self._rows or top_k <= 0 or not len(query_embeddings):
+            return [[] for _ in query_embeddings]
+        # A copy, so the queries can be normalized in place.
+        queries = np.array(query_embeddings, dtype=np.float32).reshape(
+            len(query_embeddings), -1
+        )
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries /= np.where(norms == 0, 1, norms)
+
+        top_k = min(top_k, len(self._rows))
+        rows = None
+        if filters is not None and not filters.is_empty():
+            rows = self._filtered_rows(filters)
+            if not len(rows):
+                return [[] for _ in query_embeddings]
+            top_k = min(top_k, len(rows))
+
+        # A scope smaller than the probed lists is cheaper to scan exactly.
+        if (
+            self.index is not None
+            and self.index.is_trained
+            and (
+                rows is None
+                or len(rows) * self.index.n_lists
+                > len(self._rows) * self.index.n_probes
+            )
+        ):
+            ranked = [
+                self._rank(query, top_k, self._probed_rows(query, top_k, rows))
+                for query in queries
+            ]
+        else:
+            ranked = self._rank_many(queries, top_k, rows)
+        return [[self._record(int(row)) for row in best] for best in ranked]
+
+    def keyword_search(
+        self, query: str, top_k: int = 5, filters: SearchFilters | None = None
+    ) -> list[ChunkRecord]:
+        """
+        Finds the chunks whose text best matches the terms of a query (BM25).
+
+        Args:
+            query: The text of the search query.
+            top_k: The number of best matching chunks to return.
+            filters: Optional constraints on the chunks to search.
+
+        Returns:
+            A list of the best matching ChunkRecord objects, best first.
+        """
+        if self._keywords is None:
+            self._keywords = BM25Index()
+            self._keywords.add_batch(
+                (entry["id"], entry["content"]) for entry in self._chunks if entry
+            )
+
+        results: list[ChunkRecord] = []
+        for chunk_id in self._keywords.ranked(query):
+            if len(results) == top_k:
+                break
+            entry = self._chunks[self._rows[chunk_id]]
+            assert entry is not None
+            if filters is None or filters.matches(
+                entry["file_path"], entry["metadata"]
+            ):
+                results.append(self._record(self._rows[chunk_id]))
+        return results
+
+    def _filtered_rows(self, filters: SearchFilters) -> np.ndarray:
+        """Returns the sorted live rows that match the filters."""
+        if filters.path_prefix or filters.languages or filters.extensions:
+            files = [path for path in self._rows_by_file if filters.matches_file(path)]
+            rows = np.sort(
+                np.fromiter(
+                    chain.from_iterable(self._rows_by_file[path] for path in files),
+                    dtype=np.int64,
+                )
+            )
+        else:
+            rows = np.arange(len(self._chunks))
+        if filters.symbol_types:
+            codes = [
+                self._symbol_type_codes[symbol_type]
+                for symbol_type in filters.symbol_types
+                if symbol_type in self._symbol_type_codes
+            ]
+            rows = rows[np.isin(self._symbol_types[rows], codes)]
+        return rows[self._alive[rows]]
+
+    def _index_metadata(
+        self, first_row: int, entries: list[dict[str, Any] | None]
+    ) -> None:
+        """Adds appended rows to the file and symbol type indexes."""
+        symbol_types = np.full(len(entries), -1, dtype=np.int16)
+        for offset, entry in enumerate(entries):
+            if entry is None:
+                continue
+            path = search_path(entry["file_path"], entry["metadata"])
+            self._rows_by_file.setdefault(path, []).append(first_row + offset)
+            symbol_type = entry["metadata"].get("symbol_type", NodeType.FILE.value)
+            symbol_types[offset] = self._symbol_type_codes.setdefault(
+                symbol_type, len(self._symbol_type_codes)
+            )
+        end_row = first_row + len(entries)
+        self._symbol_types_buffer = _grown(self._symbol_types_buffer, end_row)
+        self._symbol_types_buffer[first_row:end_row] = symbol_types
+
+    def _probed_rows(
+        self, query: np.ndarray, top_k: int, rows: np.ndarray | None
+    ) -> np.ndarray | None:
+        """
+        Returns the live rows (among ``rows``) in the IVF lists a query probes.
+        """
+        assert self.index is not None
+        # Sorted rows make the gather from the memory map sequential.
+        candidates = np.sort(self.index.candidates(query))
+        candidates = candidates[self._alive[candidates]]
+        if rows is not None:
+            candidates = np.intersect1d(candidates, rows, assume_unique=True)
+        # Too few live candidates: fall back to an exact scan.
+        return candidates if len(candidates) >= top_k else rows
+
+    def _rank(
+        self, query: np.ndarray, top_k: int, rows: np.ndarray | None
+    ) -> np.ndarray:
+        """
+        Returns the ``top_k`` best live rows, among ``rows`` or all rows.
+        """
+        return self._rank_many(query[np.newaxis], top_k, rows)[0]
+
+    def _rank_many(
+        self, queries: np.ndarray, top_k: int, rows: np.ndarray | None
+    ) -> list[np.ndarray]:
+        """
+        Returns the ``top_k`` best live rows for each query, among ``rows`` or
+        all rows.
+        """
+        count = len(self._vectors) if rows is None else len(rows)
+        # Queries are scored in groups to bound the score matrix.
+        group_size = max(1, _MAX_SCORES // max(count, 1))
+        vectors = self._vectors
+        if self.quantized is None and rows is not None:
+            vectors = self._vectors[rows]
+        shortlist_size = top_k
+        if self.quantized is not None:
+            shortlist_size = top_k * self.rescore_factor
+            if self.quantized.dimension is not None:
+                shortlist_size = max(shortlist_size, self.prefilter_candidates)
+        candidates = np.arange(count) if rows is None else rows
+
+        ranked: list[np.ndarray] = []
+        for start in range(0, len(queries), group_size):
+            group = queries[start : start + group_size]
+            if self.quantized is None:
+                scores = np.asarray(vectors @ group.T)
+            else:
+                scores = self.quantized.scores(group, rows)
+            if rows is None:
+                scores[~self._alive] = -np.inf
+            # One contiguous row of scores per query.
+            scores = np.ascontiguousarray(scores.T)
+            for query, query_scores in zip(group, scores, strict=True):
+                best = candidates[self._top_k(query_scores, shortlist_size)]
+                if self.quantized is not None:
+                    best = np.sort(best[self._alive[best]])
+                    best = best[
+                        self._top_k(np.asarray(self._vectors[best] @ query), top_k)
+                    ]
+                ranked.append(best)
+        return ranked
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Returns the positions of the ``top_k`` highest scores, best first."""
+        if top_k < len(scores):
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            candidates = np.arange(len(scores))
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    def compact(self) -> None:
+        """
+        Rewrites both files without deleted rows.
+        """
+        rows = np.flatnonzero(self._alive)
+        if len(rows) == len(self._alive):
+            return
+        vectors = np.array(self._vectors[rows], dtype="<f4")
+        entries = [self._chunks[row] for row in rows]
+
+        vectors_tmp = self._file(f"{VECTORS_FILE}.tmp")
+        chunks_tmp = self._file(f"{CHUNKS_FILE}.tmp")
+        with open(vectors_tmp, "wb") as f:
+            f.write(vectors.tobytes())
+        with open(chunks_tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"dimension": self.dimension}) + "\n")
+            for entry in entries:
+                f.write(json.dumps({"add": entry}) + "\n")
+        # Drop the old mapping before its file is replaced.
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        os.replace(vectors_tmp, self._file(VECTORS_FILE))
+        os.replace(chunks_tmp, self._file(CHUNKS_FILE))
+
+        self._chunks = list(entries)
+        self._rows = {entry["id"]: row for row, entry in enumerate(entries) if entry}
+        self._alive_buffer = np.ones(len(entries), dtype=bool)
+        self._rows_by_file = {}
+        self._symbol_types_buffer = np.zeros(0, dtype=np.int16)
+        self._index_metadata(0, entries)
+        self._map_vectors()
+        if self.quantized is not None:
+            self.quantized.rewrite(self._vectors)
+        if self.index is not None and self.index.is_trained:
+            self.index.keep(rows)
+            self.index.save(self.path)
+
+    @property
+    def _alive(self) -> np.ndarray:
+        """Whether each row holds a chunk that has not been deleted."""
+        return self._alive_buffer[: len(self._chunks)]
+
+    @property
+    def _symbol_types(self) -> np.ndarray:
+        """The code of each row's symbol type, from ``_symbol_type_codes``."""
+        return self._symbol_types_buffer[: len(self._chunks)]
+
+    def _record(self, row: int, with_embedding: bool = False) -> ChunkRecord:
+        entry = self._chunks[row]
+        assert entry is not None
+        return ChunkRecord(
+            id=entry["id"],
+            file_path=entry["file_path"],
+            content=entry["content"],
+            start_line=entry["start_line"],
+            end_line=entry["end_line"],
+            embedding=self._vectors[row].tolist() if with_embedding else None,
+            metadata=dict(entry["metadata"]),
+        )
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _append_log(self, operations: list[dict[str, Any]]) -> None:
+        with open(self._file(CHUNKS_FILE), "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(operation) + "\n" for operation in operations))
+
+    def _load(self) -> None:
+        """Replays the chunk log and maps the vectors it refers to."""
+        if not os.path.exists(self._file(CHUNKS_FILE)):
+            return
+        with open(self._file(CHUNKS_FILE), encoding="utf-8") as f:
+            for line in f:
+                operation = json.loads(line)
+                if "dimension" in operation:
+                    self.dimension = operation["dimension"]
+                elif "add" in operation:
+                    entry = operation["add"]
+                    self._rows[entry["id"]] = len(self._chunks)
+                    self._chunks.append(entry)
+                else:
+                    for chunk_id in operation["delete"]:
+                        row = self._rows.pop(chunk_id, None)
+                        if row is not None:
+                            self._chunks[row] = None
+        self._alive_buffer = np.array(
+            [entry is not None for entry in self._chunks], dtype=bool
+        )
+        self._index_metadata(0, self._chunks)
+
+        # Vectors are written before the log, so an interrupted batch can leave
+        # rows the log does not know about; drop them.
+        if self.dimension and os.path.exists(self._file(VECTORS_FILE)):
+            expected_size = 4 * self.dimension * len(self._chunks)
+            if os.path.getsize(self._file(VECTORS_FILE)) > expected_size:
+                os.truncate(self._file(VECTORS_FILE), expected_size)
+        self._map_vectors()
+        if self.index is not None and len(self._vectors):
+            self.index.load(self.path, self._vectors)
+            self._update_index(np.empty((0, self.dimension or 0), dtype=np.float32))
+
+    def _update_index(self, vectors: np.ndarray) -> None:
+        """
+        Indexes appended rows, training the index once there are enough and
+        retraining it, on a sample of the live rows, as the store grows.
+        """
+        if self.index is None:
+            return
+        if self.index.needs_training(len(self._rows)):
+            action = "Retraining" if self.index.is_trained else "Training"
+            print(f"{action} the vector index on {len(self._rows)} rows.")
+            self.index.train(self._vectors, np.flatnonzero(self._alive))
+            self.index.save(self.path)
+        elif self.index.is_trained and len(vectors):
+            self.index.append(self.path, self.index.add(vectors))
+
+    def _map_vectors(self) -> None:
+        """Memory-maps the rows recorded in the chunk log."""
+        rows = len(self._chunks)
+        if not rows or not self.dimension:
+            self._vectors = np.empty((0, self.dimension or 0), dtype=np.float32)
+            return
+        self._vectors = np.memmap(
+            self._file(VECTORS_FILE),
+            dtype="<f4",
+            mode="r",
+            shape=(rows, self.dimension),
+        )
@@ -0,0 +1,197 @@
+"""
+This module provides compact (quantized and/or truncated) copies of the vectors
+in a NumpyCodeRepository, used to score every row cheaply before the best rows
+are rescored at full precision.
+"""
+
+import os
+
+import numpy as np
+
+QUANTIZATIONS = ("float32", "float16", "int8")
+_EXTENSIONS = {"float32": "f32", "float16": "f16", "int8": "i8"}
+
+# Rows are written in blocks to bound temporary memory.
+_BLOCK_SIZE = 16384
+# Rows are dequantized for scoring in blocks small enough to stay in the CPU
+# cache, which makes the conversion nearly free next to the dot products.
+_SCORE_BLOCK_SIZE = 256
+
+
+class QuantizedVectors:
+    """
+    Keeps a reduced copy of a float32 matrix in memory-mapped files.
+
+    ``float16`` halves the size of every row. ``int8`` quarters it: each row is
+    scaled so that its largest component maps to 127, and the per-row scale
+    is stored alongside (``vectors.i8`` and ``vectors.scale.f32``). Because
+    the scale is per row, rows are quantized independently and can be
+    appended without recomputing anything.
+
+    With ``dimension``, rows are also truncated to their leading components
+    and re-normalized before they are quantized (``vectors.d256.f32`` and so
+    on). Embeddings trained with Matryoshka representation learning, such as
+    OpenAI's ``text-embedding-3`` models, keep most of their ranking quality
+    in the leading dimensions.
+
+    Scores computed from the copy are approximate; callers rescore the best
+    candidates against the float32 rows.
+
+    NumPy converts int8 to float32 far faster than float16, so int8 is both
+    the smaller and the faster option.
+    """
+
+    def __init__(self, path: str, quantization: str, dimension: int | None = None):
+        """
+        Initializes an empty copy.
+
+        Args:
+            path: The directory that holds the quantized files.
+            quantization: ``"float32"``, ``"float16"`` or ``"int8"``.
+            dimension: The number of leading dimensions to keep, or None to
+                keep all of them.
+        """
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(
+                f"Unknown quantization '{quantization}', "
+                f"expected one of {', '.join(QUANTIZATIONS)}."
+            )
+        if quantization == "float32" and dimension is None:
+            raise ValueError("A float32 copy must be truncated to a dimension.")
+        self.path = path
+        self.quantization = quantization
+        self.dimension = dimension
+        self.dtype = np.dtype(
+            {"float32": "<f4", "float16": "<f2", "int8": "i1"}[quantization]
+        )
+        prefix = os.path.join(
+            path, "vectors" if dimension is None else f"vectors.d{dimension}"
+        )
+        self.vectors_file = f"{prefix}.{_EXTENSIONS[quantization]}"
+        self.scales_file = f"{prefix}.scale.f32"
+        self._vectors = np.empty((0, 0), dtype=self.dtype)
+        self._scales = np.empty(0, dtype=np.float32)
+
+    def __len__(self) -> int:
+        """Returns the number of quantized rows."""
+        return len(self._vectors)
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the quantized rows (and scales) in bytes."""
+        return self._vectors.nbytes + self._scales.nbytes
+
+    def load(self, vectors: np.ndarray) -> None:
+        """
+        Maps the quantized files, rebuilding them if they do not match ``vectors``.
+
+        The files are rebuilt when quantization is first enabled for a store,
+        or after an interrupted write left them out of step with the float32
+        rows.
+        """
+        rows, dimension = len(vectors), self._reduced_dimension(vectors.shape[1])
+        expected = rows * dimension * self.dtype.itemsize
+        if (
+            not os.path.exists(self.vectors_file)
+            or os.path.getsize(self.vectors_file) != expected
+            or (
+                self.quantization == "int8"
+                and (
+                    not os.path.exists(self.scales_file)
+                    or os.path.getsize(self.scales_file) != 4 * rows
+                )
+            )
+        ):
+            self.rewrite(vectors)
+            return
+        self._map(rows, dimension)
+
+    def append(self, vectors: np.ndarray) -> None:
+        """Quantizes and appends rows."""
+        rows = len(self._vectors) + len(vectors)
+        dimension = self._reduced_dimension(vectors.shape[1])
+        quantized, scales = self._quantize(vectors)
+        with open(self.vectors_file, "ab") as f:
+            f.write(quantized.tobytes())
+        if scales is not None:
+            with open(self.scales_file, "ab") as f:
+                f.write(scales.tobytes())
+        self._map(rows, dimension)
+
+    def rewrite(self, vectors: np.ndarray) -> None:
+        """Replaces the quantized files with a copy of ``vectors``."""
+        # Drop the old mappings before their files are replaced.
+        self._vectors = np.empty((0, 0), dtype=self.dtype)
+        self._scales = np.empty(0, dtype=np.float32)
+        vectors_tmp = f"{self.vectors_file}.tmp"
+        scales_tmp = f"{self.scales_file}.tmp"
+        with open(vectors_tmp, "wb") as vf, open(scales_tmp, "wb") as sf:
+            for start in range(0, len(vectors), _BLOCK_SIZE):
+                quantized, scales = self._quantize(
+                    np.asarray(vectors[start : start + _BLOCK_SIZE], dtype=np.float32)
+                )
+                vf.write(quantized.tobytes())
+                if scales is not None:
+                    sf.write(scales.tobytes())
+        os.replace(vectors_tmp, self.vectors_file)
+        if self.quantization == "int8":
+            os.replace(scales_tmp, self.scales_file)
+        else:
+            os.remove(scales_tmp)
+        self._map(len(vectors), self._reduced_dimension(vectors.shape[1]))
+
+    def scores(self, query: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """
+        Returns the approximate similarity of a query to the given (or all) rows.
+
+        ``query`` may also be a matrix with one query per row, in which case
+        the result has one column per query and every block of rows is
+        dequantized once for all of them.
+        """
+        query = query[..., : self._vectors.shape[1]]
+        if self.quantization == "float32":
+            vectors = self._vectors if rows is None else self._vectors[rows]
+            return np.asarray(vectors @ query.T)
+        count = len(self._vectors) if rows is None else len(rows)
+        scores = np.empty((count, *query.shape[:-1]), dtype=np.float32)
+        buffer = np.empty(
+            (min(count, _SCORE_BLOCK_SIZE), self._vectors.shape[1]), dtype=np.float32
+        )
+        for start in range(0, count, _SCORE_BLOCK_SIZE):
+            block = slice(start, start + _SCORE_BLOCK_SIZE)
+            selected = block if rows is None else rows[block]
+            size = len(scores[block])
+            np.copyto(buffer[:size], self._vectors[selected], casting="unsafe")
+            scores[block] = buffer[:size] @ query.T
+        if self.quantization == "int8":
+            scales = self._scales if rows is None else self._scales[rows]
+            scores *= scales.reshape(-1, *[1] * (query.ndim - 1))
+        return scores
+
+    def _reduced_dimension(self, dimension: int) -> int:
+        return dimension if self.dimension is None else min(self.dimension, dimension)
+
+    def _quantize(self, vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+        if self.dimension is not None and self.dimension < vectors.shape[1]:
+            vectors = vectors[:, : self.dimension]
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+        if self.quantization != "int8":
+            return vectors.astype(self.dtype), None
+        peaks = np.abs(vectors).max(axis=1)
+        scales = np.where(peaks == 0, 1, peaks / 127).astype("<f4")
+        quantized = np.rint(vectors / scales[:, None]).astype(self.dtype)
+        return quantized, scales
+
+    def _map(self, rows: int, dimension: int) -> None:
+        if not rows:
+            self._vectors = np.empty((0, dimension), dtype=self.dtype)
+            self._scales = np.empty(0, dtype=np.float32)
+            return
+        self._vectors = np.memmap(
+            self.vectors_file, dtype=self.dtype, mode="r", shape=(rows, dimension)
+        )
+        if self.quantization == "int8":
+            self._scales = np.memmap(
+                self.scales_file, dtype="<f4", mode="r", shape=(rows,)
+            )
@@ -73,27 +73,34 @@ class FileProcessor:
                 return True
         return False
 
+    def is_supported(self, file_path: str) -> bool:
+        """Checks if a file has a supported extension and is not excluded."""
+        return Path(
+            file_path
+        ).suffix in self.supported_extensions and not self._is_excluded(file_path)
+
+    @staticmethod
+    def get_base_paths(
+        directory_path: str, include_dirs: list[str] | None = None
+    ) -> list[str]:
+        """
+        Returns the directories that discovery walks for the given arguments.
+        """
+        if include_dirs:
+            return [os.path.join(directory_path, d) for d in include_dirs]
+        return [directory_path]
+
     def discover_files(
         self, directory_path: str, include_dirs: list[str] | None = None
     ) -> Iterator[str]:
         """
         Recursively discovers all supported files in a given directory, with filtering.
         """
-        base_paths = (
-            [os.path.join(directory_path, d) for d in include_dirs]
-            if include_dirs
-            else [directory_path]
-        )
-
-        for base_path in base_paths:
+        for base_path in self.get_base_paths(directory_path, include_dirs):
             for root, _, files in os.walk(base_path):
                 for file in files:
                     file_path = os.path.join(root, file)
-                    if Path(
-                        file
-                    ).suffix in self.supported_extensions and not self._is_excluded(
-                        file_path
-                    ):
+                    if self.is_supported(file_path):
                         yield file_path
 
     def read_file(self, file_path: str) -> str | None:
@@ -106,15 +113,24 @@ class FileProcessor:
         except (OSError, UnicodeDecodeError):
             return None
 
-    def read_files(
+    def iter_files(
         self, directory_path: str, include_dirs: list[str] | None = None
-    ) -> dict[str, str]:
+    ) -> Iterator[tuple[str, str]]:
         """
-        Discovers and reads all supported files in a directory.
+        Lazily discovers and reads supported files, one at a time.
+
+        Only the file currently being yielded is held in memory, so callers can
+        process arbitrarily large repositories with a flat memory profile.
         """
-        file_contents = {}
         for file_path in self.discover_files(directory_path, include_dirs):
             content = self.read_file(file_path)
             if content is not None:
-                file_contents[file_path] = content
-        return file_contents
+                yield file_path, content
+
+    def read_files(
+        self, directory_path: str, include_dirs: list[str] | None = None
+    ) -> dict[str, str]:
+        """
+        Discovers and reads all supported files in a directory.
+        """
+        return dict(self.iter_files(directory_path, include_dirs))
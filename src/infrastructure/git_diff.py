@@ -0,0 +1,173 @@
+"""
+This module provides a reader for the changes between two commits of a local
+git checkout.
+"""
+
+import subprocess
+from enum import StrEnum
+
+from pydantic import BaseModel, Field
+
+
+class FileChangeStatus(StrEnum):
+    """Enum for the kinds of file changes reported by ``git diff``."""
+
+    ADDED = "A"
+    MODIFIED = "M"
+    DELETED = "D"
+    RENAMED = "R"
+
+
+class FileChange(BaseModel):
+    """Represents a single changed path between two commits."""
+
+    status: FileChangeStatus = Field(..., description="The kind of change.")
+    path: str = Field(
+        ...,
+        description="The path after the change, relative to the reader's directory.",
+    )
+    old_path: str | None = Field(
+        None, description="The path before the change, set only for renames."
+    )
+    similarity: int = Field(
+        100, description="Content similarity percentage reported for renames."
+    )
+
+
+class GitDiffError(Exception):
+    """Custom exception for failures while running git."""
+
+    pass
+
+
+class GitDiffReader:
+    """
+    Reads changed paths and file contents from a local git repository.
+    """
+
+    def __init__(self, repo_path: str):
+        """
+        Initializes the reader.
+
+        Args:
+            repo_path: The path to a git checkout or to a directory within one.
+                Paths are reported relative to it, and changes outside of it
+                are left out.
+        """
+        self.repo_path = repo_path
+        self._prefix: str | None = None
+
+    def _run_git(self, *args: str) -> bytes:
+        """Runs a git command in the repository and returns its stdout."""
+        try:
+            process = subprocess.run(
+                ["git", *args],
+                cwd=self.repo_path,
+                capture_output=True,
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, "stderr", b"") or b""
+            raise GitDiffError(
+                f"git {' '.join(args)} failed: {stderr.decode(errors='replace')}"
+            ) from e
+        return process.stdout
+
+    @property
+    def prefix(self) -> str:
+        """
+        The path of ``repo_path`` within the checkout, e.g. ``"pkg/"``, or an
+        empty string at its root.
+        """
+        if self._prefix is None:
+            self._prefix = self._run_git("rev-parse", "--show-prefix").decode().strip()
+        return self._prefix
+
+    def _relative(self, path: str) -> str | None:
+        """
+        Converts a path relative to the top of the checkout, as git reports
+        it, to one relative to ``repo_path``; None if it lies outside.
+        """
+        if not path.startswith(self.prefix):
+            return None
+        return path[len(self.prefix) :]
+
+    def get_changes(self, base_commit: str, target_commit: str) -> list[FileChange]:
+        """
+        Lists the paths that changed between two commits.
+
+        Copies are reported as additions and type changes as modifications. A
+        file renamed into ``repo_path`` is reported as added, one renamed out
+        of it as deleted.
+
+        Args:
+            base_commit: The commit the index currently reflects.
+            target_commit: The commit to bring the index up to.
+
+        Returns:
+            A list of FileChange objects, in the order git reports them.
+        """
+        output = self._run_git(
+            "diff", "--name-status", "-z", "-M", base_commit, target_commit
+        )
+        fields = output.decode("utf-8").split("\0")
+        changes: list[FileChange] = []
+
+        i = 0
+        while i < len(fields) and fields[i]:
+            status = fields[i]
+            kind = status[0]
+            if kind in ("R", "C"):
+                old_path = self._relative(fields[i + 1])
+                new_path = self._relative(fields[i + 2])
+                i += 3
+                if new_path is None:
+                    if kind == "R" and old_path is not None:
+                        changes.append(
+                            FileChange(status=FileChangeStatus.DELETED, path=old_path)
+                        )
+                    continue
+                if kind == "C" or old_path is None:
+                    changes.append(
+                        FileChange(status=FileChangeStatus.ADDED, path=new_path)
+                    )
+                    continue
+                changes.append(
+                    FileChange(
+                        status=FileChangeStatus.RENAMED,
+                        path=new_path,
+                        old_path=old_path,
+                        similarity=int(status[1:] or 100),
+                    )
+                )
+                continue
+
+            path = self._relative(fields[i + 1])
+            i += 2
+            if path is None:
+                continue
+            if kind == "A":
+                changes.append(FileChange(status=FileChangeStatus.ADDED, path=path))
+            elif kind == "D":
+                changes.append(FileChange(status=FileChangeStatus.DELETED, path=path))
+            else:
+                changes.append(FileChange(status=FileChangeStatus.MODIFIED, path=path))
+        return changes
+
+    def read_file(self, commit: str, path: str) -> str | None:
+        """
+        Reads a file's content as of a given commit.
+
+        Args:
+            commit: The commit to read from.
+            path: The path of the file, relative to ``repo_path``.
+
+        Returns:
+            The decoded content, or None if it cannot be read or is not UTF-8.
+        """
+        try:
+            return self._run_git("show", f"{commit}:{self.prefix}{path}").decode(
+                "utf-8"
+            )
+        except (GitDiffError, UnicodeDecodeError):
+            return None
@@ -0,0 +1,126 @@
+"""
+This module provides a persisted manifest of indexed files, used to drive
+incremental re-indexing.
+"""
+
+import hashlib
+import json
+import os
+
+from pydantic import BaseModel, Field
+
+from src.domain.entities.graph_entities import (
+    BaseEdge,
+    CallReference,
+    ImportReference,
+    NodeType,
+    SymbolDefinition,
+)
+
+
+class ManifestEntry(BaseModel):
+    """
+    Records what was produced when a single file was last indexed.
+    """
+
+    content_hash: str = Field(..., description="SHA-256 hash of the file content.")
+    relative_path: str | None = Field(
+        None, description="The file's path relative to the indexed root."
+    )
+    chunk_ids: list[str] = Field(
+        default_factory=list, description="IDs of the chunks stored for the file."
+    )
+    node_ids: list[str] = Field(
+        default_factory=list, description="IDs of the graph nodes owned by the file."
+    )
+    symbols: dict[str, NodeType] = Field(
+        default_factory=dict,
+        description="Types of the classes and functions defined in the file.",
+    )
+    definitions: list[SymbolDefinition] = Field(
+        default_factory=list,
+        description="Names and line ranges of the classes and functions defined.",
+    )
+    imports: list[ImportReference] = Field(
+        default_factory=list, description="The file's import references."
+    )
+    calls: list[CallReference] = Field(
+        default_factory=list, description="The file's unresolved call references."
+    )
+    links: list[BaseEdge] = Field(
+        default_factory=list,
+        description="Edges to other files last written for the file's references.",
+    )
+
+
+class IndexManifest:
+    """
+    A JSON-backed mapping of file path to ManifestEntry.
+
+    The manifest is loaded eagerly on construction and only written back when
+    ``save`` is called, so an interrupted run never records files whose chunks
+    were not stored.
+    """
+
+    def __init__(self, path: str = "./data/index_manifest.json"):
+        """
+        Initializes the manifest, loading existing entries from disk if present.
+
+        Args:
+            path: The path of the JSON file backing the manifest.
+        """
+        self.path = path
+        self._entries: dict[str, ManifestEntry] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                raw_entries = json.load(f)
+            self._entries = {
+                file_path: ManifestEntry.model_validate(entry)
+                for file_path, entry in raw_entries.items()
+            }
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        """Returns the hash used to detect changes to a file's content."""
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, file_path: str) -> ManifestEntry | None:
+        """Returns the entry recorded for a file, if any."""
+        return self._entries.get(file_path)
+
+    def record(self, file_path: str, entry: ManifestEntry) -> None:
+        """Records the entry for a file, replacing any previous one."""
+        self._entries[file_path] = entry
+
+    def remove(self, file_path: str) -> ManifestEntry | None:
+        """Removes and returns the entry recorded for a file, if any."""
+        return self._entries.pop(file_path, None)
+
+    def file_paths(self) -> set[str]:
+        """Returns the paths of all files recorded in the manifest."""
+        return set(self._entries)
+
+    def clear(self) -> None:
+        """Forgets every entry, forcing the next run to re-index everything."""
+        self._entries.clear()
+
+    def save(self) -> None:
+        """
+        Atomically writes the manifest to disk.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    file_path: entry.model_dump()
+                    for file_path, entry in self._entries.items()
+                },
+                f,
+            )
+        os.replace(tmp_path, self.path)
@@ -3,20 +3,27 @@ This module provides a CodeParser class to parse source code using tree-sitter
 and extract structural information to build a knowledge graph.
 """
 
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+
 import tree_sitter_python as tspython
 from tree_sitter import Language, Node, Parser, Query, QueryCursor
 
 from src.domain.entities.graph_entities import (
     BaseEdge,
     BaseNode,
+    CallReference,
     CallsEdge,
     ClassNode,
     ContainsEdge,
     FileNode,
     FunctionNode,
-    ImportsEdge,
+    ImportReference,
+    NodeType,
     ParsedData,
 )
+from src.infrastructure.parser.compact import decode_parsed_data, encode_parsed_data
+from src.infrastructure.parser.parse_cache import ParseCache
 
 # --- Tree-sitter Queries ---
 # These queries are used to find specific patterns in the AST.
@@ -58,22 +65,33 @@ CALL_QUERY = """
   ]) @call.expression
 """
 
+# All of the above, compiled once per parser and run in a single capture pass.
+# Capture names are unique across the individual queries, so the results can be
+# dispatched by name.
+COMBINED_QUERY = IMPORT_QUERY + CLASS_QUERY + FUNCTION_QUERY + CALL_QUERY
+
 
 class CodeParser:
     """
     Parses source code to extract entities and relationships for the knowledge graph.
     """
 
-    def __init__(self, language: str = "python"):
+    def __init__(self, language: str = "python", cache: ParseCache | None = None):
         """
         Initializes the parser with a specific language.
+
+        Args:
+            language: The language of the files to parse.
+            cache: An optional cache of parse results used by ``parse_stream``.
         """
+        self.cache = cache
         try:
             if language != "python":
                 raise ValueError("Currently only 'python' language is supported.")
 
             self.language = Language(tspython.language())
             self.parser = Parser(self.language)
+            self.query = Query(self.language, COMBINED_QUERY)
         except Exception as e:
             print(f"Error initializing CodeParser with language '{language}': {e}")
             print(
@@ -105,68 +123,144 @@ class CodeParser:
         file_id = file_path
         nodes[file_id] = FileNode(id=file_id, properties={"path": file_path})
 
+        # A single pass over the tree collects every capture we need.
+        captures = QueryCursor(self.query).captures(root_node)
+
         # 2. Extract all entities and their primary containment
-        class_nodes = self._extract_classes(root_node, file_id)
+        class_nodes = self._extract_classes(captures, file_id)
         for class_node in class_nodes:
             nodes[class_node.id] = class_node
-            edges.append(ContainsEdge(source_id=file_id, target_id=class_node.id))
+            edges.append(
+                ContainsEdge(
+                    source_id=file_id,
+                    target_id=class_node.id,
+                    source_type=NodeType.FILE,
+                    target_type=NodeType.CLASS,
+                )
+            )
 
-        function_nodes = self._extract_functions(root_node, file_id, node_map)
+        function_nodes = self._extract_functions(captures, file_id, node_map)
+        call_expressions = captures.get("call.expression", [])
+        scopes = self._resolve_scopes(
+            captures, file_id, [*node_map.values(), *call_expressions]
+        )
         for func_node in function_nodes:
             nodes[func_node.id] = func_node
 
             # Determine if the function is a method of a class
             ts_node = node_map.get(func_node.id)
             if ts_node:
-                scope_id = self._find_containing_scope(file_id, ts_node)
+                scope_id = scopes[ts_node.id]
                 # If the scope is a class, the class contains the method
                 if scope_id in nodes and isinstance(nodes[scope_id], ClassNode):
                     edges.append(
-                        ContainsEdge(source_id=scope_id, target_id=func_node.id)
+                        ContainsEdge(
+                            source_id=scope_id,
+                            target_id=func_node.id,
+                            source_type=NodeType.CLASS,
+                            target_type=NodeType.FUNCTION,
+                        )
                     )
                 else:
                     # Only add file containment if it's not a class method
                     edges.append(
-                        ContainsEdge(source_id=file_id, target_id=func_node.id)
+                        ContainsEdge(
+                            source_id=file_id,
+                            target_id=func_node.id,
+                            source_type=NodeType.FILE,
+                            target_type=NodeType.FUNCTION,
+                        )
                     )
 
-        # 3. Extract relationships (Imports, Calls)
-        import_edges = self._extract_imports(root_node, file_id)
-        call_edges = self._extract_calls(root_node, file_id, list(nodes.keys()))
+        # 3. Extract relationships (Imports, Calls). Imports and calls into
+        # other files are kept as references for the SymbolTable to resolve.
+        class_names = {node.properties["name"] for node in class_nodes}
+        imports = self._extract_imports(captures)
+        node_types = {node_id: node.type for node_id, node in nodes.items()}
+        call_edges, call_references = self._extract_calls(
+            call_expressions, file_id, scopes, node_types, class_names
+        )
 
-        edges.extend(import_edges)
         edges.extend(call_edges)
 
-        return ParsedData(file_path=file_path, nodes=list(nodes.values()), edges=edges)
+        return ParsedData(
+            file_path=file_path,
+            nodes=list(nodes.values()),
+            edges=edges,
+            imports=imports,
+            calls=call_references,
+        )
+
+    async def parse_stream(
+        self, files: Iterable[tuple[str, str]]
+    ) -> AsyncIterator[tuple[str, str, ParsedData]]:
+        """
+        Parses files one at a time on the calling thread.
 
-    def _execute_query(self, node: Node, query_str: str) -> dict[str, list[Node]]:
-        """Helper to execute a tree-sitter query."""
-        query = Query(self.language, query_str)
-        cursor = QueryCursor(query)
-        captures = cursor.captures(node)
-        return captures
+        Control is handed back to the event loop after every file so that
+        concurrent I/O keeps making progress while parsing. Files whose content
+        is in the cache are not parsed again.
 
-    def _extract_classes(self, root_node: Node, file_id: str) -> list[ClassNode]:
-        """Extracts class nodes from the AST."""
+        Yields:
+            Tuples of (file_path, content, ParsedData).
+        """
+        for file_path, content in files:
+            if self.cache is None:
+                yield file_path, content, self.parse(file_path, content)
+            else:
+                content_hash = self.cache.hash_content(content)
+                compact = self.cache.get(file_path, content_hash)
+                if compact is not None:
+                    yield file_path, content, decode_parsed_data(compact)
+                    continue
+                parsed_data = self.parse(file_path, content)
+                self.cache.put(content_hash, encode_parsed_data(parsed_data))
+                yield file_path, content, parsed_data
+            await asyncio.sleep(0)
+
+    @staticmethod
+    def _line_range(definition: Node) -> dict[str, int]:
+        """
+        Returns the 1-based, inclusive line range of a definition, including
+        its decorators.
+        """
+        if definition.parent and definition.parent.type == "decorated_definition":
+            definition = definition.parent
+        return {
+            "start_line": definition.start_point.row + 1,
+            "end_line": definition.end_point.row + 1,
+        }
+
+    def _extract_classes(
+        self, captures: dict[str, list[Node]], file_id: str
+    ) -> list[ClassNode]:
+        """Extracts class nodes from the captures."""
         nodes = []
-        captures = self._execute_query(root_node, CLASS_QUERY)
-        if "class.name" in captures:
-            for node in captures["class.name"]:
-                if node.text:
-                    class_name = node.text.decode("utf8")
-                    class_id = f"{file_id}::{class_name}"
+        seen_class_ids = set()
+        for node in captures.get("class.name", []):
+            if node.text:
+                class_name = node.text.decode("utf8")
+                class_id = f"{file_id}::{class_name}"
+                # Decorated classes are captured by two patterns.
+                if class_id not in seen_class_ids and node.parent:
                     nodes.append(
-                        ClassNode(id=class_id, properties={"name": class_name})
+                        ClassNode(
+                            id=class_id,
+                            properties={
+                                "name": class_name,
+                                **self._line_range(node.parent),
+                            },
+                        )
                     )
+                    seen_class_ids.add(class_id)
         return nodes
 
     def _extract_functions(
-        self, root_node: Node, file_id: str, node_map: dict[str, Node]
+        self, captures: dict[str, list[Node]], file_id: str, node_map: dict[str, Node]
     ) -> list[FunctionNode]:
-        """Extracts function nodes from the AST."""
+        """Extracts function nodes from the captures."""
         nodes = []
         seen_func_ids = set()
-        captures = self._execute_query(root_node, FUNCTION_QUERY)
 
         # Note: "function.definition" is used to get the whole function node for scope analysis
         func_definitions = captures.get("function.definition", [])
@@ -182,7 +276,10 @@ class CodeParser:
                     nodes.append(
                         FunctionNode(
                             id=func_id,
-                            properties={"name": func_name},
+                            properties={
+                                "name": func_name,
+                                **self._line_range(func_def_node),
+                            },
                         )
                     )
                     # Store the tree-sitter node in a temporary map for scope analysis
@@ -190,58 +287,145 @@ class CodeParser:
                     seen_func_ids.add(func_id)
         return nodes
 
-    def _extract_imports(self, root_node: Node, file_id: str) -> list[ImportsEdge]:
-        """Extracts import relationships from the AST."""
-        edges = []
-        captures = self._execute_query(root_node, IMPORT_QUERY)
-        for _, nodes in captures.items():
-            for node in nodes:
-                if not node.text:
-                    continue
-                text = node.text.decode("utf8")
-                if text.startswith("from"):
-                    module_name = text.split(" import ")[0].replace("from ", "").strip()
-                else:
-                    module_name = text.replace("import ", "").split(" as ")[0].strip()
+    def _extract_imports(
+        self, captures: dict[str, list[Node]]
+    ) -> list[ImportReference]:
+        """Extracts the names bound by import statements from the captures."""
+        references = []
+        import_nodes = sorted(
+            captures.get("import", []), key=lambda node: node.start_byte
+        )
+        for node in import_nodes:
+            for name_node in node.children_by_field_name("name"):
+                module, alias = self._import_name(name_node)
+                if module:
+                    references.append(ImportReference(module=module, alias=alias))
+
+        import_from_nodes = sorted(
+            captures.get("import_from", []), key=lambda node: node.start_byte
+        )
+        for node in import_from_nodes:
+            module_node = node.child_by_field_name("module_name")
+            if module_node is None:
+                continue
+            module, level = self._text(module_node), 0
+            if module_node.type == "relative_import":
+                for child in module_node.children:
+                    if child.type == "import_prefix":
+                        level = len(self._text(child))
+                    else:
+                        module = self._text(child)
+                if len(module_node.children) == 1:
+                    module = ""
+
+            if any(child.type == "wildcard_import" for child in node.children):
+                references.append(ImportReference(module=module, level=level, name="*"))
+            for name_node in node.children_by_field_name("name"):
+                name, alias = self._import_name(name_node)
+                if name:
+                    references.append(
+                        ImportReference(
+                            module=module, level=level, name=name, alias=alias
+                        )
+                    )
+        return references
+
+    def _import_name(self, node: Node) -> tuple[str, str | None]:
+        """Returns the (dotted name, alias) of an import name node."""
+        if node.type == "aliased_import":
+            name_node = node.child_by_field_name("name")
+            alias_node = node.child_by_field_name("alias")
+            return (
+                self._text(name_node) if name_node else "",
+                self._text(alias_node) if alias_node else None,
+            )
+        return self._text(node), None
 
-                # This is a simplified import resolution.
-                # In a real scenario, this would need to resolve relative vs. absolute imports.
-                target_id = module_name
-                edges.append(ImportsEdge(source_id=file_id, target_id=target_id))
-        return edges
+    @staticmethod
+    def _text(node: Node) -> str:
+        return node.text.decode("utf8") if node.text else ""
 
-    def _find_containing_scope(self, file_id: str, node: Node) -> str:
+    def _resolve_scopes(
+        self, captures: dict[str, list[Node]], file_id: str, targets: list[Node]
+    ) -> dict[int, str]:
         """
-        Finds the containing function or class for a given node.
-        Traverses up the AST from the given node.
+        Finds the innermost containing function or class for each target node.
+
+        Scope definitions and targets are swept in document order while a stack
+        holds the scopes that are currently open, which is equivalent to a
+        depth-first walk restricted to the nodes of interest. Each node is
+        pushed and popped at most once, so the cost is linear in the number of
+        captures instead of proportional to nesting depth per target.
+
+        Returns:
+            A mapping of tree-sitter node ID to scope ID (the file ID when the
+            node is at module level).
         """
-        current = node.parent
-        while current:
-            if current.type == "function_definition":
-                name_node = current.child_by_field_name("name")
-                if name_node and name_node.text:
-                    return f"{file_id}::{name_node.text.decode('utf8')}"
-            elif current.type == "class_definition":
-                name_node = current.child_by_field_name("name")
-                if name_node and name_node.text:
-                    return f"{file_id}::{name_node.text.decode('utf8')}"
-            current = current.parent
-        return file_id  # Default to file scope
+        # (start_byte, order, -end_byte, end_byte, payload). Targets sort before a
+        # scope starting at the same byte, so a definition is never its own scope,
+        # and enclosing scopes sort before the scopes they contain.
+        events: list[tuple[int, int, int, int, str | int]] = []
+        seen_scopes: set[int] = set()
+        for capture_name in ("class.definition", "function.definition"):
+            for definition in captures.get(capture_name, []):
+                if definition.type == "decorated_definition":
+                    inner = definition.child_by_field_name("definition")
+                    if inner is None:
+                        continue
+                    definition = inner
+                name_node = definition.child_by_field_name("name")
+                if definition.id in seen_scopes or not (name_node and name_node.text):
+                    continue
+                seen_scopes.add(definition.id)
+                scope_id = f"{file_id}::{name_node.text.decode('utf8')}"
+                events.append(
+                    (
+                        definition.start_byte,
+                        1,
+                        -definition.end_byte,
+                        definition.end_byte,
+                        scope_id,
+                    )
+                )
+        for target in targets:
+            events.append((target.start_byte, 0, 0, target.end_byte, target.id))
+        events.sort()
+
+        scopes: dict[int, str] = {}
+        open_scopes: list[tuple[int, str]] = []
+        for start_byte, order, _, end_byte, payload in events:
+            while open_scopes and open_scopes[-1][0] <= start_byte:
+                open_scopes.pop()
+            if order == 0:
+                scopes[int(payload)] = open_scopes[-1][1] if open_scopes else file_id
+            else:
+                open_scopes.append((end_byte, str(payload)))
+        return scopes
 
     def _extract_calls(
-        self, root_node: Node, file_id: str, existing_node_ids: list[str]
-    ) -> list[CallsEdge]:
-        """Extracts function call relationships from the AST."""
-        edges = []
-        captures = self._execute_query(root_node, CALL_QUERY)
+        self,
+        call_expressions: list[Node],
+        file_id: str,
+        scopes: dict[int, str],
+        node_types: dict[str, NodeType],
+        class_names: set[str],
+    ) -> tuple[list[CallsEdge], list[CallReference]]:
+        """
+        Extracts function call relationships from the captured call expressions.
 
-        call_expressions = captures.get("call.expression", [])
-
-        # Get all class names defined in the file to filter out instantiations
-        class_nodes = self._extract_classes(root_node, file_id)
-        class_names = {node.properties["name"] for node in class_nodes}
+        ``scopes`` maps each call expression to its containing scope, and
+        ``node_types`` maps the ID of every node in the file to its type.
+        ``class_names`` holds the classes defined in the file, so that
+        instantiations are not mistaken for calls.
 
+        Returns:
+            The edges of calls to functions in the same file, and references
+            for every other call, to be resolved across files.
+        """
+        edges = []
+        references = []
         seen_edges = set()
+        seen_references = set()
 
         for call_node in call_expressions:
             # Find the name of the function being called
@@ -250,6 +434,7 @@ class CodeParser:
                 continue
 
             call_name = ""
+            receiver = None
             if name_node.type == "identifier":
                 if name_node.text:
                     call_name = name_node.text.decode("utf8")
@@ -258,6 +443,9 @@ class CodeParser:
                 attr_node = name_node.child_by_field_name("attribute")
                 if attr_node and attr_node.text:
                     call_name = attr_node.text.decode("utf8")
+                object_node = name_node.child_by_field_name("object")
+                if object_node and object_node.type in ("identifier", "attribute"):
+                    receiver = self._text(object_node)
 
             if not call_name:
                 continue
@@ -267,17 +455,32 @@ class CodeParser:
                 continue
 
             # Determine the source and target of the call
-            source_id = self._find_containing_scope(file_id, call_node)
+            source_id = scopes[call_node.id]
             target_id = f"{file_id}::{call_name}"
 
             # Add edge if the target is a known function/method in the file
             edge_key = (source_id, target_id)
-            if (
-                target_id in existing_node_ids
-                and source_id != target_id
-                and edge_key not in seen_edges
-            ):
-                edges.append(CallsEdge(source_id=source_id, target_id=target_id))
+            if target_id not in node_types:
+                reference_key = (source_id, call_name, receiver)
+                if reference_key not in seen_references:
+                    references.append(
+                        CallReference(
+                            source_id=source_id,
+                            source_type=node_types[source_id],
+                            name=call_name,
+                            receiver=receiver,
+                        )
+                    )
+                    seen_references.add(reference_key)
+            elif source_id != target_id and edge_key not in seen_edges:
+                edges.append(
+                    CallsEdge(
+                        source_id=source_id,
+                        target_id=target_id,
+                        source_type=node_types[source_id],
+                        target_type=node_types[target_id],
+                    )
+                )
                 seen_edges.add(edge_key)
 
-        return edges
+        return edges, references
@@ -0,0 +1,159 @@
+"""
+This module defines the compact tuple form of ParsedData that is sent between
+processes and stored in the parse cache.
+"""
+
+from typing import Any
+
+from src.domain.entities.graph_entities import (
+    BaseEdge,
+    BaseNode,
+    CallReference,
+    CallsEdge,
+    ClassNode,
+    ContainsEdge,
+    EdgeType,
+    FileNode,
+    FunctionNode,
+    ImportReference,
+    ImportsEdge,
+    NodeType,
+    ParsedData,
+)
+
+# The version of the parser's output. Bump it whenever CodeParser starts
+# producing different nodes, edges or references for the same source, so that
+# cached parse results are not reused.
+PARSER_VERSION = 2
+
+# A compact, picklable form of ParsedData: plain tuples of strings and dicts are
+# an order of magnitude cheaper to pickle than Pydantic models.
+CompactNode = tuple[str, str, dict[str, Any]]
+CompactEdge = tuple[str, str, str, dict[str, Any], str | None, str | None]
+CompactImport = tuple[str, int, str | None, str | None]
+CompactCall = tuple[str, str, str, str | None]
+CompactParsedData = tuple[
+    str, list[CompactNode], list[CompactEdge], list[CompactImport], list[CompactCall]
+]
+
+_NODE_CLASSES: dict[NodeType, type[BaseNode]] = {
+    NodeType.FILE: FileNode,
+    NodeType.CLASS: ClassNode,
+    NodeType.FUNCTION: FunctionNode,
+}
+
+_EDGE_CLASSES: dict[EdgeType, type[BaseEdge]] = {
+    EdgeType.CONTAINS: ContainsEdge,
+    EdgeType.IMPORTS: ImportsEdge,
+    EdgeType.CALLS: CallsEdge,
+}
+
+
+def encode_parsed_data(parsed_data: ParsedData) -> CompactParsedData:
+    """Converts ParsedData into its compact tuple form."""
+    return (
+        parsed_data.file_path,
+        [(node.id, node.type.value, node.properties) for node in parsed_data.nodes],
+        [
+            (
+                edge.source_id,
+                edge.target_id,
+                edge.type.value,
+                edge.properties,
+                edge.source_type.value if edge.source_type else None,
+                edge.target_type.value if edge.target_type else None,
+            )
+            for edge in parsed_data.edges
+        ],
+        [(i.module, i.level, i.name, i.alias) for i in parsed_data.imports],
+        [
+            (c.source_id, c.source_type.value, c.name, c.receiver)
+            for c in parsed_data.calls
+        ],
+    )
+
+
+def decode_parsed_data(compact: CompactParsedData) -> ParsedData:
+    """
+    Rebuilds ParsedData, with the concrete node and edge classes, from tuples.
+
+    The tuples were produced by ``encode_parsed_data`` from validated models,
+    so the models are rebuilt with ``model_construct``, skipping validation.
+    """
+    file_path, nodes, edges, imports, calls = compact
+    return ParsedData.model_construct(
+        file_path=file_path,
+        nodes=[
+            _NODE_CLASSES[NodeType(node_type)].model_construct(
+                id=node_id, type=NodeType(node_type), properties=properties
+            )
+            for node_id, node_type, properties in nodes
+        ],
+        edges=[
+            _EDGE_CLASSES[EdgeType(edge_type)].model_construct(
+                source_id=source_id,
+                target_id=target_id,
+                type=EdgeType(edge_type),
+                properties=properties,
+                source_type=NodeType(source_type) if source_type else None,
+                target_type=NodeType(target_type) if target_type else None,
+            )
+            for source_id, target_id, edge_type, properties, source_type, target_type in edges
+        ],
+        imports=[
+            ImportReference.model_construct(
+                module=module, level=level, name=name, alias=alias
+            )
+            for module, level, name, alias in imports
+        ],
+        calls=[
+            CallReference.model_construct(
+                source_id=source_id,
+                source_type=NodeType(source_type),
+                name=name,
+                receiver=receiver,
+            )
+            for source_id, source_type, name, receiver in calls
+        ],
+    )
+
+
+def rebase_parsed_data(compact: CompactParsedData, file_path: str) -> CompactParsedData:
+    """
+    Moves a compact parse result to another file path.
+
+    Node IDs are derived from the file path, so a result cached for one path
+    can be reused for identical content at another by re-prefixing them.
+    """
+    old_path = compact[0]
+    if old_path == file_path:
+        return compact
+
+    def rebase(node_id: str) -> str:
+        if node_id == old_path or node_id.startswith(f"{old_path}::"):
+            return file_path + node_id[len(old_path) :]
+        return node_id
+
+    _, nodes, edges, imports, calls = compact
+    return (
+        file_path,
+        [
+            (
+                rebase(node_id),
+                node_type,
+                # File nodes also record their path as a property.
+                (
+                    {**properties, "path": file_path}
+                    if node_id == old_path and "path" in properties
+                    else properties
+                ),
+            )
+            for node_id, node_type, properties in nodes
+        ],
+        [
+            (rebase(source_id), rebase(target_id), *rest)
+            for source_id, target_id, *rest in edges
+        ],
+        imports,
+        [(rebase(source_id), *rest) for source_id, *rest in calls],
+    )
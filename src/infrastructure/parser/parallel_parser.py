@@ -0,0 +1,159 @@
+"""
+This module provides a ParallelCodeParser that fans parsing out to a pool of
+worker processes, each holding its own tree-sitter parser.
+"""
+
+import asyncio
+import os
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from src.domain.entities.graph_entities import ParsedData
+from src.infrastructure.parser.code_parser import CodeParser
+from src.infrastructure.parser.compact import (
+    CompactParsedData,
+    decode_parsed_data,
+    encode_parsed_data,
+)
+from src.infrastructure.parser.parse_cache import ParseCache
+
+# --- Worker process state ---
+# Each worker builds its own CodeParser once; tree-sitter parsers cannot be
+# shared across processes.
+_worker_parser: CodeParser | None = None
+
+
+def _init_worker(language: str) -> None:
+    """Initializes the per-process CodeParser."""
+    global _worker_parser
+    _worker_parser = CodeParser(language=language)
+
+
+def _parse_group(files: list[tuple[str, str]]) -> list[CompactParsedData]:
+    """Parses a group of files inside a worker process."""
+    if _worker_parser is None:
+        raise RuntimeError("Worker process was not initialized with a CodeParser.")
+    return [
+        encode_parsed_data(_worker_parser.parse(file_path, content))
+        for file_path, content in files
+    ]
+
+
+class ParallelCodeParser:
+    """
+    Parses files in a process pool and streams ParsedData back as it completes.
+
+    Files are sent to workers in groups of ``files_per_task`` to amortize
+    inter-process overhead, and at most ``max_pending_tasks`` groups are in
+    flight at once so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        language: str = "python",
+        max_workers: int | None = None,
+        files_per_task: int = 16,
+        max_pending_tasks: int | None = None,
+        cache: ParseCache | None = None,
+    ):
+        """
+        Initializes the parser and starts the worker pool.
+
+        Args:
+            language: The language of the files to parse.
+            max_workers: The number of worker processes; defaults to the CPU count.
+            files_per_task: How many files are sent to a worker per task.
+            max_pending_tasks: How many tasks may be in flight; defaults to
+                twice the number of workers.
+            cache: An optional cache of parse results used by ``parse_stream``.
+        """
+        self.language = language
+        self.cache = cache
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.files_per_task = files_per_task
+        self.max_pending_tasks = max_pending_tasks or 2 * self.max_workers
+        self._executor: Executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(language,),
+        )
+
+    def close(self) -> None:
+        """Shuts down the worker pool."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def parse(self, file_path: str, content: str) -> ParsedData:
+        """
+        Parses a single file in the pool and waits for the result.
+        """
+        compact = self._executor.submit(_parse_group, [(file_path, content)])
+        return decode_parsed_data(compact.result()[0])
+
+    async def parse_stream(
+        self, files: Iterable[tuple[str, str]]
+    ) -> AsyncIterator[tuple[str, str, ParsedData]]:
+        """
+        Parses files in the pool, yielding results in completion order.
+
+        Files whose content is in the cache are yielded straight away without
+        being sent to a worker; the results of the others are cached as they
+        arrive.
+
+        Args:
+            files: An iterable of (file_path, content) pairs. It is consumed
+                lazily, only as fast as workers free up.
+
+        Yields:
+            Tuples of (file_path, content, ParsedData).
+        """
+        loop = asyncio.get_running_loop()
+        in_flight: dict[asyncio.Future[list[CompactParsedData]], list[str]] = {}
+
+        def submit(group: list[tuple[str, str]]) -> None:
+            future = loop.run_in_executor(self._executor, _parse_group, group)
+            in_flight[future] = [content for _, content in group]
+
+        def cached(file_path: str, content: str) -> CompactParsedData | None:
+            if self.cache is None:
+                return None
+            return self.cache.get(file_path, self.cache.hash_content(content))
+
+        async def drain(limit: int) -> AsyncIterator[tuple[str, str, ParsedData]]:
+            # Hand back whatever has already finished, then block only while
+            # more than ``limit`` groups are still in flight.
+            while in_flight:
+                done = {future for future in in_flight if future.done()}
+                if not done:
+                    if len(in_flight) <= limit:
+                        return
+                    done, _ = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                for future in done:
+                    contents = in_flight.pop(future)
+                    for compact, content in zip(future.result(), contents, strict=True):
+                        if self.cache is not None:
+                            self.cache.put(self.cache.hash_content(content), compact)
+                        yield compact[0], content, decode_parsed_data(compact)
+
+        try:
+            group: list[tuple[str, str]] = []
+            for item in files:
+                compact = cached(*item)
+                if compact is not None:
+                    yield item[0], item[1], decode_parsed_data(compact)
+                    continue
+                group.append(item)
+                if len(group) < self.files_per_task:
+                    continue
+                submit(group)
+                group = []
+                async for result in drain(self.max_pending_tasks - 1):
+                    yield result
+            if group:
+                submit(group)
+            async for result in drain(0):
+                yield result
+        finally:
+            for future in in_flight:
+                future.cancel()
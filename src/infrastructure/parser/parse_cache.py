@@ -0,0 +1,82 @@
+"""
+This module provides a ParseCache that persists parse results on local disk so
+that unchanged files do not have to be parsed again.
+"""
+
+import marshal
+import os
+import zlib
+
+from src.infrastructure.index_manifest import IndexManifest
+from src.infrastructure.parser.compact import (
+    PARSER_VERSION,
+    CompactParsedData,
+    rebase_parsed_data,
+)
+
+# marshal's format is stable within a version number, unlike its default.
+_MARSHAL_VERSION = 4
+
+
+class ParseCache:
+    """
+    A content-addressed, on-disk cache of compact parse results.
+
+    Entries are keyed by the SHA-256 hash of the file content and live under a
+    directory named after the language and ``PARSER_VERSION``, so a parser
+    change never reads stale results. Each entry is the compact tuple form of
+    ParsedData, serialized with ``marshal`` and compressed with ``zlib``, which
+    is both smaller and much faster to load than JSON or Pydantic models.
+
+    Identical content at different paths shares one entry; results are
+    re-prefixed with the requested path on the way out.
+    """
+
+    def __init__(self, directory: str = "./data/parse_cache", language: str = "python"):
+        """
+        Initializes the cache.
+
+        Args:
+            directory: The root directory of the cache. It is created lazily.
+            language: The language of the cached parse results.
+        """
+        self.directory = os.path.join(directory, f"{language}-v{PARSER_VERSION}")
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        """Returns the key under which a file's parse result is cached."""
+        return IndexManifest.hash_content(content)
+
+    def get(self, file_path: str, content_hash: str) -> CompactParsedData | None:
+        """
+        Returns the cached parse result for a file's content, if present.
+
+        Args:
+            file_path: The path the result is for.
+            content_hash: The hash of the file content (see ``hash_content``).
+        """
+        try:
+            with open(self._entry_path(content_hash), "rb") as f:
+                compact = marshal.loads(zlib.decompress(f.read()))
+        except (OSError, EOFError, ValueError, TypeError, zlib.error):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return rebase_parsed_data(compact, file_path)
+
+    def put(self, content_hash: str, compact: CompactParsedData) -> None:
+        """
+        Atomically stores the parse result for a file's content.
+        """
+        entry_path = self._entry_path(content_hash)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(marshal.dumps(compact, _MARSHAL_VERSION), 1))
+        os.replace(tmp_path, entry_path)
+
+    def _entry_path(self, content_hash: str) -> str:
+        # Entries are spread over 256 subdirectories to keep directories small.
+        return os.path.join(self.directory, content_hash[:2], content_hash[2:])
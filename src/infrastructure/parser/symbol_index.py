@@ -0,0 +1,111 @@
+"""
+This module provides an in-memory index of class and function names to their
+definition sites, for answering "where is X defined?" without a search.
+"""
+
+from bisect import bisect_left
+from typing import NamedTuple
+
+from src.domain.entities.graph_entities import NodeType, SymbolDefinition
+from src.infrastructure.index_manifest import IndexManifest
+
+
+class SymbolLocation(NamedTuple):
+    """A class or function and the file and lines it is defined at."""
+
+    name: str
+    type: NodeType
+    file_path: str
+    start_line: int
+    end_line: int
+    # The file's path relative to the indexed root, if it was recorded.
+    relative_path: str | None = None
+
+
+class SymbolIndex:
+    """
+    Maps lowercased symbol names to their definitions.
+
+    Exact lookups are a dictionary access. Prefix lookups bisect a sorted list
+    of the distinct names, so both are independent of the number of files
+    and take microseconds. The index is built from the definitions recorded in
+    the IndexManifest, which come from the parser's output.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty index."""
+        self._locations: dict[str, list[SymbolLocation]] = {}
+        self._sorted_names: list[str] | None = []
+
+    @classmethod
+    def from_manifest(cls, manifest: IndexManifest) -> "SymbolIndex":
+        """Builds an index of every definition recorded in a manifest."""
+        index = cls()
+        for file_path in sorted(manifest.file_paths()):
+            entry = manifest.get(file_path)
+            if entry is not None:
+                index.add(file_path, entry.definitions, entry.relative_path)
+        return index
+
+    def __len__(self) -> int:
+        """Returns the number of distinct (lowercased) names."""
+        return len(self._locations)
+
+    def add(
+        self,
+        file_path: str,
+        definitions: list[SymbolDefinition],
+        relative_path: str | None = None,
+    ) -> None:
+        """Adds the definitions of one file."""
+        for definition in definitions:
+            self._locations.setdefault(definition.name.lower(), []).append(
+                SymbolLocation(
+                    definition.name,
+                    definition.type,
+                    file_path,
+                    definition.start_line,
+                    definition.end_line,
+                    relative_path,
+                )
+            )
+        self._sorted_names = None
+
+    def lookup(
+        self, name: str, node_type: NodeType | None = None
+    ) -> list[SymbolLocation]:
+        """
+        Returns the definitions of a name, ignoring case.
+
+        Definitions whose name matches the case of ``name`` exactly come first.
+        """
+        locations = [
+            location
+            for location in self._locations.get(name.lower(), [])
+            if node_type is None or location.type == node_type
+        ]
+        return sorted(locations, key=lambda location: location.name != name)
+
+    def prefix(
+        self, prefix: str, node_type: NodeType | None = None, limit: int = 10
+    ) -> list[SymbolLocation]:
+        """
+        Returns up to ``limit`` definitions whose name starts with ``prefix``,
+        ignoring case, in name order.
+        """
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._locations)
+        prefix = prefix.lower()
+        results: list[SymbolLocation] = []
+        position = bisect_left(self._sorted_names, prefix)
+        while position < len(self._sorted_names) and len(results) < limit:
+            name = self._sorted_names[position]
+            if not name.startswith(prefix):
+                break
+            results.extend(
+                location
+                for location in self._locations[name]
+                if node_type is None or location.type == node_type
+            )
+            position += 1
+        return results[:limit]
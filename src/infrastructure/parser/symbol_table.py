@@ -0,0 +1,343 @@
+"""
+This module provides a project-wide symbol table that resolves the imports and
+calls CodeParser could not resolve within a single file.
+"""
+
+import os
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from src.domain.entities.graph_entities import (
+    BaseEdge,
+    CallReference,
+    CallsEdge,
+    EdgeType,
+    ImportReference,
+    ImportsEdge,
+    NodeType,
+    ParsedData,
+)
+
+
+class _FileSymbols(NamedTuple):
+    """What the table knows about a single file."""
+
+    module: str
+    is_package: bool
+    symbol_ids: list[str]
+    imports: list[ImportReference]
+    calls: list[CallReference]
+    # The module names its imports look up; see ``SymbolTable.importers``.
+    imported_modules: set[str]
+
+
+def module_name(relative_path: str) -> tuple[str, bool]:
+    """
+    Returns the dotted module name of a path relative to the project root, and
+    whether the file is a package (``__init__.py``).
+    """
+    stem = os.path.splitext(os.path.normpath(relative_path))[0]
+    parts = [part for part in stem.split(os.sep) if part and part != "."]
+    is_package = bool(parts) and parts[-1] == "__init__"
+    if is_package:
+        parts.pop()
+    return ".".join(parts), is_package
+
+
+class SymbolTable:
+    """
+    Maps module paths to files and qualified names to class and function IDs.
+
+    The table is filled with one ``add_parsed_data``/``add_file`` call per
+    file, after which ``resolve`` turns a file's import and call references
+    into edges using dictionary lookups only. References that do not resolve
+    to a known file or symbol produce no edge.
+
+    Modules are named after their path relative to ``root``. A module that is
+    imported by a shorter name (e.g. with a ``src/`` layout) is still found if
+    exactly one file's module name ends with it.
+
+    The table also records which module names each file's imports look up, so
+    that after some files change, ``importers`` finds the only other files
+    whose resolution can change with them.
+    """
+
+    def __init__(self, root: str):
+        """
+        Initializes an empty table.
+
+        Args:
+            root: The project root that module names are relative to.
+        """
+        self.root = root
+        self._files: dict[str, _FileSymbols] = {}
+        self._modules: dict[str, str] = {}
+        # Proper dotted suffix of a module name -> files with that suffix.
+        self._module_suffixes: dict[str, set[str]] = defaultdict(set)
+        self._symbols: dict[str, NodeType] = {}
+        # Module name looked up by an import -> files whose imports look it up.
+        self._importers: dict[str, set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        """Returns the number of files in the table."""
+        return len(self._files)
+
+    def file_paths(self) -> list[str]:
+        """Returns the paths of all files in the table."""
+        return list(self._files)
+
+    def add_parsed_data(self, parsed_data: ParsedData) -> None:
+        """
+        Adds (or replaces) a file from its parse result.
+        """
+        self.add_file(
+            parsed_data.file_path,
+            {
+                node.id: node.type
+                for node in parsed_data.nodes
+                if node.type in (NodeType.CLASS, NodeType.FUNCTION)
+            },
+            parsed_data.imports,
+            parsed_data.calls,
+        )
+
+    def add_file(
+        self,
+        file_path: str,
+        symbols: dict[str, NodeType],
+        imports: list[ImportReference],
+        calls: list[CallReference],
+    ) -> None:
+        """
+        Adds (or replaces) a file.
+
+        Args:
+            file_path: The path (and file node ID) of the file.
+            symbols: The IDs and types of the classes and functions it defines.
+            imports: The file's import references.
+            calls: The file's unresolved call references.
+        """
+        self.remove_file(file_path)
+
+        module, is_package = module_name(os.path.relpath(file_path, self.root))
+        package = module if is_package else module.rpartition(".")[0]
+        imported_modules = self._imported_modules(imports, package)
+        self._files[file_path] = _FileSymbols(
+            module, is_package, list(symbols), imports, calls, imported_modules
+        )
+        for imported_module in imported_modules:
+            self._importers[imported_module].add(file_path)
+        if module:
+            self._modules[module] = file_path
+            parts = module.split(".")
+            for i in range(1, len(parts)):
+                self._module_suffixes[".".join(parts[i:])].add(file_path)
+        self._symbols.update(symbols)
+
+    def remove_file(self, file_path: str) -> None:
+        """
+        Removes a file and its symbols, if present.
+        """
+        entry = self._files.pop(file_path, None)
+        if entry is None:
+            return
+        if self._modules.get(entry.module) == file_path:
+            del self._modules[entry.module]
+        parts = entry.module.split(".")
+        for i in range(1, len(parts)):
+            suffix = ".".join(parts[i:])
+            files = self._module_suffixes.get(suffix)
+            if files is not None:
+                files.discard(file_path)
+                if not files:
+                    del self._module_suffixes[suffix]
+        for symbol_id in entry.symbol_ids:
+            self._symbols.pop(symbol_id, None)
+        for imported_module in entry.imported_modules:
+            importers = self._importers.get(imported_module)
+            if importers is not None:
+                importers.discard(file_path)
+                if not importers:
+                    del self._importers[imported_module]
+
+    def module_names(self, file_path: str) -> set[str]:
+        """
+        Returns the names a file can be imported by: its module name and every
+        proper dotted suffix of it. The file need not be in the table.
+        """
+        module, _ = module_name(os.path.relpath(file_path, self.root))
+        if not module:
+            return set()
+        parts = module.split(".")
+        return {".".join(parts[i:]) for i in range(len(parts))}
+
+    def importers(self, modules: Iterable[str]) -> set[str]:
+        """
+        Returns the files whose imports look up any of the given module names.
+
+        These are the files whose ``resolve`` result can change when a file
+        that can be imported by one of the names is added, changed or removed.
+        """
+        return {
+            file_path
+            for module in modules
+            for file_path in self._importers.get(module, ())
+        }
+
+    def resolve_module(self, module: str) -> str | None:
+        """
+        Returns the file that defines a dotted module name, if it is known.
+        """
+        file_path = self._modules.get(module)
+        if file_path is not None:
+            return file_path
+        candidates = self._module_suffixes.get(module)
+        if candidates and len(candidates) == 1:
+            return next(iter(candidates))
+        return None
+
+    def resolve(self, file_path: str) -> list[BaseEdge]:
+        """
+        Resolves a file's imports and calls into edges to other files.
+
+        Imports become IMPORTS edges to the imported module's file or, for
+        ``from`` imports of a class or function, to that symbol. Calls through
+        an imported name (``helper()``, ``module.helper()`` or
+        ``Imported.method()``) become CALLS edges to the function.
+
+        Returns:
+            The resolved edges, without duplicates.
+        """
+        entry = self._files.get(file_path)
+        if entry is None:
+            return []
+
+        edges: list[BaseEdge] = []
+        seen: set[tuple[EdgeType, str, str]] = set()
+
+        def add(edge: BaseEdge) -> None:
+            key = (edge.type, edge.source_id, edge.target_id)
+            if key not in seen and edge.source_id != edge.target_id:
+                seen.add(key)
+                edges.append(edge)
+
+        # Local name -> the module file or symbol ID it is bound to.
+        bindings: dict[str, str] = {}
+        wildcard_modules: list[str] = []
+        package = entry.module if entry.is_package else entry.module.rpartition(".")[0]
+
+        for reference in entry.imports:
+            base = self._absolute_module(reference, package)
+            if base is None:
+                continue
+
+            if reference.name is None or reference.name == "*":
+                target = self.resolve_module(base)
+                if target is None:
+                    continue
+                add(self._import_edge(file_path, target, NodeType.FILE))
+                if reference.name == "*":
+                    wildcard_modules.append(target)
+                else:
+                    bindings[reference.local_name] = target
+                continue
+
+            submodule = self.resolve_module(
+                f"{base}.{reference.name}" if base else reference.name
+            )
+            if submodule is not None:
+                add(self._import_edge(file_path, submodule, NodeType.FILE))
+                bindings[reference.local_name] = submodule
+                continue
+
+            target = self.resolve_module(base) if base else None
+            if target is None:
+                continue
+            symbol_id = f"{target}::{reference.name}"
+            symbol_type = self._symbols.get(symbol_id)
+            if symbol_type is None:
+                # Not a class or function, e.g. a constant: link the module.
+                add(self._import_edge(file_path, target, NodeType.FILE))
+                continue
+            add(self._import_edge(file_path, symbol_id, symbol_type))
+            bindings[reference.local_name] = symbol_id
+
+        for call in entry.calls:
+            target_id = self._resolve_call(call, bindings, wildcard_modules)
+            if target_id is not None:
+                add(
+                    CallsEdge(
+                        source_id=call.source_id,
+                        target_id=target_id,
+                        source_type=call.source_type,
+                        target_type=NodeType.FUNCTION,
+                    )
+                )
+        return edges
+
+    def _imported_modules(
+        self, imports: list[ImportReference], package: str
+    ) -> set[str]:
+        """Returns the module names ``resolve`` looks up for these imports."""
+        modules: set[str] = set()
+        for reference in imports:
+            base = self._absolute_module(reference, package)
+            if base is None:
+                continue
+            if base:
+                modules.add(base)
+            if reference.name is not None and reference.name != "*":
+                modules.add(f"{base}.{reference.name}" if base else reference.name)
+        return modules
+
+    def _absolute_module(self, reference: ImportReference, package: str) -> str | None:
+        """Returns the absolute module an import refers to."""
+        if not reference.level:
+            return reference.module
+        parts = package.split(".") if package else []
+        if reference.level - 1 > len(parts):
+            return None
+        parts = parts[: len(parts) - (reference.level - 1)]
+        if reference.module:
+            parts.append(reference.module)
+        return ".".join(parts)
+
+    def _resolve_call(
+        self,
+        call: CallReference,
+        bindings: dict[str, str],
+        wildcard_modules: list[str],
+    ) -> str | None:
+        """Returns the function a call refers to, if it can be resolved."""
+        if call.receiver is None:
+            candidates = [bindings.get(call.name)] + [
+                f"{module}::{call.name}" for module in wildcard_modules
+            ]
+        else:
+            bound = bindings.get(call.receiver)
+            if bound is None:
+                return None
+            # A module, or a class whose methods live in the same file.
+            owner = bound if bound in self._files else bound.split("::", 1)[0]
+            if bound not in self._files and self._symbols.get(bound) != (
+                NodeType.CLASS
+            ):
+                return None
+            candidates = [f"{owner}::{call.name}"]
+
+        for candidate in candidates:
+            if candidate and self._symbols.get(candidate) == NodeType.FUNCTION:
+                return candidate
+        return None
+
+    @staticmethod
+    def _import_edge(
+        file_path: str, target_id: str, target_type: NodeType
+    ) -> ImportsEdge:
+        return ImportsEdge(
+            source_id=file_path,
+            target_id=target_id,
+            source_type=NodeType.FILE,
+            target_type=target_type,
+        )
@@ -2,11 +2,22 @@
 This module provides text splitting functionalities, optimized for source code.
 """
 
-from typing import Any
+from bisect import bisect_left
+from typing import Any, NamedTuple
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 
-from src.domain.entities.code_chunk import CodeChunk
+from src.domain.entities.code_chunk import ChunkRecord, CodeChunk
+from src.domain.entities.graph_entities import NodeType, ParsedData
+
+
+class _SymbolSpan(NamedTuple):
+    """The line range of a class or function and the symbols nested in it."""
+
+    start_line: int
+    end_line: int
+    symbol_id: str
+    children: list["_SymbolSpan"]
 
 
 class CodeTextSplitter:
@@ -22,6 +33,8 @@ class CodeTextSplitter:
             chunk_size: The maximum size of a chunk (in characters).
             chunk_overlap: The number of characters to overlap between chunks.
         """
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
         self.splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
@@ -31,42 +44,251 @@ class CodeTextSplitter:
             length_function=len,
         )
 
-    def split(self, file_path: str, content: str) -> list[CodeChunk]:
+    def split(self, file_path: str, content: str) -> list[ChunkRecord]:
         """
-        Splits a file's content into a list of CodeChunk objects.
+        Splits a file's content into a list of chunk records.
 
         Args:
             file_path: The path to the source file.
             content: The content of the file.
 
         Returns:
-            A list of CodeChunk objects.
+            A list of ChunkRecord objects.
+        """
+        return self._split_text(file_path, content, first_line=1, symbol_id=None)
+
+    def split_by_symbols(
+        self, file_path: str, content: str, parsed_data: ParsedData
+    ) -> list[ChunkRecord]:
+        """
+        Splits a file on the class and function boundaries found by CodeParser.
+
+        Consecutive small symbols (and the code between them) are packed into
+        one chunk up to ``chunk_size``. A class that does not fit is split
+        between its methods, and a function that does not fit is sub-split
+        with the character splitter. Each chunk records the ID of the symbol
+        it belongs to in ``metadata["symbol_id"]`` and its NodeType value
+        (``File``, ``Class`` or ``Function``) in ``metadata["symbol_type"]``; chunks
+        spanning several symbols belong to the enclosing class or file.
+
+        Falls back to ``split`` when the parsed data carries no line ranges.
+
+        Args:
+            file_path: The path to the source file.
+            content: The content of the file.
+            parsed_data: The result of parsing ``content`` with CodeParser.
+
+        Returns:
+            A list of ChunkRecord objects.
+        """
+        spans = sorted(
+            (
+                (node.properties["start_line"], node.properties["end_line"], node.id)
+                for node in parsed_data.nodes
+                if node.type in (NodeType.CLASS, NodeType.FUNCTION)
+                and "start_line" in node.properties
+            ),
+            key=lambda span: (span[0], -span[1]),
+        )
+        if not spans:
+            return self.split(file_path, content)
+
+        # Nest the spans by containment; definitions never partially overlap.
+        roots: list[_SymbolSpan] = []
+        open_spans: list[_SymbolSpan] = []
+        for start_line, end_line, symbol_id in spans:
+            span = _SymbolSpan(start_line, end_line, symbol_id, [])
+            while open_spans and open_spans[-1].end_line < start_line:
+                open_spans.pop()
+            (open_spans[-1].children if open_spans else roots).append(span)
+            open_spans.append(span)
+
+        lines = content.split("\n")
+        # line_starts[i] is the offset of line i + 1, so any line range's length
+        # is a subtraction away.
+        line_starts = [0]
+        for line in lines:
+            line_starts.append(line_starts[-1] + len(line) + 1)
+
+        chunks: list[ChunkRecord] = []
+        self._split_region(
+            file_path,
+            lines,
+            line_starts,
+            _SymbolSpan(1, len(lines), parsed_data.file_path, roots),
+            chunks,
+        )
+
+        symbol_types = {
+            node.id: node.type.value
+            for node in parsed_data.nodes
+            if node.type in (NodeType.CLASS, NodeType.FUNCTION)
+        }
+        for chunk in chunks:
+            symbol_type = symbol_types.get(chunk.metadata.get("symbol_id", ""))
+            if symbol_type:
+                chunk.metadata["symbol_type"] = symbol_type
+        return chunks
+
+    def _split_region(
+        self,
+        file_path: str,
+        lines: list[str],
+        line_starts: list[int],
+        region: _SymbolSpan,
+        chunks: list[ChunkRecord],
+    ) -> None:
+        """Packs the symbols and gaps of a region into chunks of bounded size."""
+        # Alternate the code between children ("gaps") with the children.
+        segments: list[tuple[int, int, _SymbolSpan | None]] = []
+        cursor = region.start_line
+        for span in region.children:
+            if cursor < span.start_line:
+                segments.append((cursor, span.start_line - 1, None))
+            segments.append((span.start_line, span.end_line, span))
+            cursor = span.end_line + 1
+        if cursor <= region.end_line:
+            segments.append((cursor, region.end_line, None))
+
+        pack_start = pack_end = 0
+        pack_symbols: list[str] = []
+
+        def flush() -> None:
+            nonlocal pack_start
+            if pack_start:
+                symbol_id = pack_symbols[0] if len(pack_symbols) == 1 else None
+                self._emit_lines(
+                    file_path,
+                    lines,
+                    pack_start,
+                    pack_end,
+                    symbol_id or region.symbol_id,
+                    chunks,
+                )
+            pack_start = 0
+            pack_symbols.clear()
+
+        for start_line, end_line, child in segments:
+            length = line_starts[end_line] - line_starts[start_line - 1]
+            if length > self.chunk_size:
+                flush()
+                if child and child.children:
+                    self._split_region(file_path, lines, line_starts, child, chunks)
+                else:
+                    text = "\n".join(lines[start_line - 1 : end_line])
+                    symbol_id = child.symbol_id if child else region.symbol_id
+                    chunks.extend(
+                        self._split_text(file_path, text, start_line, symbol_id)
+                    )
+                continue
+
+            if pack_start and line_starts[end_line] - line_starts[pack_start - 1] > (
+                self.chunk_size
+            ):
+                flush()
+            if not pack_start:
+                pack_start = start_line
+            pack_end = end_line
+            if child:
+                pack_symbols.append(child.symbol_id)
+        flush()
+
+    def _emit_lines(
+        self,
+        file_path: str,
+        lines: list[str],
+        start_line: int,
+        end_line: int,
+        symbol_id: str,
+        chunks: list[ChunkRecord],
+    ) -> None:
+        """Appends a chunk for a line range, trimming surrounding blank lines."""
+        while start_line <= end_line and not lines[start_line - 1].strip():
+            start_line += 1
+        while end_line >= start_line and not lines[end_line - 1].strip():
+            end_line -= 1
+        if start_line > end_line:
+            return
+
+        text = "\n".join(lines[start_line - 1 : end_line]).rstrip()
+        chunks.append(
+            self._build_chunk(file_path, text, start_line, end_line, symbol_id)
+        )
+
+    def _split_text(
+        self, file_path: str, content: str, first_line: int, symbol_id: str | None
+    ) -> list[ChunkRecord]:
+        """
+        Splits text with the character splitter.
+
+        Args:
+            file_path: The path to the source file.
+            content: The text to split.
+            first_line: The line number of the first line of ``content``.
+            symbol_id: The symbol the chunks belong to, if any.
         """
         text_chunks = self.splitter.split_text(content)
-        code_chunks: list[CodeChunk] = []
+        code_chunks: list[ChunkRecord] = []
 
+        # Offsets of every newline, so the line of any character offset is a
+        # binary search away.
+        newline_offsets = self._newline_offsets(content)
+
+        # Chunks are emitted in order and overlap the previous chunk by at most
+        # ``chunk_overlap`` characters, so each one is searched for just behind
+        # where the previous one ended. This keeps the total cost linear and
+        # assigns repeated chunks to their own occurrence.
+        search_from = 0
         for text_chunk in text_chunks:
-            # This is a simplification. A more robust solution would find the
-            # exact start and end lines of the chunk in the original content.
-            # For now, we'll use placeholder line numbers.
-            start_line = content.count("\n", 0, content.find(text_chunk)) + 1
-            end_line = start_line + text_chunk.count("\n")
+            start = content.find(text_chunk, search_from)
+            if start == -1:
+                # Not expected from the splitter; fall back to a full search.
+                start = max(content.find(text_chunk), 0)
+            search_from = max(start + 1, start + len(text_chunk) - self.chunk_overlap)
 
-            chunk_id = CodeChunk.generate_id(file_path, text_chunk)
-            metadata: dict[str, Any] = {
-                "file_path": file_path,
-                "start_line": start_line,
-                "end_line": end_line,
-            }
-
-            code_chunk = CodeChunk(
-                id=chunk_id,
-                file_path=file_path,
-                content=text_chunk,
-                start_line=start_line,
-                end_line=end_line,
-                metadata=metadata,
+            start_line = first_line + bisect_left(newline_offsets, start)
+            end_line = start_line + text_chunk.count("\n")
+            code_chunks.append(
+                self._build_chunk(
+                    file_path, text_chunk, start_line, end_line, symbol_id
+                )
             )
-            code_chunks.append(code_chunk)
 
         return code_chunks
+
+    @staticmethod
+    def _build_chunk(
+        file_path: str,
+        content: str,
+        start_line: int,
+        end_line: int,
+        symbol_id: str | None,
+    ) -> ChunkRecord:
+        """Creates a chunk record and its metadata."""
+        metadata: dict[str, Any] = {
+            "file_path": file_path,
+            "start_line": start_line,
+            "end_line": end_line,
+            "symbol_type": NodeType.FILE.value,
+        }
+        if symbol_id:
+            metadata["symbol_id"] = symbol_id
+
+        return ChunkRecord(
+            id=CodeChunk.generate_id(file_path, content),
+            file_path=file_path,
+            content=content,
+            start_line=start_line,
+            end_line=end_line,
+            metadata=metadata,
+        )
+
+    @staticmethod
+    def _newline_offsets(content: str) -> list[int]:
+        """Returns the character offset of every newline in ``content``."""
+        offsets: list[int] = []
+        index = content.find("\n")
+        while index != -1:
+            offsets.append(index)
+            index = content.find("\n", index + 1)
+        return offsets
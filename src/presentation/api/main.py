@@ -9,7 +9,9 @@ from pydantic import BaseModel
 
 from src.application.use_cases.create_issue_from_text import CreateIssueFromTextUseCase
 from src.domain.services.github_service import GitHubServiceError
-from src.infrastructure.database.chroma_client import ChromaDBClient
+from src.infrastructure.database.code_repository_factory import (
+    create_code_repository,
+)
 from src.infrastructure.github.pygithub_client import PyGitHubClient
 from src.infrastructure.llm.openai_client import OpenAIClient
 
@@ -37,7 +39,7 @@ def get_create_issue_use_case() -> CreateIssueFromTextUseCase:
     """
     llm = ChatOpenAI(model="gpt-4o", temperature=0)
     embedding_service = OpenAIClient()
-    code_repository = ChromaDBClient()
+    code_repository = create_code_repository()
     github_service = PyGitHubClient()
     return CreateIssueFromTextUseCase(
         llm=llm,
@@ -13,9 +13,53 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.
 
 from src.application.use_cases.answer_question import AnswerQuestionUseCase
 from src.application.use_cases.graph_query import GraphQueryUseCase
-from src.infrastructure.database.chroma_client import ChromaDBClient
+from src.domain.entities.graph_entities import NodeType
+from src.domain.entities.search_filters import LANGUAGES_BY_EXTENSION, SearchFilters
+from src.domain.repositories.code_repository import CodeRepository
+from src.domain.repositories.graph_repository import GraphRepository
+from src.infrastructure.database.code_repository_factory import (
+    create_code_repository,
+)
 from src.infrastructure.database.graph_db import Neo4jService
+from src.infrastructure.database.memory_graph import InMemoryGraphRepository
+from src.infrastructure.index_manifest import IndexManifest
 from src.infrastructure.llm.openai_client import OpenAIClient
+from src.infrastructure.parser.symbol_index import SymbolIndex
+
+
+@st.cache_resource
+def load_symbol_index(manifest_path: str) -> SymbolIndex | None:
+    """
+    Builds the symbol index once per manifest, not on every rerun.
+    """
+    if not os.path.exists(manifest_path):
+        return None
+    return SymbolIndex.from_manifest(IndexManifest(manifest_path))
+
+
+@st.cache_resource
+def load_code_repository() -> CodeRepository:
+    """
+    Opens the vector store once, not on every rerun, so that its keyword index
+    is built by the first question and reused by every later one.
+    """
+    return create_code_repository()
+
+
+@st.cache_resource
+def load_memory_graph(snapshot_path: str) -> InMemoryGraphRepository:
+    """
+    Loads the graph snapshot once per path, not on every rerun.
+    """
+    return InMemoryGraphRepository(snapshot_path)
+
+
+@st.cache_resource
+def load_neo4j_service(uri: str, user: str, password: str) -> Neo4jService:
+    """
+    Connects to Neo4j, and ensures its schema, once rather than on every rerun.
+    """
+    return Neo4jService(uri=uri, user=user, password=password)
 
 
 def setup_dependencies() -> AnswerQuestionUseCase:
@@ -33,23 +77,34 @@ def setup_dependencies() -> AnswerQuestionUseCase:
         st.stop()
 
     embedding_service = OpenAIClient()
-    code_repository = ChromaDBClient()
+    code_repository = load_code_repository()
     llm_client = OpenAIClient()
 
-    # Setup Neo4j connection
-    neo4j_uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-    neo4j_user = os.getenv("NEO4J_USER", "neo4j")
-    neo4j_password = os.getenv("NEO4J_PASSWORD", "password123")
-    graph_db_service = Neo4jService(
-        uri=neo4j_uri, user=neo4j_user, password=neo4j_password
+    # Setup the knowledge graph
+    graph_repository: GraphRepository
+    if os.getenv("GRAPH_BACKEND", "neo4j") == "memory":
+        graph_repository = load_memory_graph(
+            os.getenv("GRAPH_SNAPSHOT_PATH", "./data/graph.snapshot")
+        )
+    else:
+        neo4j_uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+        neo4j_user = os.getenv("NEO4J_USER", "neo4j")
+        neo4j_password = os.getenv("NEO4J_PASSWORD", "password123")
+        graph_repository = load_neo4j_service(neo4j_uri, neo4j_user, neo4j_password)
+    graph_query_use_case = GraphQueryUseCase(graph_repository)
+
+    # Definition lookups are answered from the symbols recorded at indexing.
+    symbol_index = load_symbol_index(
+        os.getenv("MANIFEST_PATH", "./data/index_manifest.json")
     )
-    graph_query_use_case = GraphQueryUseCase(graph_db_service)
 
     answer_question_use_case = AnswerQuestionUseCase(
         embedding_service=embedding_service,
         code_repository=code_repository,
         llm_client=llm_client,
         graph_query_use_case=graph_query_use_case,
+        symbol_index=symbol_index,
+        context_token_budget=int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000")),
     )
     return answer_question_use_case
 
@@ -71,6 +126,21 @@ def main() -> None:
         st.error(e)
         st.stop()
 
+    with st.sidebar:
+        st.header("Search scope")
+        path_prefix = st.text_input("Path prefix", placeholder="e.g. services/billing")
+        languages = st.multiselect(
+            "Languages", sorted(set(LANGUAGES_BY_EXTENSION.values()))
+        )
+        symbol_types = st.multiselect(
+            "Symbol types", [node_type.value for node_type in NodeType]
+        )
+    filters = SearchFilters(
+        path_prefix=path_prefix or None,
+        languages=languages,
+        symbol_types=symbol_types,
+    )
+
     # Initialize chat history
     if "messages" not in st.session_state:
         st.session_state.messages = []
@@ -88,7 +158,7 @@ def main() -> None:
         st.session_state.messages.append({"role": "user", "content": prompt})
 
         with st.spinner("Thinking..."):
-            response = answer_question_use_case.execute(prompt)
+            response = answer_question_use_case.execute(prompt, filters=filters)
 
             # Display assistant response in chat message container
             with st.chat_message("assistant"):
@@ -43,11 +43,10 @@ def test_indexing_pipeline_creates_nodes_and_relationships(
     )
     assert process.returncode == 0, f"Indexing script failed: {process.stderr}"
 
-    use_case = GraphQueryUseCase(real_neo4j_service._driver)
     query = "MATCH (n) RETURN count(n) as count"
 
     # Act
-    result = use_case.execute_query(query)
+    result = real_neo4j_service.execute_query(query)
 
     # Assert
     # This will fail if the database is empty. Run the indexer first.
@@ -64,7 +63,7 @@ def test_cypher_query_finds_function_callers(
     This is a placeholder and depends on the indexed data.
     """
     # Arrange
-    use_case = GraphQueryUseCase(real_neo4j_service._driver)
+    use_case = GraphQueryUseCase(real_neo4j_service)
 
     # Act
     # Assuming 'parse' is a function in the indexed data
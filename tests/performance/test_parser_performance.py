@@ -0,0 +1,66 @@
+"""
+Performance tests for the CodeParser on synthetic pathological files.
+"""
+
+import os
+import sys
+import time
+
+# Add project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from src.domain.entities.graph_entities import CallsEdge
+from src.infrastructure.parser.code_parser import CodeParser
+
+
+def build_pathological_source(depth: int, calls_per_level: int) -> str:
+    """
+    Builds a file of alternating nested classes and functions, with many calls
+    at every level. This is the worst case for scope resolution that walks up
+    the parent chain for every call.
+    """
+    lines = [f"def target_{i}():\n    pass\n" for i in range(calls_per_level)]
+    indent = ""
+    for level in range(depth):
+        if level % 2 == 0:
+            lines.append(f"{indent}class Scope{level}:")
+        else:
+            lines.append(f"{indent}def scope_{level}():")
+        indent += "    "
+        lines.extend(f"{indent}target_{i}()" for i in range(calls_per_level))
+    return "\n".join(lines) + "\n"
+
+
+def run_parser_performance_test(
+    parser: CodeParser, depth: int, calls_per_level: int, repeats: int = 3
+) -> float:
+    """
+    Parses a synthetic file and reports the best time over several runs.
+    """
+    source = build_pathological_source(depth, calls_per_level)
+    best = float("inf")
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        parsed_data = parser.parse("pathological.py", source)
+        best = min(best, time.perf_counter() - start_time)
+
+    call_edges = sum(isinstance(edge, CallsEdge) for edge in parsed_data.edges)
+    print(
+        f"depth={depth:<4} calls/level={calls_per_level:<5} "
+        f"lines={source.count(chr(10)):<7} call edges={call_edges:<7} "
+        f"best={best * 1000:.1f} ms"
+    )
+    return best
+
+
+if __name__ == "__main__":
+    code_parser = CodeParser()
+
+    print("--- Starting Parser Performance Tests ---")
+
+    # Doubling the size of the file should roughly double the parse time. The
+    # depth stays below what tree-sitter-python's indentation scanner supports.
+    for depth, calls_per_level in [(50, 50), (50, 100), (50, 200), (50, 400)]:
+        run_parser_performance_test(code_parser, depth, calls_per_level)
+
+    print("--- Parser Performance Tests Finished ---")
@@ -9,9 +9,13 @@ import pytest
 
 from src.application.use_cases.answer_question import AnswerQuestionUseCase
 from src.application.use_cases.graph_query import GraphQueryUseCase
+from src.domain.entities.code_chunk import ChunkRecord
+from src.domain.entities.graph_entities import NodeType, SymbolDefinition
+from src.domain.entities.search_filters import SearchFilters
 from src.domain.repositories.code_repository import CodeRepository
 from src.domain.services.embedding_service import EmbeddingService
 from src.infrastructure.llm.openai_client import OpenAIClient
+from src.infrastructure.parser.symbol_index import SymbolIndex
 
 
 @pytest.fixture
@@ -155,3 +159,245 @@ def test_get_optimal_top_k_for_complex_query(
     )
     top_k = answer_question_use_case._get_optimal_top_k(complex_query)
     assert top_k == 10
+
+
+@pytest.mark.unit
+def test_execute_passes_filters_to_vector_search(
+    answer_question_use_case: AnswerQuestionUseCase,
+    mock_embedding_service: MagicMock,
+    mock_code_repository: MagicMock,
+    mock_llm_client: MagicMock,
+) -> None:
+    """Tests that search filters scope the vector search."""
+    mock_llm_client.get_chat_completion.side_effect = [
+        json.dumps({"type": "vector_search", "entity": None, "confidence": 0.95}),
+        "answer",
+    ]
+    mock_embedding_service.get_embedding.return_value = [0.1, 0.2]
+    mock_code_repository.keyword_search.return_value = []
+    mock_code_repository.search.return_value = [
+        ChunkRecord(
+            id="a", file_path="svc/a.py", content="code", start_line=1, end_line=1
+        )
+    ]
+    filters = SearchFilters(path_prefix="svc", languages=["python"])
+
+    answer = answer_question_use_case.execute("What does svc do?", filters=filters)
+
+    assert answer == "answer"
+    mock_code_repository.search.assert_called_once_with(
+        [0.1, 0.2], top_k=5, filters=filters
+    )
+
+
+def _record(chunk_id: str, content: str | None = None) -> ChunkRecord:
+    return ChunkRecord(chunk_id, "a.py", content or chunk_id, 1, 1)
+
+
+@pytest.mark.unit
+def test_retrieve_fuses_vector_and_keyword_rankings(
+    answer_question_use_case: AnswerQuestionUseCase,
+    mock_embedding_service: MagicMock,
+    mock_code_repository: MagicMock,
+) -> None:
+    """Tests that hybrid retrieval ranks chunks by reciprocal rank fusion."""
+    mock_embedding_service.get_embedding.return_value = [0.1]
+    mock_code_repository.search.return_value = [_record("v1"), _record("both")]
+    mock_code_repository.keyword_search.return_value = [
+        _record("both"),
+        _record("k1"),
+    ]
+
+    chunks = answer_question_use_case._retrieve_chunks(
+        "How does indexing work?", top_k=3, filters=None
+    )
+
+    assert [chunk.id for chunk in chunks] == ["both", "v1", "k1"]
+    mock_code_repository.keyword_search.assert_called_once_with(
+        "How does indexing work?", top_k=3, filters=None
+    )
+
+
+@pytest.mark.unit
+def test_identifier_queries_skip_the_embedding(
+    answer_question_use_case: AnswerQuestionUseCase,
+    mock_embedding_service: MagicMock,
+    mock_code_repository: MagicMock,
+) -> None:
+    """Tests that identifier lookups are answered by keyword search alone."""
+    mock_code_repository.keyword_search.return_value = [
+        _record("k1", "ids = store.get_existing_chunk_ids()")
+    ]
+
+    chunks = answer_question_use_case._retrieve_chunks(
+        "Where is `get_existing_chunk_ids` used?", top_k=5, filters=None
+    )
+
+    assert [chunk.id for chunk in chunks] == ["k1"]
+    mock_embedding_service.get_embedding.assert_not_called()
+    mock_code_repository.search.assert_not_called()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("query", "keyword_content"),
+    [
+        ("What does chunk_size control in the splitter?", "self.chunk_size = 1"),
+        ("Where is `get_existing_chunk_ids` used?", "unrelated = True"),
+    ],
+)
+def test_identifier_questions_still_use_vector_search(
+    answer_question_use_case: AnswerQuestionUseCase,
+    mock_embedding_service: MagicMock,
+    mock_code_repository: MagicMock,
+    query: str,
+    keyword_content: str,
+) -> None:
+    """Tests that conceptual questions and keyword misses are fused as usual."""
+    mock_embedding_service.get_embedding.return_value = [0.1]
+    mock_code_repository.search.return_value = [_record("v1")]
+    mock_code_repository.keyword_search.return_value = [_record("k1", keyword_content)]
+
+    chunks = answer_question_use_case._retrieve_chunks(query, top_k=5, filters=None)
+
+    assert {chunk.id for chunk in chunks} == {"v1", "k1"}
+    mock_embedding_service.get_embedding.assert_called_once_with(query)
+
+
+@pytest.mark.unit
+def test_extract_identifiers() -> None:
+    """Tests which words of a query are taken for code identifiers."""
+    extract = AnswerQuestionUseCase._extract_identifiers
+
+    assert extract("Where is `get_existing_chunk_ids` used?") == [
+        "get_existing_chunk_ids"
+    ]
+    assert extract("what does parseHTTPResponse return") == ["parseHTTPResponse"]
+    assert extract("How does authentication work?") == []
+
+
+@pytest.mark.unit
+def test_definition_lookup_bypasses_llm_and_embedding(
+    mock_embedding_service: MagicMock,
+    mock_code_repository: MagicMock,
+    mock_llm_client: MagicMock,
+    mock_graph_query_use_case: MagicMock,
+) -> None:
+    """Tests that definition questions are answered from the symbol index."""
+    symbol_index = SymbolIndex()
+    symbol_index.add(
+        "src/models.py",
+        [
+            SymbolDefinition(
+                id="src/models.py::User",
+                name="User",
+                type=NodeType.CLASS,
+                start_line=3,
+                end_line=9,
+            )
+        ],
+    )
+    use_case = AnswerQuestionUseCase(
+        embedding_service=mock_embedding_service,
+        code_repository=mock_code_repository,
+        llm_client=mock_llm_client,
+        graph_query_use_case=mock_graph_query_use_case,
+        symbol_index=symbol_index,
+    )
+
+    answer = use_case.execute("Where is the `user` class?")
+
+    assert "src/models.py, lines 3-9" in answer
+    mock_llm_client.get_chat_completion.assert_not_called()
+    mock_embedding_service.get_embedding.assert_not_called()
+    mock_code_repository.search.assert_not_called()
+    assert use_case._answer_definition_lookup("How does login work?", None) is None
+    assert (
+        use_case._answer_definition_lookup(
+            "Where is the User class?", SearchFilters(path_prefix="lib")
+        )
+        is None
+    )
+
+
+@pytest.mark.unit
+def test_definition_target() -> None:
+    """Tests which questions are taken for definition lookups, and of what."""
+    use_case = AnswerQuestionUseCase.__new__(AnswerQuestionUseCase)
+
+    assert use_case._definition_target("Where is the User class defined?") == (
+        "User",
+        NodeType.CLASS,
+    )
+    assert use_case._definition_target("where is class Foo") == (
+        "Foo",
+        NodeType.CLASS,
+    )
+    assert use_case._definition_target("where is parse_file defined?") == (
+        "parse_file",
+        None,
+    )
+    assert use_case._definition_target("Where is this class defined?") is None
+    assert (
+        use_case._definition_target("Where is the subclass of Parser defined?") is None
+    )
+    assert use_case._definition_target("User類別在哪裡定義?") == (
+        "User",
+        NodeType.CLASS,
+    )
+    assert use_case._definition_target("Who calls parse_file?") is None
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "query",
+    [
+        "where is `get_existing_chunk_ids` used?",
+        "Where is get_existing_chunk_ids called from?",
+    ],
+)
+def test_usage_questions_skip_the_definition_lookup(
+    mock_embedding_service: MagicMock,
+    mock_code_repository: MagicMock,
+    mock_llm_client: MagicMock,
+    mock_graph_query_use_case: MagicMock,
+    query: str,
+) -> None:
+    """Tests that questions about callers or usages go through intent routing."""
+    symbol_index = SymbolIndex()
+    symbol_index.add(
+        "src/store.py",
+        [
+            SymbolDefinition(
+                id="src/store.py::get_existing_chunk_ids",
+                name="get_existing_chunk_ids",
+                type=NodeType.FUNCTION,
+                start_line=10,
+                end_line=20,
+            )
+        ],
+    )
+    mock_llm_client.get_chat_completion.side_effect = [
+        json.dumps(
+            {
+                "type": "graph_query_callers",
+                "entity": "get_existing_chunk_ids",
+                "confidence": 0.9,
+            }
+        ),
+        "It is called by the indexer.",
+    ]
+    mock_graph_query_use_case.get_function_callers.return_value = ["index_files"]
+    use_case = AnswerQuestionUseCase(
+        embedding_service=mock_embedding_service,
+        code_repository=mock_code_repository,
+        llm_client=mock_llm_client,
+        graph_query_use_case=mock_graph_query_use_case,
+        symbol_index=symbol_index,
+    )
+
+    assert use_case.execute(query) == "It is called by the indexer."
+    mock_graph_query_use_case.get_function_callers.assert_called_once_with(
+        "get_existing_chunk_ids"
+    )
+    assert use_case._definition_target(query) is None
@@ -0,0 +1,144 @@
+"""
+Unit tests for building the LLM context from retrieved chunks.
+"""
+
+import pytest
+
+from src.application.use_cases.context_builder import (
+    SEPARATOR_TOKENS,
+    estimate_tokens,
+    merge_adjacent_chunks,
+    pack_context,
+)
+from src.domain.entities.code_chunk import ChunkRecord
+from src.infrastructure.text_splitter import CodeTextSplitter
+
+
+def _chunk(
+    chunk_id: str, file_path: str, content: str, start_line: int, end_line: int
+) -> ChunkRecord:
+    return ChunkRecord(
+        id=chunk_id,
+        file_path=file_path,
+        content=content,
+        start_line=start_line,
+        end_line=end_line,
+        metadata={"file_path": file_path, "symbol_id": chunk_id},
+    )
+
+
+@pytest.mark.unit
+def test_overlapping_splitter_chunks_merge_into_the_original_text() -> None:
+    """Tests that the splitter's overlap is removed when its chunks are merged."""
+    content = "\n".join(f"value_{i} = compute({i}, factor={i * 7})" for i in range(60))
+    chunks = CodeTextSplitter(chunk_size=300, chunk_overlap=100).split("a.py", content)
+    assert len(chunks) > 3
+
+    # Retrieved out of order, with a chunk of another file ranked in between.
+    other = _chunk("b", "b.py", "other = 1", 1, 1)
+    merged = merge_adjacent_chunks([chunks[2], other, *chunks[:2], *chunks[3:]])
+
+    assert [chunk.id for chunk in merged] == [chunks[2].id, "b"]
+    assert merged[0].content == content
+    assert (merged[0].start_line, merged[0].end_line) == (1, 60)
+    assert merged[0].metadata["merged_ids"] == [chunk.id for chunk in chunks]
+    assert "symbol_id" not in merged[0].metadata
+    assert merged[1] is other
+
+
+@pytest.mark.unit
+def test_adjacent_chunks_merge_and_separate_ones_do_not() -> None:
+    """Tests merging by line range: touching, contained and separate chunks."""
+    first = _chunk("1", "a.py", "def a():\n    pass", 1, 2)
+    adjacent = _chunk("2", "a.py", "def b():\n    pass", 3, 4)
+    contained = _chunk("3", "a.py", "    pass", 4, 4)
+    separate = _chunk("4", "a.py", "def z():\n    pass", 10, 11)
+    unnumbered = _chunk("5", "a.py", "def q(): ...", -1, -1)
+
+    merged = merge_adjacent_chunks(
+        [separate, adjacent, unnumbered, first, contained, adjacent]
+    )
+
+    assert [chunk.id for chunk in merged] == ["4", "2", "5"]
+    assert merged[1].content == "def a():\n    pass\ndef b():\n    pass"
+    assert merged[1].metadata["merged_ids"] == ["1", "2", "3"]
+    assert merged[0] is separate and merged[2] is unnumbered
+    assert merge_adjacent_chunks([]) == []
+
+
+def _filler(file_path: str, lines: int, start_line: int = 1) -> ChunkRecord:
+    content = "\n".join(f"unrelated_value_{i} = {i}" for i in range(lines))
+    return _chunk(
+        f"{file_path}::{start_line}",
+        file_path,
+        content,
+        start_line,
+        start_line + lines - 1,
+    )
+
+
+@pytest.mark.unit
+def test_packed_context_stays_within_the_budget() -> None:
+    """Tests that packing never exceeds the budget, whatever is retrieved."""
+    chunks = [_filler(f"f{i}.py", 5 + 7 * i) for i in range(10)]
+
+    for budget in [50, 200, 500, 5000]:
+        packed = pack_context("unrelated value", chunks, token_budget=budget)
+        used = sum(estimate_tokens(chunk.content) for chunk in packed)
+        assert packed
+        assert used + SEPARATOR_TOKENS * (len(packed) - 1) <= budget
+    assert len(pack_context("value", chunks, token_budget=100_000)) == 10
+    assert pack_context("value", [], token_budget=100) == []
+
+
+@pytest.mark.unit
+def test_long_chunks_are_truncated_to_their_most_relevant_lines() -> None:
+    """Tests that a long chunk keeps the lines that mention the query."""
+    lines = [f"unrelated_value_{i} = {i}" for i in range(200)]
+    lines[120] = "def refresh_token(session):"
+    lines[121] = "    return session.refresh_token()"
+    chunk = _chunk("a", "a.py", "\n".join(lines), 11, 210)
+
+    (packed,) = pack_context("How is the refresh token renewed?", [chunk], 100)
+
+    assert "def refresh_token(session):" in packed.content
+    assert estimate_tokens(packed.content) <= 100
+    assert packed.metadata["truncated"] is True
+    assert packed.start_line == 11 + lines.index(packed.content.split("\n")[0])
+    assert packed.end_line - packed.start_line == packed.content.count("\n")
+
+
+@pytest.mark.unit
+def test_packing_prefers_diverse_chunks() -> None:
+    """Tests that a near-duplicate of a picked chunk is picked after others."""
+    original = _filler("a.py", 10)
+    duplicate = _filler("a.py", 10, start_line=100)
+    other = _chunk("b", "b.py", "def handler(request):\n    return None", 1, 2)
+
+    packed = pack_context("value", [original, duplicate, other], token_budget=1000)
+
+    assert [chunk.id for chunk in packed] == [original.id, "b", duplicate.id]
+    assert [
+        chunk.id
+        for chunk in pack_context(
+            "value", [original, duplicate, other], token_budget=1000, diversity=0
+        )
+    ] == [original.id, duplicate.id, "b"]
+
+
+@pytest.mark.unit
+def test_truncation_fills_the_allowance_around_the_query_lines() -> None:
+    """Tests that a truncated chunk uses most of its allowance, not one line."""
+    lines = [f"unrelated_value_{i} = {i}" for i in range(200)]
+    lines[150] = "def refresh_token(session):"
+    chunk = _chunk("a", "a.py", "\n".join(lines), 1, 200)
+    other = _filler("b.py", 3)
+
+    for query in ["How is the refresh token renewed?", "nothing matches this"]:
+        packed = pack_context(query, [chunk, other], token_budget=2000)
+        truncated = packed[0]
+
+        assert truncated.metadata["truncated"] is True
+        assert 800 <= estimate_tokens(truncated.content) <= 1000
+        if "refresh" in query:
+            assert "def refresh_token(session):" in truncated.content
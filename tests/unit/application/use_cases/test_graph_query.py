@@ -5,75 +5,61 @@ Unit tests for the GraphQueryUseCase.
 from unittest.mock import MagicMock
 
 import pytest
-from neo4j import Driver
 
 from src.application.use_cases.graph_query import GraphQueryUseCase
+from src.domain.repositories.graph_repository import GraphRepository
 
 
 @pytest.fixture
-def mock_driver() -> MagicMock:
-    """Fixture for a mocked Neo4j Driver."""
-    mock_driver = MagicMock(spec=Driver)
-    mock_session = MagicMock()
-    mock_driver.session.return_value.__enter__.return_value = mock_session
-    return mock_driver
+def mock_graph_repository() -> MagicMock:
+    """Fixture for a mocked GraphRepository."""
+    return MagicMock(spec=GraphRepository)
 
 
 @pytest.mark.unit
-def test_get_function_callers(mock_driver: MagicMock) -> None:
+def test_get_function_callers(mock_graph_repository: MagicMock) -> None:
     """
-    Tests that get_function_callers constructs and executes the correct query.
+    Tests that get_function_callers delegates to the repository.
     """
     # Arrange
-    use_case = GraphQueryUseCase(mock_driver)
-    function_name = "test_func"
+    mock_graph_repository.get_function_callers.return_value = [
+        {"caller_id": "a.py::main", "caller_name": "main"}
+    ]
+    use_case = GraphQueryUseCase(mock_graph_repository)
 
     # Act
-    use_case.get_function_callers(function_name)
+    result = use_case.get_function_callers("test_func")
 
     # Assert
-    mock_session = mock_driver.session.return_value.__enter__.return_value
-    assert mock_session.run.call_count == 1
-    call_args = mock_session.run.call_args
-    assert "WHERE callee.name = $function_name" in call_args[0][0]
-    assert call_args[0][1] == {"function_name": function_name}
+    mock_graph_repository.get_function_callers.assert_called_once_with("test_func")
+    assert result == [{"caller_id": "a.py::main", "caller_name": "main"}]
 
 
 @pytest.mark.unit
-def test_get_class_dependencies(mock_driver: MagicMock) -> None:
+def test_get_class_dependencies(mock_graph_repository: MagicMock) -> None:
     """
-    Tests that get_class_dependencies constructs and executes the correct query.
+    Tests that get_class_dependencies delegates to the repository.
     """
     # Arrange
-    use_case = GraphQueryUseCase(mock_driver)
-    class_name = "TestClass"
+    use_case = GraphQueryUseCase(mock_graph_repository)
 
     # Act
-    use_case.get_class_dependencies(class_name)
+    use_case.get_class_dependencies("TestClass")
 
     # Assert
-    mock_session = mock_driver.session.return_value.__enter__.return_value
-    assert mock_session.run.call_count == 1
-    call_args = mock_session.run.call_args
-    assert "WHERE c.name = $class_name" in call_args[0][0]
-    assert call_args[0][1] == {"class_name": class_name}
+    mock_graph_repository.get_class_dependencies.assert_called_once_with("TestClass")
 
 
 @pytest.mark.unit
-def test_get_methods_in_class(mock_driver: MagicMock) -> None:
+def test_get_methods_in_class(mock_graph_repository: MagicMock) -> None:
     """
-    Tests that get_methods_in_class constructs and executes the correct query.
+    Tests that get_methods_in_class delegates to the repository.
     """
     # Arrange
-    use_case = GraphQueryUseCase(mock_driver)
-    class_name = "TestClass"
+    use_case = GraphQueryUseCase(mock_graph_repository)
 
     # Act
-    use_case.get_methods_in_class(class_name)
+    use_case.get_methods_in_class("TestClass")
 
     # Assert
-    mock_session = mock_driver.session.return_value.__enter__.return_value
-    assert mock_session.run.call_count == 1
-    call_args = mock_session.run.call_args
-    assert "WHERE c.name = $class_name" in call_args[0][0]
-    assert call_args[0][1] == {"class_name": class_name}
+    mock_graph_repository.get_methods_in_class.assert_called_once_with("TestClass")
@@ -0,0 +1,591 @@
+"""
+Unit tests for the IndexRepositoryUseCase.
+"""
+
+import asyncio
+import subprocess
+from array import array
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.application.use_cases.index_repository import IndexRepositoryUseCase
+from src.domain.entities.code_chunk import ChunkRecord, CodeChunk
+from src.domain.entities.graph_entities import (
+    FileNode,
+    NodeType,
+    ParsedData,
+    SymbolDefinition,
+)
+from src.infrastructure.database.memory_graph import InMemoryGraphRepository
+from src.infrastructure.file_processor import FileProcessor
+from src.infrastructure.git_diff import FileChange, FileChangeStatus
+from src.infrastructure.index_manifest import IndexManifest, ManifestEntry
+from src.infrastructure.parser.code_parser import CodeParser
+from src.infrastructure.parser.parse_cache import ParseCache
+from src.infrastructure.parser.symbol_table import SymbolTable
+from src.infrastructure.text_splitter import CodeTextSplitter
+
+
+@pytest.fixture
+def temp_repo(tmp_path: Path) -> Path:
+    """Creates a small repository with a handful of Python files."""
+    (tmp_path / "pkg").mkdir()
+    for i in range(6):
+        (tmp_path / "pkg" / f"module_{i}.py").write_text(
+            f"def function_{i}():\n    return {i}\n"
+        )
+    (tmp_path / "pkg" / "empty.py").write_text("   \n")
+    return tmp_path
+
+
+@pytest.fixture
+def mock_code_parser() -> CodeParser:
+    """Fixture for a CodeParser that returns a single file node per file."""
+    parser = CodeParser()
+    parser.parse = MagicMock(  # type: ignore[method-assign]
+        side_effect=lambda file_path, content: ParsedData(
+            file_path=file_path, nodes=[FileNode(id=file_path)], edges=[]
+        )
+    )
+    return parser
+
+
+@pytest.fixture
+def mock_embedding_client() -> MagicMock:
+    """Fixture for an embedding client that returns one vector per text."""
+    client = MagicMock()
+    client.get_embeddings_async = AsyncMock(
+        side_effect=lambda texts: [[0.1, 0.2] for _ in texts]
+    )
+    return client
+
+
+@pytest.fixture
+def mock_code_repository() -> MagicMock:
+    """Fixture for a code repository with no previously indexed chunks."""
+    repository = MagicMock()
+    repository.get_existing_chunk_ids.return_value = set()
+    return repository
+
+
+@pytest.fixture
+def mock_graph_repository() -> MagicMock:
+    """Fixture for a graph repository whose calls can be asserted."""
+    return MagicMock()
+
+
+def _build_use_case(
+    embedding_client: MagicMock,
+    code_repository: MagicMock,
+    code_parser: MagicMock,
+    graph_repository: MagicMock | None = None,
+    **kwargs: int,
+) -> IndexRepositoryUseCase:
+    return IndexRepositoryUseCase(
+        file_processor=FileProcessor(),
+        text_splitter=CodeTextSplitter(),
+        embedding_client=embedding_client,
+        code_repository=code_repository,
+        graph_repository=graph_repository or MagicMock(),
+        code_parser=code_parser,
+        **kwargs,
+    )
+
+
+@pytest.mark.unit
+def test_execute_indexes_all_chunks_in_batches(
+    temp_repo: Path,
+    mock_embedding_client: MagicMock,
+    mock_code_repository: MagicMock,
+    mock_code_parser: MagicMock,
+) -> None:
+    """Tests that every non-empty file is parsed, embedded and stored."""
+    use_case = _build_use_case(
+        mock_embedding_client, mock_code_repository, mock_code_parser, batch_size=4
+    )
+
+    asyncio.run(use_case.execute(str(temp_repo)))
+
+    assert mock_code_parser.parse.call_count == 6
+    stored = [
+        chunk
+        for call in mock_code_repository.add_batch.call_args_list
+        for chunk in call.args[0]
+    ]
+    assert len(stored) == 6
+    assert all(chunk.embedding == array("f", [0.1, 0.2]) for chunk in stored)
+    assert {chunk.metadata["relative_path"] for chunk in stored} == {
+        f"pkg/module_{i}.py" for i in range(6)
+    }
+    batch_sizes = [
+        len(call.args[0]) for call in mock_code_repository.add_batch.call_args_list
+    ]
+    assert batch_sizes == [4, 2]
+
+
+@pytest.mark.unit
+def test_execute_replaces_file_subgraphs_in_bulk(
+    temp_repo: Path,
+    mock_embedding_client: MagicMock,
+    mock_code_repository: MagicMock,
+    mock_code_parser: MagicMock,
+    mock_graph_repository: MagicMock,
+) -> None:
+    """Tests that file subgraphs are buffered and swapped in bulk calls."""
+    use_case = _build_use_case(
+        mock_embedding_client,
+        mock_code_repository,
+        mock_code_parser,
+        mock_graph_repository,
+        graph_batch_size=4,
+    )
+
+    asyncio.run(use_case.execute(str(temp_repo)))
+
+    graph_repository = mock_graph_repository
+    graph_repository.clear_database.assert_not_called()
+    graph_repository.add_nodes.assert_not_called()
+    file_batches = [
+        len(call.args[0]) for call in graph_repository.replace_files.call_args_list
+    ]
+    # Six files with one node each, plus the empty file whose subgraph is
+    # cleared without adding nodes.
+    assert file_batches == [5, 2]
+
+
+@pytest.mark.unit
+def test_execute_without_manifest_removes_stale_graph_files(
+    temp_repo: Path,
+    mock_embedding_client: MagicMock,
+    mock_code_repository: MagicMock,
+    mock_code_parser: MagicMock,
+    mock_graph_repository: MagicMock,
+) -> None:
+    """Tests that file nodes for missing files are removed, and nothing else."""
+    use_case = _build_use_case(
+        mock_embedding_client,
+        mock_code_repository,
+        mock_code_parser,
+        mock_graph_repository,
+    )
+    kept = str(temp_repo / "pkg" / "module_0.py")
+    stale = str(temp_repo / "pkg" / "deleted.py")
+    mock_graph_repository.get_file_ids.return_value = [
+        kept,
+        stale,
+        "/elsewhere/other.py",
+    ]
+
+    asyncio.run(use_case.execute(str(temp_repo)))
+
+    mock_graph_repository.delete_files.assert_called_once_with([stale])
+
+
+@pytest.mark.unit
+def test_execute_skips_already_indexed_chunks(
+    temp_repo: Path,
+    mock_embedding_client: MagicMock,
+    mock_code_repository: MagicMock,
+    mock_code_parser: MagicMock,
+) -> None:
+    """Tests that chunks already in the repository are not re-embedded."""
+    use_case = _build_use_case(
+        mock_embedding_client, mock_code_repository, mock_code_parser
+    )
+    mock_code_repository.get_existing_chunk_ids.side_effect = lambda ids: set(ids)
+
+    asyncio.run(use_case.execute(str(temp_repo)))
+
+    mock_embedding_client.get_embeddings_async.assert_not_called()
+    mock_code_repository.add_batch.assert_not_called()
+
+
+@pytest.mark.unit
+def test_execute_bounds_in_flight_batches(
+    temp_repo: Path,
+    mock_code_repository: MagicMock,
+    mock_code_parser: MagicMock,
+) -> None:
+    """Tests that no more than max_in_flight_batches embed calls run at once."""
+    in_flight = 0
+    peak = 0
+
+    async def slow_embeddings(texts: list[str]) -> list[list[float]]:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [[0.0] for _ in texts]
+
+    embedding_client = MagicMock()
+    embedding_client.get_embeddings_async = AsyncMock(side_effect=slow_embeddings)
+    use_case = _build_use_case(
+        embedding_client,
+        mock_code_repository,
+        mock_code_parser,
+        batch_size=1,
+        max_in_flight_batches=2,
+    )
+
+    asyncio.run(use_case.execute(str(temp_repo)))
+
+    assert embedding_client.get_embeddings_async.call_count == 6
+    assert peak == 2
+
+
+@pytest.mark.unit
+def test_execute_with_manifest_only_reindexes_changed_files(
+    temp_repo: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+    mock_embedding_client: MagicMock,
+    mock_code_repository: MagicMock,
+    mock_code_parser: MagicMock,
+    mock_graph_repository: MagicMock,
+) -> None:
+    """Tests that a re-run only touches modified and removed files."""
+    manifest_path = tmp_path_factory.mktemp("manifest") / "manifest.json"
+    use_case = _build_use_case(
+        mock_embedding_client,
+        mock_code_repository,
+        mock_code_parser,
+        mock_graph_repository,
+    )
+    use_case.manifest = IndexManifest(str(manifest_path))
+    asyncio.run(use_case.execute(str(temp_repo)))
+
+    modified = temp_repo / "pkg" / "module_0.py"
+    removed = temp_repo / "pkg" / "module_1.py"
+    old_modified_entry = use_case.manifest.get(str(modified))
+    old_removed_entry = use_case.manifest.get(str(removed))
+    assert old_modified_entry is not None and old_removed_entry is not None
+    modified.write_text("def function_0():\n    return 'changed'\n")
+    removed.unlink()
+
+    mock_code_parser.parse.reset_mock()
+    mock_code_repository.reset_mock()
+    mock_graph_repository.reset_mock()
+    use_case.manifest = IndexManifest(str(manifest_path))
+    asyncio.run(use_case.execute(str(temp_repo)))
+
+    mock_graph_repository.clear_database.assert_not_called()
+    mock_code_parser.parse.assert_called_once_with(str(modified), modified.read_text())
+    deleted_chunk_ids = [
+        chunk_id
+        for call in mock_code_repository.delete_batch.call_args_list
+        for chunk_id in call.args[0]
+    ]
+    assert set(deleted_chunk_ids) == set(
+        old_modified_entry.chunk_ids + old_removed_entry.chunk_ids
+    )
+    mock_graph_repository.delete_files.assert_any_call([str(removed)])
+    assert str(removed) not in IndexManifest(str(manifest_path)).file_paths()
+
+
+@pytest.mark.unit
+def test_execute_diff_moves_renamed_files_without_reembedding(
+    tmp_path: Path,
+    mock_embedding_client: MagicMock,
+    mock_code_repository: MagicMock,
+    mock_code_parser: MagicMock,
+    mock_graph_repository: MagicMock,
+) -> None:
+    """Tests that pure renames re-key stored data and deletions are removed."""
+    repo = str(tmp_path)
+    old_path, new_path = f"{repo}/old.py", f"{repo}/new.py"
+    deleted_path = f"{repo}/gone.py"
+    manifest = IndexManifest(str(tmp_path / "manifest.json"))
+    manifest.record(
+        old_path,
+        ManifestEntry(
+            content_hash="h1",
+            chunk_ids=[f"{old_path}::abc"],
+            node_ids=[old_path, f"{old_path}::run"],
+            definitions=[
+                SymbolDefinition(
+                    id=f"{old_path}::run",
+                    name="run",
+                    type=NodeType.FUNCTION,
+                    start_line=1,
+                    end_line=1,
+                )
+            ],
+        ),
+    )
+    manifest.record(
+        deleted_path,
+        ManifestEntry(content_hash="h2", chunk_ids=["gone"], node_ids=["gone"]),
+    )
+    mock_code_repository.get_batch.return_value = [
+        ChunkRecord(
+            id=f"{old_path}::abc",
+            file_path=old_path,
+            content="def run(): pass",
+            start_line=1,
+            end_line=1,
+            embedding=[0.5],
+            metadata={"file_path": old_path, "symbol_id": f"{old_path}::run"},
+        )
+    ]
+    use_case = _build_use_case(
+        mock_embedding_client,
+        mock_code_repository,
+        mock_code_parser,
+        mock_graph_repository,
+    )
+    use_case.manifest = manifest
+
+    with patch(
+        "src.application.use_cases.index_repository.GitDiffReader"
+    ) as reader_cls:
+        reader_cls.return_value.get_changes.return_value = [
+            FileChange(
+                status=FileChangeStatus.RENAMED, path="new.py", old_path="old.py"
+            ),
+            FileChange(status=FileChangeStatus.DELETED, path="gone.py"),
+        ]
+        asyncio.run(use_case.execute_diff(repo, "base", "target"))
+
+    mock_embedding_client.get_embeddings_async.assert_not_called()
+    mock_code_parser.parse.assert_not_called()
+    moved = mock_code_repository.add_batch.call_args.args[0][0]
+    assert moved.file_path == new_path
+    assert moved.embedding == array("f", [0.5])
+    assert moved.id == CodeChunk.generate_id(new_path, "def run(): pass")
+    assert moved.metadata["relative_path"] == "new.py"
+    assert moved.metadata["symbol_id"] == f"{new_path}::run"
+    mock_graph_repository.rename_file.assert_called_once_with(old_path, new_path)
+    mock_graph_repository.delete_files.assert_called_once_with([deleted_path])
+
+    reloaded = IndexManifest(str(tmp_path / "manifest.json"))
+    assert reloaded.file_paths() == {new_path}
+    entry = reloaded.get(new_path)
+    assert entry is not None
+    assert entry.node_ids == [new_path, f"{new_path}::run"]
+    assert [d.id for d in entry.definitions] == [f"{new_path}::run"]
+    assert entry.relative_path == "new.py"
+
+
+@pytest.mark.unit
+def test_clear_index_removes_files_deleted_since_the_last_run(
+    temp_repo: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+    mock_embedding_client: MagicMock,
+    mock_code_repository: MagicMock,
+    mock_code_parser: MagicMock,
+    mock_graph_repository: MagicMock,
+) -> None:
+    """Tests that a full re-index also drops files that no longer exist."""
+    manifest_path = tmp_path_factory.mktemp("manifest") / "manifest.json"
+    use_case = _build_use_case(
+        mock_embedding_client,
+        mock_code_repository,
+        mock_code_parser,
+        mock_graph_repository,
+    )
+    use_case.manifest = IndexManifest(str(manifest_path))
+    asyncio.run(use_case.execute(str(temp_repo)))
+
+    removed = temp_repo / "pkg" / "module_1.py"
+    removed_entry = use_case.manifest.get(str(removed))
+    assert removed_entry is not None
+    removed.unlink()
+    mock_code_repository.reset_mock()
+    mock_graph_repository.reset_mock()
+
+    use_case.clear_index()
+
+    (deleted_chunk_ids,) = mock_code_repository.delete_batch.call_args.args
+    assert set(removed_entry.chunk_ids) <= set(deleted_chunk_ids)
+    (deleted_files,) = mock_graph_repository.delete_files.call_args.args
+    assert str(removed) in deleted_files
+    assert len(IndexManifest(str(manifest_path))) == 0
+
+
+@pytest.mark.unit
+def test_execute_diff_in_a_subdirectory_of_the_checkout(
+    tmp_path: Path,
+    mock_embedding_client: MagicMock,
+    mock_code_repository: MagicMock,
+    mock_code_parser: MagicMock,
+) -> None:
+    """Tests that git paths are resolved against the indexed subdirectory."""
+    checkout = tmp_path / "checkout"
+    (checkout / "pkg").mkdir(parents=True)
+    (checkout / "other").mkdir()
+
+    def git(*args: str) -> None:
+        subprocess.run(["git", *args], cwd=checkout, capture_output=True, check=True)
+
+    git("init", "-q")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+    (checkout / "pkg" / "helpers.py").write_text("def helper():\n    return 1\n")
+    (checkout / "other" / "outside.py").write_text("def outside():\n    return 2\n")
+    git("add", ".")
+    git("commit", "-q", "-m", "base")
+
+    package = checkout / "pkg"
+    use_case = _build_use_case(
+        mock_embedding_client, mock_code_repository, mock_code_parser
+    )
+    manifest = IndexManifest(str(tmp_path / "manifest.json"))
+    use_case.manifest = manifest
+    asyncio.run(use_case.execute(str(package)))
+
+    (package / "helpers.py").write_text("def helper():\n    return 'changed'\n")
+    (checkout / "other" / "outside.py").write_text("def outside():\n    return 3\n")
+    git("commit", "-q", "-am", "target")
+    mock_code_parser.parse.reset_mock()
+
+    asyncio.run(use_case.execute_diff(str(package), "HEAD~1", "HEAD"))
+
+    helpers = str(package / "helpers.py")
+    mock_code_parser.parse.assert_called_once_with(
+        helpers, "def helper():\n    return 'changed'\n"
+    )
+    assert manifest.file_paths() == {helpers}
+
+
+@pytest.mark.unit
+def test_execute_diff_requires_manifest(
+    mock_embedding_client: MagicMock,
+    mock_code_repository: MagicMock,
+    mock_code_parser: MagicMock,
+) -> None:
+    """Tests that diff mode refuses to run without a manifest."""
+    use_case = _build_use_case(
+        mock_embedding_client, mock_code_repository, mock_code_parser
+    )
+
+    with pytest.raises(ValueError):
+        asyncio.run(use_case.execute_diff(".", "base", "target"))
+
+
+@pytest.mark.unit
+def test_execute_links_calls_across_files(
+    tmp_path: Path,
+    mock_embedding_client: MagicMock,
+    mock_code_repository: MagicMock,
+) -> None:
+    """Tests that cross-file links survive re-indexing only the callee's file."""
+    repo = tmp_path / "repo"
+    (repo / "pkg").mkdir(parents=True)
+    (repo / "pkg" / "util.py").write_text("def helper():\n    pass\n")
+    (repo / "pkg" / "app.py").write_text(
+        "from pkg.util import helper\n\ndef main():\n    helper()\n"
+    )
+    graph_repository = InMemoryGraphRepository()
+    use_case = IndexRepositoryUseCase(
+        file_processor=FileProcessor(),
+        text_splitter=CodeTextSplitter(),
+        embedding_client=mock_embedding_client,
+        code_repository=mock_code_repository,
+        graph_repository=graph_repository,
+        code_parser=CodeParser(),
+        manifest=IndexManifest(str(tmp_path / "manifest.json")),
+    )
+
+    asyncio.run(use_case.execute(str(repo)))
+
+    app_path = str(repo / "pkg" / "app.py")
+    callers = graph_repository.get_function_callers("helper")
+    assert [c["caller_id"] for c in callers] == [f"{app_path}::main"]
+    assert use_case.manifest is not None
+    entry = use_case.manifest.get(app_path)
+    assert entry is not None and len(entry.links) == 2
+    util_entry = use_case.manifest.get(str(repo / "pkg" / "util.py"))
+    assert util_entry is not None
+    assert [
+        (d.name, d.type, d.start_line, d.end_line) for d in util_entry.definitions
+    ] == [("helper", NodeType.FUNCTION, 1, 2)]
+
+    (repo / "pkg" / "util.py").write_text("def helper():\n    return 1\n")
+    use_case.manifest = IndexManifest(str(tmp_path / "manifest.json"))
+    asyncio.run(use_case.execute(str(repo)))
+
+    callers = graph_repository.get_function_callers("helper")
+    assert [c["caller_id"] for c in callers] == [f"{app_path}::main"]
+
+    (repo / "pkg" / "util.py").write_text("def other():\n    pass\n")
+    use_case.manifest = IndexManifest(str(tmp_path / "manifest.json"))
+    asyncio.run(use_case.execute(str(repo)))
+
+    assert graph_repository.get_function_callers("helper") == []
+    entry = use_case.manifest.get(app_path)
+    assert entry is not None
+    # The missing symbol falls back to an import of its module.
+    assert [link.target_id for link in entry.links] == [str(repo / "pkg" / "util.py")]
+
+
+@pytest.mark.unit
+def test_incremental_run_only_resolves_affected_files(
+    tmp_path: Path,
+    mock_embedding_client: MagicMock,
+    mock_code_repository: MagicMock,
+) -> None:
+    """Tests that files unrelated to a change are not re-resolved."""
+    repo = tmp_path / "repo"
+    (repo / "pkg").mkdir(parents=True)
+    (repo / "pkg" / "util.py").write_text("def helper():\n    pass\n")
+    (repo / "pkg" / "app.py").write_text(
+        "from pkg.util import helper\n\ndef main():\n    helper()\n"
+    )
+    (repo / "pkg" / "other.py").write_text("import os\n\ndef run():\n    pass\n")
+    use_case = IndexRepositoryUseCase(
+        file_processor=FileProcessor(),
+        text_splitter=CodeTextSplitter(),
+        embedding_client=mock_embedding_client,
+        code_repository=mock_code_repository,
+        graph_repository=InMemoryGraphRepository(),
+        code_parser=CodeParser(),
+        manifest=IndexManifest(str(tmp_path / "manifest.json")),
+    )
+    asyncio.run(use_case.execute(str(repo)))
+
+    (repo / "pkg" / "util.py").write_text("def helper():\n    return 1\n")
+    with patch.object(
+        SymbolTable, "resolve", autospec=True, side_effect=SymbolTable.resolve
+    ) as resolve:
+        asyncio.run(use_case.execute(str(repo)))
+
+    resolved = {call.args[1] for call in resolve.call_args_list}
+    assert resolved == {str(repo / "pkg" / "util.py"), str(repo / "pkg" / "app.py")}
+
+
+@pytest.mark.unit
+def test_rebuild_graph_uses_parse_cache_only(
+    tmp_path: Path,
+    mock_embedding_client: MagicMock,
+    mock_code_repository: MagicMock,
+) -> None:
+    """Tests that the graph is rebuilt from cached parses and stored links."""
+    repo = tmp_path / "repo"
+    (repo / "pkg").mkdir(parents=True)
+    (repo / "pkg" / "util.py").write_text("def helper():\n    pass\n")
+    (repo / "pkg" / "app.py").write_text(
+        "from pkg.util import helper\n\ndef main():\n    helper()\n"
+    )
+    code_parser = CodeParser(cache=ParseCache(str(tmp_path / "cache")))
+    use_case = IndexRepositoryUseCase(
+        file_processor=FileProcessor(),
+        text_splitter=CodeTextSplitter(),
+        embedding_client=mock_embedding_client,
+        code_repository=mock_code_repository,
+        graph_repository=InMemoryGraphRepository(),
+        code_parser=code_parser,
+        manifest=IndexManifest(str(tmp_path / "manifest.json")),
+    )
+    asyncio.run(use_case.execute(str(repo)))
+
+    use_case.graph_repository = InMemoryGraphRepository()
+    mock_embedding_client.reset_mock()
+    with patch.object(code_parser, "parse") as parse:
+        use_case.rebuild_graph()
+
+    parse.assert_not_called()
+    mock_embedding_client.get_embeddings_async.assert_not_called()
+    callers = use_case.graph_repository.get_function_callers("helper")
+    assert [c["caller_id"] for c in callers] == [f"{repo / 'pkg' / 'app.py'}::main"]
@@ -0,0 +1,43 @@
+"""
+Unit tests for CodeChunk and ChunkRecord.
+"""
+
+from array import array
+
+import pytest
+
+from src.domain.entities.code_chunk import ChunkRecord, CodeChunk
+
+
+@pytest.mark.unit
+def test_record_stores_embedding_as_float32() -> None:
+    """Tests that embeddings are held as a compact float32 array."""
+    record = ChunkRecord("a.py::1", "a.py", "pass", 1, 1)
+    assert record.embedding is None
+
+    record.set_embedding([0.5] * 1536)
+
+    assert isinstance(record.embedding, array)
+    assert record.embedding.itemsize == 4
+    assert len(record.embedding) == 1536
+    with pytest.raises(AttributeError):
+        record.extra = True
+
+
+@pytest.mark.unit
+def test_record_round_trips_through_model() -> None:
+    """Tests conversion to and from the validated CodeChunk model."""
+    chunk = CodeChunk(
+        id="a.py::1",
+        file_path="a.py",
+        content="pass",
+        start_line=1,
+        end_line=2,
+        embedding=[0.25, 0.5],
+        metadata={"file_path": "a.py"},
+    )
+
+    record = ChunkRecord.from_model(chunk)
+
+    assert record.embedding == array("f", [0.25, 0.5])
+    assert record.to_model() == chunk
@@ -0,0 +1,58 @@
+"""
+Unit tests for SearchFilters.
+"""
+
+import pytest
+
+from src.domain.entities.search_filters import SearchFilters, relative_path
+
+
+@pytest.mark.unit
+def test_path_prefix_matches_whole_components() -> None:
+    """Tests that a prefix matches directories and files, not partial names."""
+    filters = SearchFilters(path_prefix="./src/api/")
+
+    assert filters.matches_file("src/api/routes.py")
+    assert filters.matches_file("src/api")
+    assert not filters.matches_file("src/api_v2/routes.py")
+    assert not filters.matches_file("lib/src/api/routes.py")
+    assert SearchFilters(path_prefix="src/api/routes.py").matches_file(
+        "src/api/routes.py"
+    )
+
+
+@pytest.mark.unit
+def test_language_extension_and_symbol_type_filters() -> None:
+    """Tests the constraints derived from the extension and the metadata."""
+    filters = SearchFilters(
+        languages=["typescript"], extensions=["TSX"], symbol_types=["Function"]
+    )
+
+    assert filters.normalized_extensions() == [".tsx"]
+    assert filters.matches("web/App.tsx", {"symbol_type": "Function"})
+    assert not filters.matches("web/App.tsx", {"symbol_type": "Class"})
+    assert not filters.matches("web/App.tsx", {})
+    assert not filters.matches("web/app.ts", {"symbol_type": "Function"})
+    assert not filters.matches("web/app.py", {"symbol_type": "Function"})
+
+
+@pytest.mark.unit
+def test_empty_filters_match_everything() -> None:
+    """Tests that unset constraints do not restrict anything."""
+    filters = SearchFilters(path_prefix="./")
+
+    assert filters.is_empty()
+    assert filters.matches("anything.unknown", {})
+    assert not SearchFilters(extensions=[".py"]).is_empty()
+
+
+@pytest.mark.unit
+def test_paths_are_matched_relative_to_the_indexed_root() -> None:
+    """Tests that repo-prefixed paths match through their relative path."""
+    file_path = "/home/u/monorepo/services/billing/api.py"
+    filters = SearchFilters(path_prefix="services/billing")
+
+    assert relative_path(file_path, "/home/u/monorepo") == "services/billing/api.py"
+    assert filters.matches(file_path, {"relative_path": "services/billing/api.py"})
+    assert not filters.matches(file_path, {"relative_path": "services/web/api.py"})
+    assert not filters.matches(file_path, {})
@@ -0,0 +1,62 @@
+"""
+Unit tests for the BM25Index and its identifier-aware tokenizer.
+"""
+
+import pytest
+
+from src.infrastructure.database.bm25_index import BM25Index, tokenize
+
+
+@pytest.mark.unit
+def test_tokenize_splits_snake_and_camel_case() -> None:
+    """Tests that identifiers yield themselves and their parts."""
+    assert tokenize("get_existing_chunk_ids(x)") == [
+        "get_existing_chunk_ids",
+        "get",
+        "existing",
+        "chunk",
+        "ids",
+    ]
+    assert tokenize("parseHTTPResponse") == [
+        "parsehttpresponse",
+        "parse",
+        "http",
+        "response",
+    ]
+    assert tokenize("a = b + count") == ["count"]
+
+
+@pytest.mark.unit
+def test_search_ranks_exact_identifiers_first() -> None:
+    """Tests BM25 ranking of rare identifiers over common words."""
+    index = BM25Index()
+    index.add_batch(
+        [
+            ("a", "def get_existing_chunk_ids(self, chunk_ids): return chunk_ids"),
+            ("b", "def get_chunk(self, chunk_id): return self.chunks[chunk_id]"),
+            ("c", "def existing(self): return True"),
+        ]
+    )
+
+    assert [chunk_id for chunk_id, _ in index.search("get_existing_chunk_ids")] == [
+        "a",
+        "b",
+        "c",
+    ]
+    assert index.search("existing", top_k=1)[0][0] in {"a", "c"}
+    assert index.search("unrelated") == []
+
+
+@pytest.mark.unit
+def test_add_replaces_and_remove_forgets_chunks() -> None:
+    """Tests that updates keep postings and lengths consistent."""
+    index = BM25Index()
+    index.add("a", "alpha beta")
+    index.add("b", "beta gamma")
+    index.add("a", "delta")
+    index.remove(["b", "unknown"])
+
+    assert len(index) == 1 and "a" in index
+    assert index.search("alpha beta gamma") == []
+    assert [chunk_id for chunk_id, _ in index.search("delta")] == ["a"]
+    assert index._total_length == 1
@@ -0,0 +1,49 @@
+"""
+Unit tests for building the configured CodeRepository.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.database.code_repository_factory import (
+    create_code_repository,
+)
+from src.infrastructure.database.numpy_store import NumpyCodeRepository
+
+
+@pytest.mark.unit
+def test_numpy_store_is_configured_from_the_environment(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tests that unset arguments fall back to the VECTOR_* variables."""
+    monkeypatch.setenv("VECTOR_BACKEND", "numpy")
+    monkeypatch.setenv("VECTOR_STORE_PATH", str(tmp_path / "env"))
+    monkeypatch.setenv("VECTOR_IVF_LISTS", "32")
+    monkeypatch.setenv("VECTOR_IVF_PROBES", "4")
+    monkeypatch.setenv("VECTOR_QUANTIZATION", "int8")
+
+    repository = create_code_repository()
+
+    assert isinstance(repository, NumpyCodeRepository)
+    assert repository.path == str(tmp_path / "env")
+    assert repository.index is not None
+    assert (repository.index.n_lists, repository.index.n_probes) == (32, 4)
+    assert repository.quantized is not None
+    assert repository.quantized.quantization == "int8"
+
+    overridden = create_code_repository(
+        path=str(tmp_path / "arg"), ivf_lists=0, prefilter_dimension=16
+    )
+    assert isinstance(overridden, NumpyCodeRepository)
+    assert overridden.path == str(tmp_path / "arg")
+    assert overridden.index is None
+    assert overridden.quantized is not None
+    assert overridden.quantized.dimension == 16
+
+
+@pytest.mark.unit
+def test_unknown_backend_is_rejected() -> None:
+    """Tests that an unsupported backend raises a ValueError."""
+    with pytest.raises(ValueError, match="Unknown vector backend"):
+        create_code_repository(backend="faiss")
@@ -0,0 +1,250 @@
+"""
+Unit tests for the Neo4jService.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.domain.entities.graph_entities import (
+    CallsEdge,
+    ClassNode,
+    ContainsEdge,
+    FileNode,
+    FunctionNode,
+    ImportsEdge,
+    NodeType,
+    ParsedData,
+)
+from src.infrastructure.database.graph_db import Neo4jService
+
+
+@pytest.fixture
+def session() -> MagicMock:
+    """Fixture to provide the mocked driver session."""
+    return MagicMock()
+
+
+@pytest.fixture
+def tx(session: MagicMock) -> MagicMock:
+    """Fixture to provide the transaction that write functions are run with."""
+    tx = MagicMock()
+    session.execute_write.side_effect = lambda func, *args: func(tx, *args)
+    return tx
+
+
+@pytest.fixture
+def service(session: MagicMock) -> Neo4jService:
+    """Fixture to provide a Neo4jService with a mocked driver."""
+    with patch("src.infrastructure.database.graph_db.GraphDatabase") as database:
+        database.driver.return_value.session.return_value.__enter__.return_value = (
+            session
+        )
+        service = Neo4jService(
+            "bolt://localhost:7687", "neo4j", "password", 2, ensure_schema=False
+        )
+    return service
+
+
+@pytest.mark.unit
+def test_add_nodes_groups_by_label_in_batches(
+    service: Neo4jService, tx: MagicMock
+) -> None:
+    """Tests that nodes are written with one UNWIND query per label and batch."""
+    service.add_nodes(
+        [
+            FileNode(id="a.py"),
+            FunctionNode(id="a.py::f", properties={"name": "f"}),
+            FunctionNode(id="a.py::g", properties={"name": "g"}),
+            FunctionNode(id="a.py::h", properties={"name": "h"}),
+            ClassNode(id="a.py::A", properties={"name": "A"}),
+        ]
+    )
+
+    calls = tx.run.call_args_list
+    assert len(calls) == 4
+    assert all(call.args[0].startswith("UNWIND $rows AS row") for call in calls)
+    assert [len(call.kwargs["rows"]) for call in calls] == [1, 2, 1, 1]
+    assert "MERGE (n:Function {id: row.id})" in calls[1].args[0]
+    assert calls[1].kwargs["rows"][0] == {
+        "id": "a.py::f",
+        "properties": {"name": "f"},
+    }
+
+
+@pytest.mark.unit
+def test_add_edges_groups_by_type(service: Neo4jService, tx: MagicMock) -> None:
+    """Tests that edges are written with one UNWIND query per relationship type."""
+    service.add_edges(
+        [
+            ContainsEdge(source_id="a.py", target_id="a.py::f"),
+            CallsEdge(source_id="a.py::f", target_id="a.py::g"),
+            ContainsEdge(source_id="a.py", target_id="a.py::g"),
+        ]
+    )
+
+    calls = tx.run.call_args_list
+    assert len(calls) == 2
+    assert "MERGE (a)-[r:CONTAINS]->(b)" in calls[0].args[0]
+    assert [row["target_id"] for row in calls[0].kwargs["rows"]] == [
+        "a.py::f",
+        "a.py::g",
+    ]
+    assert "MERGE (a)-[r:CALLS]->(b)" in calls[1].args[0]
+
+
+@pytest.mark.unit
+def test_add_nodes_with_no_nodes_runs_nothing(
+    service: Neo4jService, tx: MagicMock
+) -> None:
+    """Tests that an empty input does not run any query."""
+    service.add_nodes([])
+
+    tx.run.assert_not_called()
+
+
+@pytest.mark.unit
+def test_edges_match_endpoints_by_label(service: Neo4jService, tx: MagicMock) -> None:
+    """Tests that typed endpoints are matched by label and untyped ones are not."""
+    service.add_edges(
+        [
+            CallsEdge(
+                source_id="a.py::f",
+                target_id="a.py::g",
+                source_type=NodeType.FUNCTION,
+                target_type=NodeType.FUNCTION,
+            ),
+            ImportsEdge(source_id="a.py", target_id="os", source_type=NodeType.FILE),
+        ]
+    )
+
+    queries = [call.args[0] for call in tx.run.call_args_list]
+    assert "MATCH (a:Function {id: row.source_id}) " in queries[0]
+    assert "MATCH (b:Function {id: row.target_id}) " in queries[0]
+    assert "MATCH (a:File {id: row.source_id}) " in queries[1]
+    assert "MATCH (b {id: row.target_id}) " in queries[1]
+
+
+@pytest.mark.unit
+def test_schema_is_created_idempotently_on_connect() -> None:
+    """Tests that constraints and indexes are created with IF NOT EXISTS."""
+    with patch("src.infrastructure.database.graph_db.GraphDatabase") as database:
+        Neo4jService("bolt://localhost:7687", "neo4j", "password")
+
+    session = database.driver.return_value.session.return_value.__enter__.return_value
+    statements = [call.args[0] for call in session.run.call_args_list]
+    assert len(statements) == 2 * len(NodeType)
+    assert all("IF NOT EXISTS" in statement for statement in statements)
+    assert (
+        "CREATE CONSTRAINT function_id IF NOT EXISTS "
+        "FOR (n:Function) REQUIRE n.id IS UNIQUE"
+    ) in statements
+    assert "CREATE INDEX class_name IF NOT EXISTS FOR (n:Class) ON (n.name)" in (
+        statements
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("method", "name", "expected_filter", "param"),
+    [
+        ("get_function_callers", "test_func", "callee.name", "function_name"),
+        ("get_class_dependencies", "TestClass", "c.name", "class_name"),
+        ("get_methods_in_class", "TestClass", "c.name", "class_name"),
+    ],
+)
+def test_queries_filter_by_name(
+    service: Neo4jService,
+    session: MagicMock,
+    method: str,
+    name: str,
+    expected_filter: str,
+    param: str,
+) -> None:
+    """Tests that the lookups run a parameterized Cypher query."""
+    getattr(service, method)(name)
+
+    query, params = session.run.call_args.args
+    assert f"WHERE {expected_filter} = ${param}" in query
+    assert params == {param: name}
+
+
+@pytest.mark.unit
+def test_replace_files_runs_in_one_transaction(
+    service: Neo4jService, session: MagicMock, tx: MagicMock
+) -> None:
+    """Tests that deleting and rewriting file subgraphs share a transaction."""
+    parsed = ParsedData(
+        file_path="a.py",
+        nodes=[FileNode(id="a.py"), FunctionNode(id="a.py::f")],
+        edges=[
+            ContainsEdge(
+                source_id="a.py",
+                target_id="a.py::f",
+                source_type=NodeType.FILE,
+                target_type=NodeType.FUNCTION,
+            )
+        ],
+    )
+
+    service.replace_files([parsed])
+
+    assert session.execute_write.call_count == 1
+    queries = [call.args[0] for call in tx.run.call_args_list]
+    assert "MATCH (f:File {id: file_id}) DETACH DELETE f" in queries[0]
+    assert "MATCH (n:Function) WHERE n.id STARTS WITH file_id + '::'" in queries[2]
+    assert "MERGE (n:File {id: row.id})" in queries[3]
+    assert "MERGE (a)-[r:CONTAINS]->(b)" in queries[-1]
+    assert tx.run.call_args_list[0].kwargs["file_ids"] == ["a.py"]
+
+
+@pytest.mark.unit
+def test_delete_edges_matches_without_merging(
+    service: Neo4jService, tx: MagicMock
+) -> None:
+    """Tests that edge deletion matches the relationship instead of merging it."""
+    service.delete_edges(
+        [
+            CallsEdge(
+                source_id="a.py::f",
+                target_id="b.py::g",
+                source_type=NodeType.FUNCTION,
+                target_type=NodeType.FUNCTION,
+            )
+        ]
+    )
+
+    query = tx.run.call_args.args[0]
+    assert "(a)-[r:CALLS]->(b)" in query
+    assert "(a:Function {id: row.source_id})" in query
+    assert "MERGE" not in query
+    assert query.rstrip().endswith("DELETE r")
+
+
+@pytest.mark.unit
+def test_delete_nodes_matches_by_label(service: Neo4jService, tx: MagicMock) -> None:
+    """Tests that node deletion looks nodes up by label and ID."""
+    service.delete_nodes(["a.py", "a.py::f"])
+
+    queries = [call.args[0] for call in tx.run.call_args_list]
+    assert len(queries) == len(NodeType)
+    for node_type, query in zip(NodeType, queries, strict=True):
+        assert f"MATCH (n:{node_type.value} {{id: node_id}})" in query
+    assert tx.run.call_args.kwargs["ids"] == ["a.py", "a.py::f"]
+
+
+@pytest.mark.unit
+def test_rename_file_matches_by_label(service: Neo4jService, tx: MagicMock) -> None:
+    """Tests that a rename re-keys the file and its symbols through labels."""
+    service.rename_file("old.py", "new.py")
+
+    queries = [call.args[0] for call in tx.run.call_args_list]
+    assert queries[0].startswith("MATCH (f:File {id: $old_id})")
+    assert "MATCH (n:Class) WHERE n.id STARTS WITH $old_prefix" in queries[1]
+    assert "MATCH (n:Function) WHERE n.id STARTS WITH $old_prefix" in queries[2]
+    assert all("MATCH (n)" not in query for query in queries)
+    assert tx.run.call_args.kwargs == {
+        "old_id": "old.py",
+        "old_prefix": "old.py::",
+        "new_id": "new.py",
+    }
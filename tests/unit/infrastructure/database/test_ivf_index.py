@@ -0,0 +1,138 @@
+"""
+Unit tests for the IVFIndex and its use by the NumpyCodeRepository.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.domain.entities.code_chunk import ChunkRecord
+from src.infrastructure.database.ivf_index import IVFIndex
+from src.infrastructure.database.numpy_store import NumpyCodeRepository
+
+
+def _chunk(index: int, embedding: np.ndarray) -> ChunkRecord:
+    return ChunkRecord(
+        id=str(index),
+        file_path="a.py",
+        content=f"chunk {index}",
+        start_line=index,
+        end_line=index,
+        embedding=embedding,
+    )
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    """Fixture to provide clustered embeddings."""
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, 32)).astype(np.float32)
+    labels = rng.integers(0, 20, size=2000)
+    return centers[labels] + rng.normal(scale=0.5, size=(2000, 32)).astype(np.float32)
+
+
+def _exact_ids(vectors: np.ndarray, query: np.ndarray, k: int) -> set[str]:
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return {str(i) for i in np.argsort(-(normalized @ query))[:k]}
+
+
+def _store(path: Path, n_probes: int = 4) -> NumpyCodeRepository:
+    return NumpyCodeRepository(
+        str(path), index=IVFIndex(n_lists=16, n_probes=n_probes, min_train_size=500)
+    )
+
+
+@pytest.mark.unit
+def test_ivf_search_has_high_recall(tmp_path: Path, vectors: np.ndarray) -> None:
+    """Tests that probing a few lists finds nearly all exact neighbours."""
+    store = _store(tmp_path / "store")
+    store.add_batch([_chunk(i, v) for i, v in enumerate(vectors)])
+    assert store.index is not None and store.index.is_trained
+
+    recalls = []
+    for query in vectors[:50]:
+        query = query / np.linalg.norm(query)
+        found = {chunk.id for chunk in store.search(query.tolist(), top_k=10)}
+        recalls.append(len(found & _exact_ids(vectors, query, 10)) / 10)
+
+    assert np.mean(recalls) >= 0.9
+    assert len(store.index.candidates(query)) < len(vectors)
+
+
+@pytest.mark.unit
+def test_index_trains_once_and_indexes_later_batches(
+    tmp_path: Path, vectors: np.ndarray
+) -> None:
+    """Tests that rows added after training are assigned, not retrained."""
+    store = _store(tmp_path / "store", n_probes=16)
+    store.add_batch([_chunk(i, v) for i, v in enumerate(vectors[:400])])
+    assert store.index is not None and not store.index.is_trained
+    # Below the training threshold, search is exact.
+    assert store.search(vectors[3].tolist(), top_k=1)[0].id == "3"
+
+    store.add_batch([_chunk(i, v) for i, v in enumerate(vectors[400:], start=400)])
+    centroids = store.index.centroids
+    store.add_batch([_chunk(5000, vectors[10] * 2)])
+
+    assert store.index.centroids is centroids
+    assert len(store.index) == len(vectors) + 1
+    results = store.search(vectors[10].tolist(), top_k=2)
+    assert {chunk.id for chunk in results} == {"10", "5000"}
+
+
+@pytest.mark.unit
+def test_index_is_retrained_as_the_store_grows(
+    tmp_path: Path, vectors: np.ndarray
+) -> None:
+    """Tests that a store filled cluster by cluster retrains on all of them."""
+    path = tmp_path / "store"
+    anchors = vectors[:20]
+    store = _store(path)
+    assert store.index is not None
+    store.index.min_train_size = 200
+    # Rows arrive grouped by cluster, as files of one directory do.
+    order = np.argsort(np.argmax(vectors @ anchors.T, axis=1), kind="stable")
+    for start in range(0, len(order), 100):
+        rows = order[start : start + 100]
+        store.add_batch([_chunk(int(i), vectors[i]) for i in rows])
+        if start == 100:
+            first_centroids = store.index.centroids
+
+    assert store.index.trained_size == 1600
+    assert store.index.centroids is not first_centroids
+    assert len(store.index) == len(vectors)
+
+    reloaded = NumpyCodeRepository(
+        str(path), index=IVFIndex(n_lists=16, n_probes=4, min_train_size=200)
+    )
+    assert reloaded.index is not None
+    assert reloaded.index.trained_size == 1600
+    assert not reloaded.index.needs_training(len(vectors))
+    assert reloaded.index.needs_training(3200)
+
+
+@pytest.mark.unit
+def test_index_persists_and_survives_compaction(
+    tmp_path: Path, vectors: np.ndarray
+) -> None:
+    """Tests that a reloaded and a compacted store keep the index consistent."""
+    path = tmp_path / "store"
+    store = _store(path)
+    store.add_batch([_chunk(i, v) for i, v in enumerate(vectors)])
+    store.delete_batch([str(i) for i in range(0, 2000, 2)])
+    query = vectors[11] / np.linalg.norm(vectors[11])
+    expected = [chunk.id for chunk in store.search(query.tolist(), top_k=5)]
+
+    reloaded = _store(path)
+    assert reloaded.index is not None and reloaded.index.is_trained
+    assert store.index is not None
+    np.testing.assert_array_equal(reloaded.index.centroids, store.index.centroids)
+    assert [chunk.id for chunk in reloaded.search(query.tolist(), top_k=5)] == expected
+
+    reloaded.compact()
+    assert len(reloaded.index) == 1000
+    assert [chunk.id for chunk in reloaded.search(query.tolist(), top_k=5)] == expected
+    assert [
+        chunk.id for chunk in _store(path).search(query.tolist(), top_k=5)
+    ] == expected
@@ -0,0 +1,209 @@
+"""
+Unit tests for the InMemoryGraphRepository.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.domain.entities.graph_entities import (
+    CallsEdge,
+    ClassNode,
+    ContainsEdge,
+    FileNode,
+    FunctionNode,
+    ImportsEdge,
+    NodeType,
+)
+from src.infrastructure.database.memory_graph import InMemoryGraphRepository
+from src.infrastructure.parser.code_parser import CodeParser
+
+SAMPLE_CODE = """
+class Service:
+    def run(self):
+        helper()
+
+    def stop(self):
+        helper()
+
+def helper():
+    pass
+"""
+
+
+@pytest.fixture
+def repository() -> InMemoryGraphRepository:
+    """Fixture to provide a repository holding a parsed sample file."""
+    parsed = CodeParser().parse("app.py", SAMPLE_CODE)
+    repository = InMemoryGraphRepository()
+    repository.add_nodes(parsed.nodes)
+    repository.add_edges(parsed.edges)
+    return repository
+
+
+@pytest.mark.unit
+def test_queries_match_graph_structure(repository: InMemoryGraphRepository) -> None:
+    """Tests the caller and method lookups on a parsed file."""
+    callers = repository.get_function_callers("helper")
+    methods = repository.get_methods_in_class("Service")
+
+    assert sorted(c["caller_id"] for c in callers) == ["app.py::run", "app.py::stop"]
+    assert {c["caller_name"] for c in callers} == {"run", "stop"}
+    assert sorted(m["method_name"] for m in methods) == ["run", "stop"]
+    assert repository.get_function_callers("missing") == []
+
+
+@pytest.mark.unit
+def test_class_dependencies_follow_import_edges() -> None:
+    """Tests that importers of a class are found through IMPORTS edges."""
+    repository = InMemoryGraphRepository()
+    repository.add_nodes(
+        [
+            FileNode(id="a.py"),
+            FileNode(id="b.py"),
+            ClassNode(id="b.py::Model", properties={"name": "Model"}),
+        ]
+    )
+    repository.add_edges(
+        [
+            ImportsEdge(source_id="a.py", target_id="b.py::Model"),
+            ImportsEdge(source_id="a.py", target_id="os"),
+        ]
+    )
+
+    assert repository.get_class_dependencies("Model") == [{"importer_id": "a.py"}]
+
+
+@pytest.mark.unit
+def test_edges_with_mismatched_types_are_ignored() -> None:
+    """Tests that typed endpoints must match the stored node types."""
+    repository = InMemoryGraphRepository()
+    repository.add_nodes([FunctionNode(id="f", properties={"name": "f"})])
+    repository.add_nodes([FunctionNode(id="g", properties={"name": "g"})])
+    repository.add_edges(
+        [
+            CallsEdge(
+                source_id="g",
+                target_id="f",
+                source_type=NodeType.CLASS,
+                target_type=NodeType.FUNCTION,
+            ),
+            CallsEdge(source_id="g", target_id="f"),
+            CallsEdge(source_id="g", target_id="f"),
+        ]
+    )
+
+    assert repository.get_function_callers("f") == [
+        {"caller_id": "g", "caller_name": "g"}
+    ]
+
+
+@pytest.mark.unit
+def test_delete_nodes_removes_their_edges(
+    repository: InMemoryGraphRepository,
+) -> None:
+    """Tests that deleted nodes disappear from query results."""
+    repository.delete_nodes(["app.py::run"])
+
+    callers = repository.get_function_callers("helper")
+    assert [c["caller_id"] for c in callers] == ["app.py::stop"]
+    assert [m["method_name"] for m in repository.get_methods_in_class("Service")] == [
+        "stop"
+    ]
+
+    repository.delete_nodes(["app.py", "app.py::Service", "app.py::stop"])
+    assert len(repository) == 1
+    assert repository.get_function_callers("helper") == []
+
+
+@pytest.mark.unit
+def test_delete_edges_keeps_endpoints(repository: InMemoryGraphRepository) -> None:
+    """Tests that deleting an edge leaves both nodes and other edges intact."""
+    repository.delete_edges(
+        [
+            CallsEdge(source_id="app.py::run", target_id="app.py::helper"),
+            CallsEdge(source_id="app.py::missing", target_id="app.py::helper"),
+        ]
+    )
+
+    callers = repository.get_function_callers("helper")
+    assert [c["caller_id"] for c in callers] == ["app.py::stop"]
+    assert len(repository.get_methods_in_class("Service")) == 2
+
+
+@pytest.mark.unit
+def test_rename_file_rekeys_owned_nodes(repository: InMemoryGraphRepository) -> None:
+    """Tests that renaming a file moves its nodes and keeps their edges."""
+    repository.rename_file("app.py", "pkg/app.py")
+
+    callers = repository.get_function_callers("helper")
+    assert sorted(c["caller_id"] for c in callers) == [
+        "pkg/app.py::run",
+        "pkg/app.py::stop",
+    ]
+    repository.delete_nodes(["app.py::run"])
+    assert len(repository.get_function_callers("helper")) == 2
+
+
+@pytest.mark.unit
+def test_snapshot_round_trip(
+    repository: InMemoryGraphRepository, tmp_path: Path
+) -> None:
+    """Tests that a saved snapshot loads back into an equivalent graph."""
+    snapshot_path = str(tmp_path / "graph" / "graph.snapshot")
+    repository.delete_nodes(["app.py::stop"])
+    repository.add_edges(
+        [
+            ContainsEdge(
+                source_id="app.py", target_id="app.py::helper", properties={"x": 1}
+            )
+        ]
+    )
+    repository.snapshot_path = snapshot_path
+    repository.close()
+
+    loaded = InMemoryGraphRepository(snapshot_path)
+
+    assert len(loaded) == len(repository) == 4
+    assert loaded.get_function_callers("helper") == [
+        {"caller_id": "app.py::run", "caller_name": "run"}
+    ]
+    assert loaded.get_methods_in_class("Service") == [
+        {"method_id": "app.py::run", "method_name": "run"}
+    ]
+
+
+@pytest.mark.unit
+def test_clear_database_empties_graph(repository: InMemoryGraphRepository) -> None:
+    """Tests that clearing removes every node."""
+    repository.clear_database()
+
+    assert len(repository) == 0
+    assert repository.get_methods_in_class("Service") == []
+
+
+@pytest.mark.unit
+def test_replace_files_swaps_only_that_files_subgraph(
+    repository: InMemoryGraphRepository,
+) -> None:
+    """Tests that replacing a file leaves other files untouched."""
+    other = CodeParser().parse("other.py", "def helper():\n    pass\n")
+    repository.replace_files([other])
+    updated = CodeParser().parse(
+        "app.py",
+        "class Service:\n    def run(self):\n        helper()\n\ndef helper():\n    pass\n",
+    )
+
+    repository.replace_files([updated])
+
+    assert sorted(repository.get_file_ids()) == ["app.py", "other.py"]
+    assert [m["method_name"] for m in repository.get_methods_in_class("Service")] == [
+        "run"
+    ]
+    assert [c["caller_id"] for c in repository.get_function_callers("helper")] == [
+        "app.py::run"
+    ]
+
+    repository.delete_files(["app.py"])
+    assert repository.get_file_ids() == ["other.py"]
+    assert len(repository) == 2
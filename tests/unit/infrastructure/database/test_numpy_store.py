@@ -0,0 +1,350 @@
+"""
+Unit tests for the NumpyCodeRepository.
+"""
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from src.domain.entities.code_chunk import ChunkRecord
+from src.domain.entities.search_filters import SearchFilters
+from src.infrastructure.database.ivf_index import IVFIndex
+from src.infrastructure.database.numpy_store import VECTORS_FILE, NumpyCodeRepository
+
+
+def _chunk(index: int, embedding: list[float]) -> ChunkRecord:
+    return ChunkRecord(
+        id=f"a.py::{index}",
+        file_path="a.py",
+        content=f"chunk {index}",
+        start_line=index,
+        end_line=index,
+        embedding=embedding,
+        metadata={"file_path": "a.py"},
+    )
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    """Fixture to provide reproducible random embeddings."""
+    return np.random.default_rng(0).normal(size=(50, 16)).astype(np.float32)
+
+
+@pytest.fixture
+def repository(tmp_path: Path, vectors: np.ndarray) -> NumpyCodeRepository:
+    """Fixture to provide a store holding one chunk per embedding."""
+    repository = NumpyCodeRepository(str(tmp_path / "store"))
+    repository.add_batch([_chunk(i, v.tolist()) for i, v in enumerate(vectors[:30])])
+    repository.add_batch(
+        [_chunk(i, v.tolist()) for i, v in enumerate(vectors[30:], start=30)]
+    )
+    return repository
+
+
+def _exact_top_k(vectors: np.ndarray, query: np.ndarray, k: int) -> list[str]:
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    order = np.argsort(-(normalized @ query))[:k]
+    return [f"a.py::{i}" for i in order]
+
+
+@pytest.mark.unit
+def test_search_returns_cosine_top_k_in_order(
+    repository: NumpyCodeRepository, vectors: np.ndarray
+) -> None:
+    """Tests that search matches a brute-force cosine ranking."""
+    query = vectors[7] + 0.1
+
+    results = repository.search(query.tolist(), top_k=5)
+
+    assert [chunk.id for chunk in results] == _exact_top_k(vectors, query, 5)
+    assert results[0].content == "chunk 7"
+    assert len(repository.search(query.tolist(), top_k=500)) == 50
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"quantization": "int8"}, {"index": IVFIndex(n_lists=4, min_train_size=10)}],
+)
+def test_search_many_matches_one_search_per_query(
+    tmp_path: Path,
+    vectors: np.ndarray,
+    monkeypatch: pytest.MonkeyPatch,
+    options: dict[str, Any],
+) -> None:
+    """Tests that batched search returns what each single search returns."""
+    # Small score groups, so that the queries are split across several.
+    monkeypatch.setattr("src.infrastructure.database.numpy_store._MAX_SCORES", 100)
+    repository = NumpyCodeRepository(str(tmp_path / "store"), **options)
+    repository.add_batch([_chunk(i, v.tolist()) for i, v in enumerate(vectors)])
+    repository.delete_batch(["a.py::7"])
+    queries = (vectors[:8] + 0.1).tolist()
+
+    for filters in [None, SearchFilters(path_prefix="a.py")]:
+        batched = repository.search_many(queries, top_k=5, filters=filters)
+        assert [[chunk.id for chunk in results] for results in batched] == [
+            [chunk.id for chunk in repository.search(query, 5, filters)]
+            for query in queries
+        ]
+    assert "a.py::7" not in [chunk.id for chunk in batched[7]]
+    assert repository.search_many([], top_k=5) == []
+    assert repository.search_many(queries[:2], top_k=0) == [[], []]
+
+
+@pytest.mark.unit
+def test_deleted_and_replaced_chunks(
+    repository: NumpyCodeRepository, vectors: np.ndarray
+) -> None:
+    """Tests that deleted chunks are never returned and re-adds replace rows."""
+    repository.delete_batch(["a.py::7", "unknown"])
+    assert "a.py::7" not in [c.id for c in repository.search(vectors[7].tolist(), 50)]
+
+    repository.add_batch([_chunk(3, vectors[7].tolist())])
+
+    assert len(repository) == 49
+    assert repository.search(vectors[7].tolist(), top_k=1)[0].id == "a.py::3"
+    assert repository.get_existing_chunk_ids(["a.py::3", "a.py::7"]) == {"a.py::3"}
+
+
+@pytest.mark.unit
+def test_store_reloads_from_disk(
+    repository: NumpyCodeRepository, vectors: np.ndarray, tmp_path: Path
+) -> None:
+    """Tests that a new instance sees the same chunks, deletions and vectors."""
+    repository.delete_batch(["a.py::0"])
+
+    reloaded = NumpyCodeRepository(str(tmp_path / "store"))
+
+    assert len(reloaded) == 49
+    assert isinstance(reloaded._vectors, np.memmap)
+    query = vectors[12]
+    assert [c.id for c in reloaded.search(query.tolist(), 3)] == [
+        c.id for c in repository.search(query.tolist(), 3)
+    ]
+    (record,) = reloaded.get_batch(["a.py::12"])
+    assert record.embedding is not None
+    np.testing.assert_allclose(
+        np.asarray(record.embedding), query / np.linalg.norm(query), rtol=1e-6
+    )
+
+
+@pytest.mark.unit
+def test_compact_reclaims_deleted_rows(
+    repository: NumpyCodeRepository, vectors: np.ndarray, tmp_path: Path
+) -> None:
+    """Tests that compaction drops deleted rows and keeps search results."""
+    repository.delete_batch([f"a.py::{i}" for i in range(0, 50, 2)])
+    query = vectors[11].tolist()
+    before = [c.id for c in repository.search(query, 5)]
+
+    repository.compact()
+
+    assert (tmp_path / "store" / VECTORS_FILE).stat().st_size == 25 * 16 * 4
+    assert [c.id for c in repository.search(query, 5)] == before
+    assert len(NumpyCodeRepository(str(tmp_path / "store"))) == 25
+
+
+@pytest.mark.unit
+def test_store_compacts_itself_once_enough_rows_are_deleted(
+    repository: NumpyCodeRepository, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Tests that deletions past the compaction ratio rewrite the files."""
+    monkeypatch.setattr("src.infrastructure.database.numpy_store._MIN_COMPACT_ROWS", 10)
+    vectors_file = tmp_path / "store" / VECTORS_FILE
+
+    repository.delete_batch([f"a.py::{i}" for i in range(10)])
+    assert vectors_file.stat().st_size == 50 * 16 * 4
+
+    repository.delete_batch([f"a.py::{i}" for i in range(10, 15)])
+    assert vectors_file.stat().st_size == 35 * 16 * 4
+    assert len(NumpyCodeRepository(str(tmp_path / "store"))) == 35
+
+    repository.compact_ratio = None
+    repository.delete_batch([f"a.py::{i}" for i in range(15, 40)])
+    assert vectors_file.stat().st_size == 35 * 16 * 4
+
+
+@pytest.mark.unit
+def test_row_arrays_grow_geometrically(tmp_path: Path, vectors: np.ndarray) -> None:
+    """Tests that small batches reallocate the per-row arrays only a few times."""
+    repository = NumpyCodeRepository(str(tmp_path / "store"))
+    buffer, reallocations = repository._alive_buffer, 0
+    for i, vector in enumerate(vectors):
+        repository.add_batch([_chunk(i, vector.tolist())])
+        if repository._alive_buffer is not buffer:
+            buffer, reallocations = repository._alive_buffer, reallocations + 1
+
+    assert reallocations <= 7
+    assert len(repository._alive) == len(repository._symbol_types) == 50
+    repository.delete_batch(["a.py::3"])
+    assert np.flatnonzero(~repository._alive).tolist() == [3]
+
+
+@pytest.mark.unit
+def test_interrupted_batch_is_ignored_on_load(
+    repository: NumpyCodeRepository, tmp_path: Path
+) -> None:
+    """Tests that vector rows without a logged chunk are dropped on load."""
+    with open(tmp_path / "store" / VECTORS_FILE, "ab") as f:
+        f.write(np.ones(16, dtype="<f4").tobytes())
+
+    reloaded = NumpyCodeRepository(str(tmp_path / "store"))
+    reloaded.add_batch([_chunk(99, [1.0] * 16)])
+
+    assert reloaded.search([1.0] * 16, top_k=1)[0].id == "a.py::99"
+
+
+@pytest.mark.unit
+def test_rejects_mismatched_dimensions(repository: NumpyCodeRepository) -> None:
+    """Tests that embeddings must match the store's dimension."""
+    with pytest.raises(ValueError):
+        repository.add_batch([_chunk(100, [1.0, 2.0])])
+
+
+def _scoped_chunk(
+    index: int, file_path: str, symbol_type: str, embedding: np.ndarray
+) -> ChunkRecord:
+    return ChunkRecord(
+        id=f"{file_path}::{index}",
+        file_path=file_path,
+        content=f"chunk {index}",
+        start_line=index,
+        end_line=index,
+        embedding=embedding,
+        metadata={"file_path": file_path, "symbol_type": symbol_type},
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("with_index", [False, True])
+def test_search_applies_filters_before_ranking(
+    tmp_path: Path, with_index: bool
+) -> None:
+    """Tests that filtered search ranks only the chunks in scope."""
+    rng = np.random.default_rng(0)
+    files = ["svc/a/main.py", "svc/a/ui.ts", "svc/b/main.py", "lib/util.py"]
+    chunks = [
+        _scoped_chunk(
+            i,
+            files[i % 4],
+            "Function" if i % 3 else "Class",
+            rng.normal(size=16).astype(np.float32),
+        )
+        for i in range(400)
+    ]
+    repository = NumpyCodeRepository(
+        str(tmp_path / "store"),
+        index=(
+            IVFIndex(n_lists=8, n_probes=2, min_train_size=100) if with_index else None
+        ),
+    )
+    repository.add_batch(chunks)
+    repository.delete_batch([chunks[0].id])
+    query = rng.normal(size=16).astype(np.float32)
+    query /= np.linalg.norm(query)
+
+    for filters in [
+        SearchFilters(path_prefix="svc/a"),
+        SearchFilters(path_prefix="svc", languages=["python"]),
+        SearchFilters(extensions=[".ts"], symbol_types=["Class"]),
+        SearchFilters(symbol_types=["Class"]),
+    ]:
+        in_scope = [
+            chunk
+            for chunk in chunks[1:]
+            if filters.matches(chunk.file_path, chunk.metadata)
+        ]
+        expected = sorted(
+            in_scope,
+            key=lambda chunk: -np.dot(
+                np.frombuffer(chunk.embedding, dtype=np.float32), query
+            )
+            / np.linalg.norm(np.frombuffer(chunk.embedding, dtype=np.float32)),
+        )[:5]
+
+        results = repository.search(query.tolist(), top_k=5, filters=filters)
+
+        if with_index:
+            # Approximate, but still only ever from the scope.
+            assert len(results) == 5
+            assert {chunk.id for chunk in results} <= {chunk.id for chunk in in_scope}
+        else:
+            assert [chunk.id for chunk in results] == [chunk.id for chunk in expected]
+
+    assert (
+        repository.search(query.tolist(), filters=SearchFilters(path_prefix="x")) == []
+    )
+    repository.compact()
+    results = repository.search(
+        query.tolist(), top_k=500, filters=SearchFilters(path_prefix="lib")
+    )
+    assert len(results) == 100
+    assert {chunk.file_path for chunk in results} == {"lib/util.py"}
+
+
+@pytest.mark.unit
+def test_keyword_search_follows_additions_and_deletions(
+    tmp_path: Path, vectors: np.ndarray
+) -> None:
+    """Tests BM25 search over the stored chunk text, with filters."""
+
+    def chunk(chunk_id: str, file_path: str, content: str) -> ChunkRecord:
+        return ChunkRecord(chunk_id, file_path, content, 1, 1, vectors[0])
+
+    repository = NumpyCodeRepository(str(tmp_path / "store"))
+    repository.add_batch(
+        [
+            chunk("a", "svc/store.py", "def get_existing_chunk_ids(): pass"),
+            chunk("b", "lib/util.py", "existing = chunk_ids"),
+        ]
+    )
+
+    results = repository.keyword_search("get_existing_chunk_ids", top_k=5)
+    assert [chunk.id for chunk in results] == ["a", "b"]
+    filtered = repository.keyword_search(
+        "existing", filters=SearchFilters(path_prefix="lib")
+    )
+    assert [chunk.id for chunk in filtered] == ["b"]
+
+    repository.delete_batch(["a"])
+    repository.add_batch([chunk("c", "svc/new.py", "class ExistingChunks: pass")])
+    assert [chunk.id for chunk in repository.keyword_search("existing chunks")] == [
+        "c",
+        "b",
+    ]
+    assert [chunk.id for chunk in repository.keyword_search("pass")] == ["c"]
+
+
+@pytest.mark.unit
+def test_path_filters_match_paths_relative_to_the_indexed_root(
+    tmp_path: Path,
+) -> None:
+    """Tests path prefixes against chunks stored with repo-prefixed paths."""
+    root = "/home/u/monorepo"
+    relative_paths = ["services/billing/api.py", "services/web/api.py", "lib/x.py"]
+    rng = np.random.default_rng(0)
+    chunks = [
+        ChunkRecord(
+            id=str(i),
+            file_path=f"{root}/{relative_paths[i % 3]}",
+            content=f"chunk {i}",
+            start_line=i,
+            end_line=i,
+            embedding=rng.normal(size=8).astype(np.float32),
+            metadata={"relative_path": relative_paths[i % 3]},
+        )
+        for i in range(30)
+    ]
+    repository = NumpyCodeRepository(str(tmp_path / "store"))
+    repository.add_batch(chunks)
+    filters = SearchFilters(path_prefix="services/billing")
+
+    results = repository.search([1.0] * 8, top_k=30, filters=filters)
+    keyword_results = repository.keyword_search("chunk", top_k=30, filters=filters)
+
+    assert len(results) == len(keyword_results) == 10
+    assert {chunk.file_path for chunk in results + keyword_results} == {
+        f"{root}/services/billing/api.py"
+    }
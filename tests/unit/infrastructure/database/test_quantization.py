@@ -0,0 +1,140 @@
+"""
+Unit tests for quantized and truncated first-stage scoring in the
+NumpyCodeRepository.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.domain.entities.code_chunk import ChunkRecord
+from src.infrastructure.database.numpy_store import NumpyCodeRepository
+from src.infrastructure.database.quantization import QuantizedVectors
+
+
+def _chunk(index: int, embedding: np.ndarray) -> ChunkRecord:
+    return ChunkRecord(
+        id=str(index),
+        file_path="a.py",
+        content=f"chunk {index}",
+        start_line=index,
+        end_line=index,
+        embedding=embedding,
+    )
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    """Fixture to provide reproducible random embeddings."""
+    return np.random.default_rng(0).normal(size=(1000, 64)).astype(np.float32)
+
+
+def _exact_ids(vectors: np.ndarray, query: np.ndarray, k: int) -> list[str]:
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [str(i) for i in np.argsort(-(normalized @ query))[:k]]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("quantization", "size_ratio"), [("float16", 2), ("int8", 64 * 4 / 68)]
+)
+def test_quantized_search_is_rescored_to_exact_results(
+    tmp_path: Path, vectors: np.ndarray, quantization: str, size_ratio: float
+) -> None:
+    """Tests that rescoring recovers the exact ranking from a smaller copy."""
+    store = NumpyCodeRepository(str(tmp_path / "store"), quantization=quantization)
+    store.add_batch([_chunk(i, v) for i, v in enumerate(vectors[:600])])
+    store.add_batch([_chunk(i, v) for i, v in enumerate(vectors[600:], start=600)])
+    assert store.quantized is not None
+    assert store._vectors.nbytes / store.quantized.nbytes == pytest.approx(size_ratio)
+
+    for query in vectors[:20] + 0.5:
+        query = query / np.linalg.norm(query)
+        results = store.search(query.tolist(), top_k=10)
+        assert [chunk.id for chunk in results] == _exact_ids(vectors, query, 10)
+
+
+@pytest.mark.unit
+def test_int8_scores_approximate_float32_scores(vectors: np.ndarray) -> None:
+    """Tests that dequantized int8 scores stay close to the exact ones."""
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    quantized = QuantizedVectors("unused", "int8")
+    codes, scales = quantized._quantize(normalized)
+
+    assert scales is not None
+    assert codes.dtype == np.int8 and np.abs(codes).max() == 127
+    np.testing.assert_allclose(codes * scales[:, None], normalized, atol=0.01)
+
+
+@pytest.mark.unit
+def test_quantized_copy_is_rebuilt_and_compacted(
+    tmp_path: Path, vectors: np.ndarray
+) -> None:
+    """Tests enabling quantization on an existing store, then compacting it."""
+    path = str(tmp_path / "store")
+    NumpyCodeRepository(path).add_batch(
+        [_chunk(i, v) for i, v in enumerate(vectors[:100])]
+    )
+
+    store = NumpyCodeRepository(path, quantization="int8")
+    assert store.quantized is not None and len(store.quantized) == 100
+    store.delete_batch([str(i) for i in range(50)])
+    store.compact()
+    assert len(store.quantized) == 50
+
+    query = vectors[70] / np.linalg.norm(vectors[70])
+    reloaded = NumpyCodeRepository(path, quantization="int8")
+    assert reloaded.search(query.tolist(), top_k=1)[0].id == "70"
+    assert [chunk.id for chunk in reloaded.search(query.tolist(), top_k=5)] == [
+        str(50 + int(i)) for i in _exact_ids(vectors[50:100], query, 5)
+    ]
+
+
+@pytest.mark.unit
+def test_unknown_quantization_is_rejected(tmp_path: Path) -> None:
+    """Tests that an unsupported quantization raises a ValueError."""
+    with pytest.raises(ValueError, match="Unknown quantization"):
+        NumpyCodeRepository(str(tmp_path), quantization="int4")
+
+
+@pytest.fixture
+def matryoshka_vectors() -> np.ndarray:
+    """Fixture to provide embeddings whose leading dimensions dominate."""
+    rng = np.random.default_rng(1)
+    decay = 1 / np.sqrt(1 + np.arange(128) / 4)
+    return (rng.normal(size=(1000, 128)) * decay).astype(np.float32)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("quantization", [None, "int8"])
+def test_truncated_prefilter_is_reranked_with_full_vectors(
+    tmp_path: Path, matryoshka_vectors: np.ndarray, quantization: str | None
+) -> None:
+    """Tests that a 32-dim first stage plus rescoring matches exact search."""
+    store = NumpyCodeRepository(
+        str(tmp_path / "store"),
+        quantization=quantization,
+        prefilter_dimension=32,
+        prefilter_candidates=100,
+    )
+    store.add_batch([_chunk(i, v) for i, v in enumerate(matryoshka_vectors)])
+    assert store.quantized is not None
+    assert store.quantized._vectors.shape == (1000, 32)
+    assert store.quantized.vectors_file.endswith(
+        "vectors.d32.i8" if quantization else "vectors.d32.f32"
+    )
+
+    for query in matryoshka_vectors[:20] * 1.1:
+        query = query / np.linalg.norm(query)
+        results = store.search(query.tolist(), top_k=5)
+        assert [chunk.id for chunk in results] == _exact_ids(
+            matryoshka_vectors, query, 5
+        )
+
+
+@pytest.mark.unit
+def test_untruncated_float32_copy_is_rejected(tmp_path: Path) -> None:
+    """Tests that a float32 copy without truncation is refused."""
+    with pytest.raises(ValueError, match="truncated"):
+        QuantizedVectors(str(tmp_path), "float32")
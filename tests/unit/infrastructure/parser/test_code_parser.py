@@ -8,9 +8,10 @@ from src.domain.entities.graph_entities import (
     CallsEdge,
     ClassNode,
     ContainsEdge,
+    EdgeType,
     FileNode,
     FunctionNode,
-    ImportsEdge,
+    ImportReference,
     NodeType,
 )
 from src.infrastructure.parser.code_parser import CodeParser
@@ -118,13 +119,42 @@ def test_contains_edge_creation(parsed_data: ParsedData) -> None:
 
 
 @pytest.mark.unit
-def test_import_edge_extraction(parsed_data: ParsedData) -> None:
-    """Tests that IMPORTS edges are correctly extracted."""
-    import_edges = [e for e in parsed_data.edges if isinstance(e, ImportsEdge)]
-    assert len(import_edges) == 2
-    imported_modules = {edge.target_id for edge in import_edges}
-    assert "os" in imported_modules
-    assert "sys" in imported_modules
+def test_import_reference_extraction(parsed_data: ParsedData) -> None:
+    """Tests that imports are kept as references for cross-file resolution."""
+    assert parsed_data.imports == [
+        ImportReference(module="os"),
+        ImportReference(module="sys", name="argv"),
+    ]
+    assert not any(e.type == EdgeType.IMPORTS for e in parsed_data.edges)
+
+
+@pytest.mark.unit
+def test_relative_and_aliased_imports(parser: CodeParser) -> None:
+    """Tests relative levels, aliases and wildcard imports."""
+    code = (
+        "import a.b as c\n"
+        "from ..pkg import x as y, z\n"
+        "from . import m\n"
+        "from r import *\n"
+    )
+
+    parsed = parser.parse("mod.py", code)
+
+    assert parsed.imports == [
+        ImportReference(module="a.b", alias="c"),
+        ImportReference(module="pkg", level=2, name="x", alias="y"),
+        ImportReference(module="pkg", level=2, name="z"),
+        ImportReference(module="", level=1, name="m"),
+        ImportReference(module="r", name="*"),
+    ]
+    assert [ref.local_name for ref in parsed.imports[:2]] == ["c", "y"]
+
+
+@pytest.mark.unit
+def test_unresolved_calls_are_kept_as_references(parsed_data: ParsedData) -> None:
+    """Tests that calls to names defined elsewhere become call references."""
+    references = {(call.source_id, call.name) for call in parsed_data.calls}
+    assert ("test_module.py::helper_function", "print") in references
 
 
 @pytest.mark.unit
@@ -157,5 +187,94 @@ def test_full_parse_node_and_edge_counts(parsed_data: ParsedData) -> None:
     # 1 FileNode + 2 ClassNodes + 3 FunctionNodes = 6 nodes
     assert len(parsed_data.nodes) == 6
 
-    # 5 ContainsEdges + 2 ImportsEdges + 3 CallsEdges = 10 edges
-    assert len(parsed_data.edges) == 10
+    # 5 ContainsEdges + 3 CallsEdges = 8 edges; imports are resolved later
+    assert len(parsed_data.edges) == 8
+
+
+@pytest.mark.unit
+def test_decorated_definitions_are_not_duplicated(parser: CodeParser) -> None:
+    """Tests that decorated classes and functions yield one node and edge each."""
+    code = "@dataclass\nclass Data:\n    pass\n\n@cache\ndef compute():\n    pass\n"
+
+    parsed = parser.parse("decorated.py", code)
+
+    assert [n.id for n in parsed.nodes] == [
+        "decorated.py",
+        "decorated.py::Data",
+        "decorated.py::compute",
+    ]
+    contains_edges = [e for e in parsed.edges if isinstance(e, ContainsEdge)]
+    assert len(contains_edges) == 2
+
+
+@pytest.mark.unit
+def test_calls_are_attributed_to_innermost_scope(parser: CodeParser) -> None:
+    """Tests scope resolution for nested, decorated and module-level calls."""
+    code = """
+def helper():
+    pass
+
+class Outer:
+    @staticmethod
+    def method():
+        helper()
+
+        def inner():
+            helper()
+
+        return inner
+
+    value = helper()
+
+helper()
+"""
+    parsed = parser.parse("scopes.py", code)
+
+    calls = {
+        (e.source_id, e.target_id) for e in parsed.edges if isinstance(e, CallsEdge)
+    }
+    assert calls == {
+        ("scopes.py::method", "scopes.py::helper"),
+        ("scopes.py::inner", "scopes.py::helper"),
+        ("scopes.py::Outer", "scopes.py::helper"),
+        ("scopes.py", "scopes.py::helper"),
+    }
+    contains = {
+        (e.source_id, e.target_id) for e in parsed.edges if isinstance(e, ContainsEdge)
+    }
+    assert ("scopes.py::Outer", "scopes.py::method") in contains
+    assert ("scopes.py", "scopes.py::inner") in contains
+
+
+@pytest.mark.unit
+def test_definitions_carry_line_ranges(parser: CodeParser) -> None:
+    """Tests that classes and functions record their lines, decorators included."""
+    code = "import os\n\n@dataclass\nclass A:\n    def f(self):\n        pass\n\n    @property\n    def g(self):\n        return 1\n"
+
+    parsed = parser.parse("ranges.py", code)
+
+    ranges = {
+        n.id: (n.properties["start_line"], n.properties["end_line"])
+        for n in parsed.nodes
+        if n.type != NodeType.FILE
+    }
+    assert ranges == {
+        "ranges.py::A": (3, 10),
+        "ranges.py::f": (5, 6),
+        "ranges.py::g": (8, 10),
+    }
+
+
+@pytest.mark.unit
+def test_edges_carry_endpoint_types(parsed_data: ParsedData) -> None:
+    """Tests that edges record the node types of resolved endpoints."""
+    edge_types = {
+        (e.type, e.source_id, e.target_id): (e.source_type, e.target_type)
+        for e in parsed_data.edges
+    }
+    assert edge_types[
+        (EdgeType.CONTAINS, "test_module.py::MyClass", "test_module.py::method_a")
+    ] == (NodeType.CLASS, NodeType.FUNCTION)
+    assert edge_types[
+        (EdgeType.CALLS, "test_module.py", "test_module.py::helper_function")
+    ] == (NodeType.FILE, NodeType.FUNCTION)
@@ -0,0 +1,109 @@
+"""
+Unit tests for the ParallelCodeParser.
+"""
+
+import asyncio
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from src.domain.entities.graph_entities import ParsedData
+from src.infrastructure.parser.code_parser import CodeParser
+from src.infrastructure.parser.compact import decode_parsed_data, encode_parsed_data
+from src.infrastructure.parser.parallel_parser import ParallelCodeParser
+from src.infrastructure.parser.parse_cache import ParseCache
+
+SAMPLE_CODE = """
+import os
+
+class Greeter:
+    def greet(self):
+        helper()
+
+def helper():
+    return os.getcwd()
+"""
+
+
+@pytest.fixture(scope="module")
+def parallel_parser() -> Iterator[ParallelCodeParser]:
+    """Fixture to provide a ParallelCodeParser with a small worker pool."""
+    parser = ParallelCodeParser(max_workers=2, files_per_task=3, max_pending_tasks=2)
+    yield parser
+    parser.close()
+
+
+def _as_comparable(parsed_data: ParsedData) -> tuple[set[str], set[str]]:
+    nodes = {f"{n.type.value}:{n.id}" for n in parsed_data.nodes}
+    edges = {f"{e.type.value}:{e.source_id}->{e.target_id}" for e in parsed_data.edges}
+    return nodes, edges
+
+
+@pytest.mark.unit
+def test_compact_round_trip_preserves_concrete_types() -> None:
+    """Tests that encoding and decoding keeps node and edge classes."""
+    parsed_data = CodeParser().parse("sample.py", SAMPLE_CODE)
+
+    decoded = decode_parsed_data(encode_parsed_data(parsed_data))
+
+    assert decoded == parsed_data
+    assert [type(n) for n in decoded.nodes] == [type(n) for n in parsed_data.nodes]
+    assert [type(e) for e in decoded.edges] == [type(e) for e in parsed_data.edges]
+
+
+@pytest.mark.unit
+def test_parse_stream_matches_serial_parsing(
+    parallel_parser: ParallelCodeParser,
+) -> None:
+    """Tests that every file is parsed exactly once with serial-equivalent output."""
+    files = [(f"module_{i}.py", SAMPLE_CODE) for i in range(10)]
+
+    async def collect() -> list[tuple[str, str, ParsedData]]:
+        return [item async for item in parallel_parser.parse_stream(iter(files))]
+
+    results = asyncio.run(collect())
+
+    serial_parser = CodeParser()
+    assert sorted(file_path for file_path, _, _ in results) == sorted(
+        file_path for file_path, _ in files
+    )
+    for file_path, content, parsed_data in results:
+        assert content == SAMPLE_CODE
+        assert _as_comparable(parsed_data) == _as_comparable(
+            serial_parser.parse(file_path, content)
+        )
+
+
+@pytest.mark.unit
+def test_parse_single_file(parallel_parser: ParallelCodeParser) -> None:
+    """Tests the synchronous single-file entry point."""
+    parsed_data = parallel_parser.parse("single.py", SAMPLE_CODE)
+
+    assert parsed_data.file_path == "single.py"
+    assert any(n.id == "single.py::Greeter" for n in parsed_data.nodes)
+
+
+@pytest.mark.unit
+def test_parse_stream_serves_cached_files_without_workers(tmp_path: Path) -> None:
+    """Tests that cached files are yielded and new results are cached."""
+    cache = ParseCache(str(tmp_path))
+    cache.put(
+        cache.hash_content(SAMPLE_CODE),
+        encode_parsed_data(CodeParser().parse("cached.py", SAMPLE_CODE)),
+    )
+    parser = ParallelCodeParser(max_workers=1, cache=cache)
+    files = [("a.py", SAMPLE_CODE), ("b.py", "def other():\n    pass\n")]
+
+    async def collect() -> dict[str, ParsedData]:
+        return {path: data async for path, _, data in parser.parse_stream(files)}
+
+    try:
+        results = asyncio.run(collect())
+    finally:
+        parser.close()
+
+    assert results["a.py"] == CodeParser().parse("a.py", SAMPLE_CODE)
+    assert [n.id for n in results["b.py"].nodes] == ["b.py", "b.py::other"]
+    assert cache.hits == 1
+    assert cache.get("c.py", cache.hash_content(files[1][1])) is not None
@@ -0,0 +1,76 @@
+"""
+Unit tests for the ParseCache.
+"""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.infrastructure.parser.code_parser import CodeParser
+from src.infrastructure.parser.compact import (
+    PARSER_VERSION,
+    decode_parsed_data,
+    encode_parsed_data,
+)
+from src.infrastructure.parser.parse_cache import ParseCache
+
+SAMPLE_CODE = """
+from util import helper
+
+class Service:
+    def run(self):
+        helper()
+"""
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ParseCache:
+    """Fixture to provide an empty cache in a temporary directory."""
+    return ParseCache(str(tmp_path))
+
+
+@pytest.mark.unit
+def test_round_trip_and_rebase(cache: ParseCache, tmp_path: Path) -> None:
+    """Tests that a cached result is returned, re-keyed for another path."""
+    content_hash = cache.hash_content(SAMPLE_CODE)
+    assert cache.get("a.py", content_hash) is None
+
+    cache.put(content_hash, encode_parsed_data(CodeParser().parse("a.py", SAMPLE_CODE)))
+
+    parser = CodeParser()
+    compact = cache.get("a.py", content_hash)
+    assert compact is not None
+    assert decode_parsed_data(compact) == parser.parse("a.py", SAMPLE_CODE)
+    moved = cache.get("pkg/b.py", content_hash)
+    assert moved is not None
+    assert decode_parsed_data(moved) == parser.parse("pkg/b.py", SAMPLE_CODE)
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert (tmp_path / f"python-v{PARSER_VERSION}").is_dir()
+
+
+@pytest.mark.unit
+def test_corrupt_entries_are_misses(cache: ParseCache) -> None:
+    """Tests that an unreadable entry is treated as absent."""
+    content_hash = cache.hash_content(SAMPLE_CODE)
+    cache.put(content_hash, encode_parsed_data(CodeParser().parse("a.py", "")))
+    Path(cache._entry_path(content_hash)).write_bytes(b"not a cache entry")
+
+    assert cache.get("a.py", content_hash) is None
+
+
+@pytest.mark.unit
+def test_parse_stream_skips_parsing_cached_files(cache: ParseCache) -> None:
+    """Tests that CodeParser only parses content missing from the cache."""
+    parser = CodeParser(cache=cache)
+    files = [("a.py", SAMPLE_CODE), ("b.py", SAMPLE_CODE)]
+
+    async def collect() -> list[str]:
+        return [path async for path, _, _ in parser.parse_stream(files)]
+
+    with patch.object(parser, "parse", wraps=parser.parse) as parse:
+        assert asyncio.run(collect()) == ["a.py", "b.py"]
+        assert parse.call_count == 1
+        asyncio.run(collect())
+        assert parse.call_count == 1
@@ -0,0 +1,77 @@
+"""
+Unit tests for the SymbolIndex.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.domain.entities.graph_entities import NodeType, SymbolDefinition
+from src.infrastructure.index_manifest import IndexManifest, ManifestEntry
+from src.infrastructure.parser.symbol_index import SymbolIndex, SymbolLocation
+
+
+def _definition(name: str, node_type: NodeType, line: int) -> SymbolDefinition:
+    return SymbolDefinition(
+        id=f"x::{name}", name=name, type=node_type, start_line=line, end_line=line + 1
+    )
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> SymbolIndex:
+    """Fixture to provide an index built from a manifest."""
+    manifest = IndexManifest(str(tmp_path / "manifest.json"))
+    manifest.record(
+        "models.py",
+        ManifestEntry(
+            content_hash="h1",
+            definitions=[
+                _definition("User", NodeType.CLASS, 1),
+                _definition("user", NodeType.FUNCTION, 10),
+                _definition("UserProfile", NodeType.CLASS, 20),
+            ],
+        ),
+    )
+    manifest.record(
+        "auth.py",
+        ManifestEntry(
+            content_hash="h2",
+            definitions=[_definition("user_login", NodeType.FUNCTION, 3)],
+        ),
+    )
+    manifest.save()
+    return SymbolIndex.from_manifest(IndexManifest(str(tmp_path / "manifest.json")))
+
+
+@pytest.mark.unit
+def test_lookup_ignores_case_and_prefers_exact_case(index: SymbolIndex) -> None:
+    """Tests case-insensitive lookups, optionally restricted to a kind."""
+    assert index.lookup("USER") == [
+        SymbolLocation("User", NodeType.CLASS, "models.py", 1, 2),
+        SymbolLocation("user", NodeType.FUNCTION, "models.py", 10, 11),
+    ]
+    assert [location.name for location in index.lookup("user")] == ["user", "User"]
+    assert [
+        location.start_line for location in index.lookup("user", NodeType.CLASS)
+    ] == [1]
+    assert index.lookup("missing") == []
+
+
+@pytest.mark.unit
+def test_prefix_returns_names_in_order(index: SymbolIndex) -> None:
+    """Tests prefix matching through the sorted name list."""
+    assert [location.name for location in index.prefix("us")] == [
+        "User",
+        "user",
+        "user_login",
+        "UserProfile",
+    ]
+    assert [location.name for location in index.prefix("user", limit=2)] == [
+        "User",
+        "user",
+    ]
+    assert [
+        location.file_path for location in index.prefix("user_", NodeType.FUNCTION)
+    ] == ["auth.py"]
+    assert index.prefix("zz") == []
+    assert len(index) == 3
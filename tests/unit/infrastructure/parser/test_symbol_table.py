@@ -0,0 +1,133 @@
+"""
+Unit tests for the SymbolTable.
+"""
+
+import pytest
+
+from src.domain.entities.graph_entities import EdgeType, NodeType
+from src.infrastructure.parser.code_parser import CodeParser
+from src.infrastructure.parser.symbol_table import SymbolTable, module_name
+
+PROJECT = {
+    "/repo/pkg/__init__.py": "from .util import helper\n",
+    "/repo/pkg/util.py": (
+        "VERSION = 1\n\n"
+        "def helper():\n    pass\n\n"
+        "class Service:\n    def run(self):\n        pass\n"
+    ),
+    "/repo/pkg/app.py": (
+        "import os\n"
+        "from . import util\n"
+        "from .util import Service, VERSION\n"
+        "from pkg.util import helper as h\n"
+        "from missing import gone\n\n"
+        "def main():\n"
+        "    h()\n"
+        "    util.helper()\n"
+        "    Service.run()\n"
+        "    os.getcwd()\n"
+        "    gone()\n"
+    ),
+}
+
+
+@pytest.fixture
+def table() -> SymbolTable:
+    """Fixture to provide a table holding the parsed sample project."""
+    parser = CodeParser()
+    table = SymbolTable("/repo")
+    for file_path, content in PROJECT.items():
+        table.add_parsed_data(parser.parse(file_path, content))
+    return table
+
+
+def _edge_keys(table: SymbolTable, file_path: str) -> set[tuple[str, str, str]]:
+    return {
+        (edge.type.value, edge.source_id, edge.target_id)
+        for edge in table.resolve(file_path)
+    }
+
+
+@pytest.mark.unit
+def test_module_name() -> None:
+    """Tests dotted module names for modules and packages."""
+    assert module_name("pkg/util.py") == ("pkg.util", False)
+    assert module_name("pkg/__init__.py") == ("pkg", True)
+    assert module_name("./top.py") == ("top", False)
+
+
+@pytest.mark.unit
+def test_imports_resolve_to_files_and_symbols(table: SymbolTable) -> None:
+    """Tests that imports link to module files or imported classes/functions."""
+    keys = _edge_keys(table, "/repo/pkg/app.py")
+    imports = {target for kind, _, target in keys if kind == EdgeType.IMPORTS.value}
+
+    assert imports == {
+        "/repo/pkg/util.py",
+        "/repo/pkg/util.py::Service",
+        "/repo/pkg/util.py::helper",
+    }
+    assert _edge_keys(table, "/repo/pkg/__init__.py") == {
+        ("IMPORTS", "/repo/pkg/__init__.py", "/repo/pkg/util.py::helper")
+    }
+
+
+@pytest.mark.unit
+def test_calls_resolve_through_imported_names(table: SymbolTable) -> None:
+    """Tests calls via aliases, module attributes and imported classes."""
+    calls = {
+        (source, target)
+        for kind, source, target in _edge_keys(table, "/repo/pkg/app.py")
+        if kind == EdgeType.CALLS.value
+    }
+
+    assert calls == {
+        ("/repo/pkg/app.py::main", "/repo/pkg/util.py::helper"),
+        ("/repo/pkg/app.py::main", "/repo/pkg/util.py::run"),
+    }
+    edge = next(e for e in table.resolve("/repo/pkg/app.py") if e.type.value == "CALLS")
+    assert (edge.source_type, edge.target_type) == (
+        NodeType.FUNCTION,
+        NodeType.FUNCTION,
+    )
+
+
+@pytest.mark.unit
+def test_removed_files_no_longer_resolve(table: SymbolTable) -> None:
+    """Tests that references to a removed file are dropped."""
+    table.remove_file("/repo/pkg/util.py")
+
+    # Only ``from . import util`` still resolves, to the package itself.
+    assert _edge_keys(table, "/repo/pkg/app.py") == {
+        ("IMPORTS", "/repo/pkg/app.py", "/repo/pkg/__init__.py")
+    }
+    assert table.resolve("/repo/pkg/util.py") == []
+
+
+@pytest.mark.unit
+def test_modules_resolve_by_unique_suffix() -> None:
+    """Tests that a src/ layout module is found by its import name."""
+    table = SymbolTable("/repo")
+    table.add_file("/repo/src/lib/core.py", {}, [], [])
+    table.add_file("/repo/src/lib/__init__.py", {}, [], [])
+
+    assert table.resolve_module("lib.core") == "/repo/src/lib/core.py"
+    assert table.resolve_module("lib") == "/repo/src/lib/__init__.py"
+    table.add_file("/repo/other/lib/core.py", {}, [], [])
+    assert table.resolve_module("lib.core") is None
+
+
+@pytest.mark.unit
+def test_importers_of_a_changed_file(table: SymbolTable) -> None:
+    """Tests finding the files whose resolution depends on another file."""
+    util_names = table.module_names("/repo/pkg/util.py")
+
+    assert util_names == {"pkg.util", "util"}
+    assert table.importers(util_names) == {"/repo/pkg/__init__.py", "/repo/pkg/app.py"}
+    assert table.importers(table.module_names("/repo/pkg/__init__.py")) == {
+        "/repo/pkg/app.py"
+    }
+    assert table.importers(table.module_names("/repo/pkg/app.py")) == set()
+
+    table.remove_file("/repo/pkg/app.py")
+    assert table.importers(util_names) == {"/repo/pkg/__init__.py"}
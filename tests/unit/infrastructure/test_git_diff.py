@@ -0,0 +1,104 @@
+"""
+Unit tests for the GitDiffReader class.
+"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.git_diff import (
+    FileChangeStatus,
+    GitDiffError,
+    GitDiffReader,
+)
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def git_repo(tmp_path: Path) -> Path:
+    """Creates a git repository with two commits touching several files."""
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Test")
+    (tmp_path / "keep.py").write_text("x = 1\n")
+    (tmp_path / "remove.py").write_text("y = 2\n")
+    (tmp_path / "old_name.py").write_text("def moved():\n    return 'same'\n" * 5)
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "base")
+
+    (tmp_path / "keep.py").write_text("x = 2\n")
+    (tmp_path / "remove.py").unlink()
+    (tmp_path / "old_name.py").rename(tmp_path / "new name.py")
+    (tmp_path / "added.py").write_text("z = 3\n")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-q", "-m", "target")
+    return tmp_path
+
+
+@pytest.mark.unit
+def test_get_changes_reports_all_statuses(git_repo: Path) -> None:
+    """Tests that additions, modifications, deletions and renames are parsed."""
+    reader = GitDiffReader(str(git_repo))
+
+    changes = {c.path: c for c in reader.get_changes("HEAD~1", "HEAD")}
+
+    assert changes["keep.py"].status == FileChangeStatus.MODIFIED
+    assert changes["remove.py"].status == FileChangeStatus.DELETED
+    assert changes["added.py"].status == FileChangeStatus.ADDED
+    renamed = changes["new name.py"]
+    assert renamed.status == FileChangeStatus.RENAMED
+    assert renamed.old_path == "old_name.py"
+    assert renamed.similarity == 100
+
+
+@pytest.mark.unit
+def test_read_file_at_commit(git_repo: Path) -> None:
+    """Tests reading file contents as of a specific commit."""
+    reader = GitDiffReader(str(git_repo))
+
+    assert reader.read_file("HEAD~1", "keep.py") == "x = 1\n"
+    assert reader.read_file("HEAD", "keep.py") == "x = 2\n"
+    assert reader.read_file("HEAD", "remove.py") is None
+
+
+@pytest.mark.unit
+def test_get_changes_with_unknown_commit_raises(git_repo: Path) -> None:
+    """Tests that git failures are surfaced as GitDiffError."""
+    reader = GitDiffReader(str(git_repo))
+
+    with pytest.raises(GitDiffError):
+        reader.get_changes("does-not-exist", "HEAD")
+
+
+@pytest.mark.unit
+def test_paths_are_relative_to_a_subdirectory(tmp_path: Path) -> None:
+    """Tests that a reader for a subdirectory only sees paths within it."""
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "Test")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "inside.py").write_text("a = 1\n")
+    (tmp_path / "outside.py").write_text("def moved():\n    return 'same'\n" * 5)
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "base")
+
+    (tmp_path / "pkg" / "inside.py").write_text("a = 2\n")
+    (tmp_path / "outside.py").rename(tmp_path / "pkg" / "moved_in.py")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-q", "-m", "target")
+    reader = GitDiffReader(str(tmp_path / "pkg"))
+
+    changes = {c.path: c.status for c in reader.get_changes("HEAD~1", "HEAD")}
+
+    assert reader.prefix == "pkg/"
+    assert changes == {
+        "inside.py": FileChangeStatus.MODIFIED,
+        "moved_in.py": FileChangeStatus.ADDED,
+    }
+    assert reader.read_file("HEAD", "inside.py") == "a = 2\n"
@@ -0,0 +1,52 @@
+"""
+Unit tests for the IndexManifest class.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.infrastructure.index_manifest import IndexManifest, ManifestEntry
+
+
+@pytest.mark.unit
+def test_manifest_round_trips_through_disk(tmp_path: Path) -> None:
+    """Tests that saved entries are loaded back by a new manifest."""
+    path = tmp_path / "nested" / "manifest.json"
+    manifest = IndexManifest(str(path))
+    entry = ManifestEntry(
+        content_hash=IndexManifest.hash_content("print('hi')"),
+        chunk_ids=["a.py::1234"],
+        node_ids=["a.py"],
+    )
+    manifest.record("a.py", entry)
+    manifest.save()
+
+    reloaded = IndexManifest(str(path))
+
+    assert reloaded.file_paths() == {"a.py"}
+    assert reloaded.get("a.py") == entry
+
+
+@pytest.mark.unit
+def test_manifest_remove_and_clear(tmp_path: Path) -> None:
+    """Tests removing single entries and clearing the manifest."""
+    manifest = IndexManifest(str(tmp_path / "manifest.json"))
+    manifest.record("a.py", ManifestEntry(content_hash="1"))
+    manifest.record("b.py", ManifestEntry(content_hash="2"))
+
+    removed = manifest.remove("a.py")
+
+    assert removed is not None and removed.content_hash == "1"
+    assert manifest.remove("a.py") is None
+    assert len(manifest) == 1
+
+    manifest.clear()
+    assert not manifest
+
+
+@pytest.mark.unit
+def test_hash_content_detects_changes() -> None:
+    """Tests that the content hash is stable and change-sensitive."""
+    assert IndexManifest.hash_content("x = 1") == IndexManifest.hash_content("x = 1")
+    assert IndexManifest.hash_content("x = 1") != IndexManifest.hash_content("x = 2")
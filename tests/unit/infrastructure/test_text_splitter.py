@@ -4,7 +4,8 @@ Unit tests for the CodeTextSplitter class.
 
 import pytest
 
-from src.domain.entities.code_chunk import CodeChunk
+from src.domain.entities.code_chunk import ChunkRecord
+from src.infrastructure.parser.code_parser import CodeParser
 from src.infrastructure.text_splitter import CodeTextSplitter
 
 
@@ -16,7 +17,7 @@ def test_split_simple_python_code() -> None:
     chunks = splitter.split("test.py", code)
 
     assert len(chunks) > 1
-    assert isinstance(chunks[0], CodeChunk)
+    assert isinstance(chunks[0], ChunkRecord)
     assert chunks[0].content.startswith("def hello():")
     assert chunks[1].content.startswith("class MyClass:")
 
@@ -48,3 +49,122 @@ def test_line_numbers_are_calculated() -> None:
     assert chunks[0].start_line == 1
     assert chunks[0].end_line >= 3
     assert chunks[1].start_line >= 5
+
+
+@pytest.mark.unit
+def test_repeated_chunks_get_their_own_line_numbers() -> None:
+    """Tests that identical chunks are located at their own occurrence."""
+    splitter = CodeTextSplitter(chunk_size=30, chunk_overlap=0)
+    block = "def handler():\n    return 42"
+    code = "\n\n".join([block] * 3)
+
+    chunks = splitter.split("test.py", code)
+
+    assert [chunk.content for chunk in chunks] == [block] * 3
+    assert [(c.start_line, c.end_line) for c in chunks] == [(1, 2), (4, 5), (7, 8)]
+
+
+@pytest.mark.unit
+def test_line_ranges_match_content_with_overlap() -> None:
+    """Tests that every chunk's line range points at its exact text."""
+    splitter = CodeTextSplitter(chunk_size=60, chunk_overlap=20)
+    lines = [f"value_{i} = compute({i})" for i in range(40)]
+    code = "\n".join(lines)
+
+    chunks = splitter.split("test.py", code)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        expected = "\n".join(lines[chunk.start_line - 1 : chunk.end_line])
+        assert chunk.content in expected
+        assert expected.startswith(chunk.content.split("\n")[0])
+
+
+SYMBOL_CODE = '''import os
+
+
+def small_a():
+    return 1
+
+
+def small_b():
+    return 2
+
+
+class Big:
+    """A class too large for one chunk."""
+
+    def first(self):
+        value = "x" * 10
+        return value + "first method body padding"
+
+    def second(self):
+        value = "y" * 10
+        return value + "second method body padding"
+'''
+
+
+@pytest.mark.unit
+def test_split_by_symbols_cuts_on_definitions() -> None:
+    """Tests that chunks follow class and method boundaries."""
+    splitter = CodeTextSplitter(chunk_size=120, chunk_overlap=0)
+    parsed = CodeParser().parse("sym.py", SYMBOL_CODE)
+
+    chunks = splitter.split_by_symbols("sym.py", SYMBOL_CODE, parsed)
+
+    lines = SYMBOL_CODE.split("\n")
+    for chunk in chunks:
+        assert chunk.content == "\n".join(lines[chunk.start_line - 1 : chunk.end_line])
+    assert [(c.start_line, c.end_line) for c in chunks] == [
+        (1, 9),
+        (12, 13),
+        (15, 17),
+        (19, 21),
+    ]
+    assert [c.metadata.get("symbol_id") for c in chunks] == [
+        "sym.py",
+        "sym.py::Big",
+        "sym.py::first",
+        "sym.py::second",
+    ]
+    assert [c.metadata["symbol_type"] for c in chunks] == [
+        "File",
+        "Class",
+        "Function",
+        "Function",
+    ]
+
+
+@pytest.mark.unit
+def test_split_by_symbols_sub_splits_oversized_function() -> None:
+    """Tests that a function larger than a chunk is split within its body."""
+    body = "".join(f"    total += {i}\n" for i in range(40))
+    code = f"def huge():\n    total = 0\n{body}    return total\n"
+    splitter = CodeTextSplitter(chunk_size=200, chunk_overlap=0)
+    parsed = CodeParser().parse("huge.py", code)
+
+    chunks = splitter.split_by_symbols("huge.py", code, parsed)
+
+    assert len(chunks) > 1
+    assert all(len(c.content) <= 200 for c in chunks)
+    assert all(c.metadata["symbol_id"] == "huge.py::huge" for c in chunks)
+    lines = code.split("\n")
+    for chunk in chunks:
+        expected = "\n".join(lines[chunk.start_line - 1 : chunk.end_line])
+        assert chunk.content == expected.strip()
+
+
+@pytest.mark.unit
+def test_split_by_symbols_falls_back_without_definitions() -> None:
+    """Tests that files without definitions are split as plain text."""
+    code = "x = 1\ny = 2\n"
+    splitter = CodeTextSplitter()
+    parsed = CodeParser().parse("plain.py", code)
+
+    chunks = splitter.split_by_symbols("plain.py", code, parsed)
+
+    assert [c.content for c in chunks] == [
+        c.content for c in splitter.split("plain.py", code)
+    ]
+    assert "symbol_id" not in chunks[0].metadata
+    assert chunks[0].metadata["symbol_type"] == "File"